@@ -43,8 +43,34 @@ let s:pollers = {
       \   'receive_messages': {
       \     'id': -1,
       \     'wait_milliseconds': 100
+      \   },
+      \   'diagnostic_updates': {
+      \     'id': -1,
+      \     'wait_milliseconds': 10
+      \   },
+      \   'event_queue': {
+      \     'id': -1,
+      \     'wait_milliseconds': 50
+      \   },
+      \   'scheduled_parse': {
+      \     'id': -1,
+      \     'wait_milliseconds': 100
+      \   },
+      \   'deferred_parses': {
+      \     'id': -1,
+      \     'wait_milliseconds': 100
+      \   },
+      \   'pre_parse': {
+      \     'id': -1,
+      \     'wait_milliseconds': 1000
       \   }
       \ }
+" Buffer number and time of the first change of the parse waiting for the end
+" of the changes (see s:ScheduleFileParse).
+let s:scheduled_parse = { 'bufnr': -1, 'since': [] }
+" Time of the last cursor move or change in normal mode. Buffers are only
+" pre-parsed once the user is idle (see s:PreParseBuffer).
+let s:last_activity_time = reltime()
 let s:buftype_blacklist = {
       \   'help': 1,
       \   'terminal': 1,
@@ -89,6 +115,8 @@ endfunction
 
 function! s:ReceiveMessages( timer_id )
   let poll_again = s:Pyeval( 'ycm_state.OnPeriodicTick()' )
+  " Messages may contain diagnostics.
+  call s:StartDiagnosticUpdatesPoll()
 
   if poll_again
     let s:pollers.receive_messages.id = timer_start(
@@ -101,6 +129,49 @@ function! s:ReceiveMessages( timer_id )
 endfunction
 
 
+" Diagnostics are applied to the UI within a time budget (see
+" g:ycm_diagnostic_update_time_budget). The remaining updates are applied in
+" chunks on each tick of this poller so that Vim can process user input in
+" between.
+function! s:StartDiagnosticUpdatesPoll()
+  if s:pollers.diagnostic_updates.id < 0 &&
+        \ s:Pyeval( 'ycm_state.HasPendingDiagnosticUpdates()' )
+    let s:pollers.diagnostic_updates.id = timer_start(
+          \ s:pollers.diagnostic_updates.wait_milliseconds,
+          \ function( 's:ApplyDiagnosticUpdates' ) )
+  endif
+endfunction
+
+
+function! s:ApplyDiagnosticUpdates( timer_id )
+  if s:Pyeval( 'ycm_state.ApplyPendingDiagnosticUpdates()' )
+    let s:pollers.diagnostic_updates.id = timer_start(
+          \ s:pollers.diagnostic_updates.wait_milliseconds,
+          \ function( 's:ApplyDiagnosticUpdates' ) )
+  else
+    let s:pollers.diagnostic_updates.id = -1
+  endif
+endfunction
+
+
+" BufferVisit and BufferUnload events are queued and sent when this timer
+" fires. Timers are not triggered while a command is executed so a burst of
+" events (e.g. from :bufdo bd) is sent at once when the command is done.
+function! s:StartEventQueueFlush()
+  if s:pollers.event_queue.id < 0
+    let s:pollers.event_queue.id = timer_start(
+          \ s:pollers.event_queue.wait_milliseconds,
+          \ function( 's:FlushEventQueue' ) )
+  endif
+endfunction
+
+
+function! s:FlushEventQueue( timer_id )
+  let s:pollers.event_queue.id = -1
+  exec s:python_command "ycm_state.FlushEventQueue()"
+endfunction
+
+
 function! s:SetUpOptions()
   call s:SetUpCommands()
   call s:SetUpCpoptions()
@@ -139,10 +210,23 @@ function! youcompleteme#Enable()
     autocmd FileType * call s:OnFileTypeSet()
     autocmd BufEnter,CmdwinEnter * call s:OnBufferEnter()
     autocmd BufUnload * call s:OnBufferUnload()
+    autocmd BufAdd,BufFilePost * call s:OnBufferAdd()
+    autocmd BufWipeout * call s:OnBufferWipeout()
+    if exists( '##DirChanged' )
+      autocmd DirChanged * call s:OnDirChanged()
+    endif
     autocmd InsertLeave * call s:OnInsertLeave()
     autocmd VimLeave * call s:OnVimLeave()
     autocmd CompleteDone * call s:OnCompleteDone()
     autocmd BufEnter,WinEnter * call s:UpdateMatches()
+    " Buffers may be modified while autocommands are blocked so their 'modified'
+    " option is also checked when leaving them.
+    if exists( '##BufModifiedSet' )
+      autocmd BufModifiedSet,BufLeave * call s:OnBufferModifiedSet()
+    else
+      autocmd TextChanged,TextChangedI,BufLeave,BufWritePost,BufReadPost *
+            \ call s:OnBufferModifiedSet()
+    endif
   augroup END
 
   " The FileType event is not triggered for the first loaded file. We wait until
@@ -175,13 +259,22 @@ function! youcompleteme#DisableCursorMovedAutocommands()
 endfunction
 
 
+" The diagnostic counts are maintained by Python in the b:ycm_diagnostic_counts
+" and g:ycm_diagnostic_counts variables when receiving new diagnostics. Reading
+" them is much cheaper than calling Python, which matters for statusline
+" functions that are called on each redraw.
+function! s:GetDiagnosticCount( kind )
+  return get( get( b:, 'ycm_diagnostic_counts', {} ), a:kind, 0 )
+endfunction
+
+
 function! youcompleteme#GetErrorCount()
-  return s:Pyeval( 'ycm_state.GetErrorCount()' )
+  return s:GetDiagnosticCount( 'error' )
 endfunction
 
 
 function! youcompleteme#GetWarningCount()
-  return s:Pyeval( 'ycm_state.GetWarningCount()' )
+  return s:GetDiagnosticCount( 'warning' )
 endfunction
 
 
@@ -415,24 +508,66 @@ function! s:TurnOffSyntasticForCFamily()
 endfunction
 
 
-function! s:DisableOnLargeFile( buffer )
-  if exists( 'b:ycm_largefile' )
-    return b:ycm_largefile
+" Return the large file tier of |buffer|, computed once from the size of its
+" file:
+"   0: YCM is fully enabled;
+"   1: above g:ycm_large_file_threshold_kb, parses are throttled and only a
+"      window of lines around the cursor is sent with them if the filetype has
+"      no semantic completer;
+"   2: above g:ycm_huge_file_threshold_kb, the buffer is never parsed and
+"      completion only uses the identifiers of the visible lines;
+"   3: above g:ycm_disable_for_files_larger_than_kb, YCM is disabled.
+" A threshold of 0 disables its tier.
+function! s:LargeFileTier( buffer )
+  let buffer_number = bufnr( a:buffer )
+  let tier = getbufvar( buffer_number, 'ycm_large_file_tier', -1 )
+  if tier >= 0
+    return tier
   endif
 
-  let threshold = g:ycm_disable_for_files_larger_than_kb * 1024
-  let b:ycm_largefile =
-        \ threshold > 0 && getfsize( expand( a:buffer ) ) > threshold
-  if b:ycm_largefile
-    exec s:python_command "vimsupport.PostVimMessage(" .
-          \ "'YouCompleteMe is disabled in this buffer; " .
-          \ "the file exceeded the max size (see YCM options).' )"
+  let size = getfsize( fnamemodify( bufname( buffer_number ), ':p' ) )
+  let tier = 0
+  let thresholds = [ g:ycm_large_file_threshold_kb,
+                   \ g:ycm_huge_file_threshold_kb,
+                   \ g:ycm_disable_for_files_larger_than_kb ]
+  for index in range( len( thresholds ) )
+    if thresholds[ index ] > 0 && size > thresholds[ index ] * 1024
+      let tier = index + 1
+    endif
+  endfor
+  call setbufvar( buffer_number, 'ycm_large_file_tier', tier )
+
+  if tier > 0 && buffer_number == bufnr( '%' )
+    if tier == 3
+      exec s:python_command "vimsupport.PostVimMessage(" .
+            \ "'YouCompleteMe is disabled in this buffer; " .
+            \ "the file exceeded the max size (see YCM options).' )"
+    else
+      exec s:python_command "vimsupport.PostVimMessage(" .
+            \ "'YouCompleteMe runs in a degraded mode in this buffer; " .
+            \ "the file is large (see YCM options).' )"
+    endif
   endif
-  return b:ycm_largefile
+  return tier
+endfunction
+
+
+function! s:DisableOnLargeFile( buffer )
+  return s:LargeFileTier( a:buffer ) == 3
 endfunction
 
 
 function! s:AllowedToCompleteInBuffer( buffer )
+  let allowed = s:BufferIsAllowed( a:buffer )
+  if allowed
+    let s:previous_allowed_buffer_number = bufnr( a:buffer )
+  endif
+  return allowed
+endfunction
+
+
+" Same as s:AllowedToCompleteInBuffer without remembering the buffer.
+function! s:BufferIsAllowed( buffer )
   let buftype = getbufvar( a:buffer, '&buftype' )
 
   if has_key( s:buftype_blacklist, buftype )
@@ -451,11 +586,7 @@ function! s:AllowedToCompleteInBuffer( buffer )
   let blacklist_allows = type( g:ycm_filetype_blacklist ) != type( {} ) ||
         \ !has_key( g:ycm_filetype_blacklist, filetype )
 
-  let allowed = whitelist_allows && blacklist_allows
-  if allowed
-    let s:previous_allowed_buffer_number = bufnr( a:buffer )
-  endif
-  return allowed
+  return whitelist_allows && blacklist_allows
 endfunction
 
 
@@ -533,6 +664,11 @@ endfunction
 
 
 function! s:OnFileTypeSet()
+  " The buffer whose filetype is set is always the current one, even when the
+  " option is set with setbufvar.
+  exec s:python_command "vimsupport.InvalidateBufferMetadata( " .
+        \ bufnr( '%' ) . " )"
+
   " The contents of the command-line window are empty when the filetype is set
   " for the first time. Users should never change its filetype so we only rely
   " on the CmdwinEnter event for that window.
@@ -549,6 +685,7 @@ function! s:OnFileTypeSet()
   call s:StartMessagePoll()
 
   exec s:python_command "ycm_state.OnBufferVisit()"
+  call s:StartEventQueueFlush()
   call s:OnFileReadyToParse( 1 )
 endfunction
 
@@ -563,9 +700,12 @@ function! s:OnBufferEnter()
   call s:StartMessagePoll()
 
   exec s:python_command "ycm_state.OnBufferVisit()"
+  call s:StartEventQueueFlush()
   " Last parse may be outdated because of changes from other buffers. Force a
-  " new parse.
-  call s:OnFileReadyToParse( 1 )
+  " new parse unless no buffer changed since then.
+  if s:Pyeval( 'ycm_state.NeedsReparseOnVisit()' )
+    call s:OnFileReadyToParse( 1 )
+  endif
 endfunction
 
 
@@ -573,11 +713,58 @@ function! s:OnBufferUnload()
   " Expanding <abuf> returns the unloaded buffer number as a string but we want
   " it as a true number for the getbufvar function.
   let buffer_number = str2nr( expand( '<abuf>' ) )
+  " The contents of an unloaded buffer are not sent to the server.
+  call s:SetBufferModified( buffer_number, 0 )
   if !s:AllowedToCompleteInBuffer( buffer_number )
     return
   endif
 
   exec s:python_command "ycm_state.OnBufferUnload( " . buffer_number . " )"
+  call s:StartEventQueueFlush()
+endfunction
+
+
+function! s:OnBufferModifiedSet()
+  let buffer_number = str2nr( expand( '<abuf>' ) )
+  call s:SetBufferModified( buffer_number,
+                          \ getbufvar( buffer_number, '&modified' ) )
+endfunction
+
+
+" The set of modified buffers maintained by Python is only updated when the
+" 'modified' option of a buffer changed since it was last reported, which is
+" stored in the b:ycm_modified variable. This avoids calling Python on each
+" TextChanged and TextChangedI event when BufModifiedSet is not available.
+function! s:SetBufferModified( buffer_number, modified )
+  if getbufvar( a:buffer_number, 'ycm_modified', 0 ) == a:modified
+    return
+  endif
+  call setbufvar( a:buffer_number, 'ycm_modified', a:modified )
+  exec s:python_command "vimsupport.SetBufferModified( " .
+        \ a:buffer_number . ", " . a:modified . " )"
+endfunction
+
+
+function! s:OnBufferAdd()
+  " Also called when the buffer is renamed.
+  let buffer_number = str2nr( expand( '<abuf>' ) )
+  exec s:python_command "vimsupport.InvalidateBufferMetadata( " .
+        \ buffer_number . " )"
+  exec s:python_command "vimsupport.AddBufferToIndex( " . buffer_number . " )"
+endfunction
+
+
+function! s:OnBufferWipeout()
+  let buffer_number = str2nr( expand( '<abuf>' ) )
+  " Only buffers reported as modified are removed from the set of modified
+  " buffers.
+  call s:SetBufferModified( buffer_number, 0 )
+  exec s:python_command "ycm_state.OnBufferWipeout( " . buffer_number . " )"
+endfunction
+
+
+function! s:OnDirChanged()
+  exec s:python_command "vimsupport.InvalidateBufferMetadata()"
 endfunction
 
 
@@ -610,19 +797,121 @@ function! s:OnFileReadyToParse( ... )
   " effectively forcing a parse of the buffer. Default is 0.
   let force_parsing = a:0 > 0 && a:1
 
+  " This request supersedes the scheduled one.
+  call s:CancelScheduledFileParse()
+
+  " Huge files are never parsed.
+  if s:LargeFileTier( '%' ) >= 2
+    return
+  endif
+
   " We only want to send a new FileReadyToParse event notification if the buffer
   " has changed since the last time we sent one, or if forced.
   if force_parsing || s:Pyeval( "ycm_state.NeedsReparse()" )
     exec s:python_command "ycm_state.OnFileReadyToParse()"
+    call s:StartDeferredParsesPoll()
+    call s:StartFileParseResponsePoll()
+  endif
+endfunction
 
-    call timer_stop( s:pollers.file_parse_response.id )
-    let s:pollers.file_parse_response.id = timer_start(
-          \ s:pollers.file_parse_response.wait_milliseconds,
-          \ function( 's:PollFileParseResponse' ) )
+
+function! s:StartFileParseResponsePoll()
+  call timer_stop( s:pollers.file_parse_response.id )
+  let s:pollers.file_parse_response.id = timer_start(
+        \ s:pollers.file_parse_response.wait_milliseconds,
+        \ function( 's:PollFileParseResponse' ) )
+endfunction
+
+
+" Parse requests are deferred when too many of them are in progress (see
+" YouCompleteMe.ProcessDeferredParseRequests).
+function! s:StartDeferredParsesPoll()
+  if s:pollers.deferred_parses.id < 0 &&
+        \ s:Pyeval( 'ycm_state.HasDeferredParseRequests()' )
+    let s:pollers.deferred_parses.id = timer_start(
+          \ s:pollers.deferred_parses.wait_milliseconds,
+          \ function( 's:ProcessDeferredParses' ) )
   endif
 endfunction
 
 
+function! s:ProcessDeferredParses( timer_id )
+  let s:pollers.deferred_parses.id = -1
+  if s:Pyeval( 'ycm_state.ProcessDeferredParseRequests()' )
+    call s:StartFileParseResponsePoll()
+  endif
+  " Responses for buffers other than the current one may contain diagnostics.
+  call s:StartDiagnosticUpdatesPoll()
+  call s:StartDeferredParsesPoll()
+endfunction
+
+
+" Parse the current buffer once it hasn't changed for g:ycm_parse_delay
+" milliseconds, or after g:ycm_parse_max_staleness milliseconds if it keeps
+" changing. Only one parse is scheduled at a time: scheduling a parse for
+" another buffer replaces the previous one, which happens anyway when visiting
+" the buffer again. Large files are parsed at most every
+" g:ycm_parse_max_staleness milliseconds.
+function! s:ScheduleFileParse()
+  let delay = g:ycm_parse_delay
+  if s:LargeFileTier( '%' ) >= 1
+    let delay = max( [ delay, g:ycm_parse_max_staleness ] )
+  endif
+  if delay <= 0
+    call s:OnFileReadyToParse()
+    return
+  endif
+
+  let bufnr = bufnr( '%' )
+  if s:scheduled_parse.bufnr != bufnr
+    call s:CancelScheduledFileParse()
+    let s:scheduled_parse = { 'bufnr': bufnr, 'since': reltime() }
+  endif
+
+  call timer_stop( s:pollers.scheduled_parse.id )
+  let s:pollers.scheduled_parse.id = timer_start(
+        \ s:ScheduledParseWait( delay ),
+        \ function( 's:SendScheduledFileParse' ) )
+endfunction
+
+
+" Return |delay| or, if smaller, the time left before the scheduled parse
+" exceeds g:ycm_parse_max_staleness.
+function! s:ScheduledParseWait( delay )
+  let elapsed = float2nr( reltimefloat( reltime( s:scheduled_parse.since ) ) *
+        \                 1000 )
+  return max( [ min( [ a:delay, g:ycm_parse_max_staleness - elapsed ] ), 0 ] )
+endfunction
+
+
+function! s:CancelScheduledFileParse()
+  call timer_stop( s:pollers.scheduled_parse.id )
+  let s:pollers.scheduled_parse.id = -1
+  let s:scheduled_parse = { 'bufnr': -1, 'since': [] }
+endfunction
+
+
+function! s:SendScheduledFileParse( timer_id )
+  let s:pollers.scheduled_parse.id = -1
+  if bufnr( '%' ) != s:scheduled_parse.bufnr || mode() ==# 'i'
+    " The parse is sent when leaving insert mode or visiting the buffer again.
+    call s:CancelScheduledFileParse()
+    return
+  endif
+
+  " Don't send a new request while the previous one is in progress since its
+  " response would be discarded. Wait for it instead.
+  if s:Pyeval( 'ycm_state.FileParseRequestInProgress()' )
+    let s:pollers.scheduled_parse.id = timer_start(
+          \ s:pollers.scheduled_parse.wait_milliseconds,
+          \ function( 's:SendScheduledFileParse' ) )
+    return
+  endif
+
+  call s:OnFileReadyToParse()
+endfunction
+
+
 function! s:PollFileParseResponse( ... )
   if !s:Pyeval( "ycm_state.FileParseRequestReady()" )
     let s:pollers.file_parse_response.id = timer_start(
@@ -632,12 +921,59 @@ function! s:PollFileParseResponse( ... )
   endif
 
   exec s:python_command "ycm_state.HandleFileParseRequest()"
+  call s:StartDiagnosticUpdatesPoll()
+  call s:StartPreParse()
   if s:Pyeval( "ycm_state.ShouldResendFileParseRequest()" )
     call s:OnFileReadyToParse( 1 )
   endif
 endfunction
 
 
+" Once the current buffer is parsed and nothing happens for a while, the buffers
+" likely to be visited next are parsed one by one in the background, up to
+" g:ycm_max_pre_parsed_buffers buffers. Any new parse request of the current
+" buffer or entering insert mode stops this. Moving the cursor or changing the
+" text delays it until nothing happens for 'updatetime' milliseconds.
+function! s:StartPreParse()
+  call timer_stop( s:pollers.pre_parse.id )
+  let s:pollers.pre_parse.id = -1
+  if g:ycm_max_pre_parsed_buffers <= 0
+    return
+  endif
+  exec s:python_command "ycm_state.StartPreParse()"
+  let s:pollers.pre_parse.id = timer_start(
+        \ s:pollers.pre_parse.wait_milliseconds,
+        \ function( 's:PreParseBuffer' ) )
+endfunction
+
+
+function! s:PreParseBuffer( timer_id )
+  let s:pollers.pre_parse.id = -1
+  if mode() !=# 'n'
+    return
+  endif
+
+  let idle_time = float2nr( reltimefloat( reltime( s:last_activity_time ) ) *
+        \ 1000 )
+  if idle_time < &updatetime
+    let s:pollers.pre_parse.id = timer_start(
+          \ &updatetime - idle_time,
+          \ function( 's:PreParseBuffer' ) )
+    return
+  endif
+
+  let buffers = filter( s:Pyeval( 'ycm_state.GetBuffersToPreParse()' ),
+        \ 'bufloaded( v:val ) && s:BufferIsAllowed( v:val ) && ' .
+        \ 's:LargeFileTier( v:val ) < 2' )
+  if s:Pyeval( 'ycm_state.PreParseBuffer( ' . string( buffers ) . ' )' )
+    let s:pollers.pre_parse.id = timer_start(
+          \ s:pollers.pre_parse.wait_milliseconds,
+          \ function( 's:PreParseBuffer' ) )
+  endif
+  call s:StartDeferredParsesPoll()
+endfunction
+
+
 function! s:SendKeys( keys )
   " By default keys are added to the end of the typeahead buffer. If there are
   " already keys in the buffer, they will be processed first and may change the
@@ -691,20 +1027,66 @@ endfunction
 
 
 function! s:OnCursorMovedNormalMode()
+  let s:last_activity_time = reltime()
   if !s:AllowedToCompleteInCurrentBuffer()
     return
   endif
 
-  exec s:python_command "ycm_state.OnCursorMoved()"
+  call s:EchoDiagnosticForCurrentLine()
+endfunction
+
+
+" Echo the message of the first diagnostic on the current line. The messages
+" are published by Python in b:ycm_diagnostic_messages when receiving new
+" diagnostics so that moving the cursor doesn't require a call to Python. The
+" line of the currently echoed message is stored in b:ycm_diagnostic_echoed_line
+" (0 if none) to only echo or clear the message when changing lines.
+function! s:EchoDiagnosticForCurrentLine()
+  if !g:ycm_echo_current_diagnostic
+    return
+  endif
+
+  let line = line( '.' )
+  let echoed_line = get( b:, 'ycm_diagnostic_echoed_line', 0 )
+  if line == echoed_line
+    return
+  endif
+
+  let message = get( get( b:, 'ycm_diagnostic_messages', {} ), line, '' )
+  if empty( message )
+    if echoed_line
+      " Clear any previous diag echo
+      redraw
+      echo ''
+      let b:ycm_diagnostic_echoed_line = 0
+    endif
+    return
+  endif
+
+  " Truncate the message to avoid hit-enter prompts.
+  if strchars( message ) >= &columns
+    let message = matchstr( message, '^.\{' . ( &columns - 4 ) . '}' ) . '...'
+  endif
+
+  let old_ruler = &ruler
+  let old_showcmd = &showcmd
+  set noruler noshowcmd
+  redraw
+  echo message
+  let &ruler = old_ruler
+  let &showcmd = old_showcmd
+
+  let b:ycm_diagnostic_echoed_line = line
 endfunction
 
 
 function! s:OnTextChangedNormalMode()
+  let s:last_activity_time = reltime()
   if !s:AllowedToCompleteInCurrentBuffer()
     return
   endif
 
-  call s:OnFileReadyToParse()
+  call s:ScheduleFileParse()
 endfunction
 
 
@@ -737,7 +1119,7 @@ function! s:OnTextChangedInsertMode()
     call s:InvokeCompletion()
   endif
 
-  exec s:python_command "ycm_state.OnCursorMoved()"
+  call s:EchoDiagnosticForCurrentLine()
 
   if g:ycm_autoclose_preview_window_after_completion
     call s:ClosePreviewWindowIfNeeded()
@@ -754,7 +1136,7 @@ function! s:OnInsertLeave()
   let s:force_semantic = 0
   let s:completion = s:default_completion
 
-  call s:OnFileReadyToParse()
+  call s:ScheduleFileParse()
   exec s:python_command "ycm_state.OnInsertLeave()"
   if g:ycm_autoclose_preview_window_after_completion ||
         \ g:ycm_autoclose_preview_window_after_insertion
@@ -933,6 +1315,13 @@ function! s:SetUpCommands()
           \                                      <f-args>)
   endif
   command! YcmDiags call s:ShowDiagnostics()
+  command! YcmProjectDiags call s:ShowProjectDiagnostics()
+  command! -nargs=? -complete=custom,youcompleteme#DiagnosticSeveritiesComplete
+        \ YcmNextDiagnostic call s:JumpToDiagnostic( 1, <f-args> )
+  command! -nargs=? -complete=custom,youcompleteme#DiagnosticSeveritiesComplete
+        \ YcmPrevDiagnostic call s:JumpToDiagnostic( 0, <f-args> )
+  nnoremap <silent> <Plug>(YCMNextDiagnostic) :<C-u>YcmNextDiagnostic<CR>
+  nnoremap <silent> <Plug>(YCMPrevDiagnostic) :<C-u>YcmPrevDiagnostic<CR>
   command! YcmShowDetailedDiagnostic call s:ShowDetailedDiagnostic()
   command! YcmForceCompileAndDiagnostics call s:ForceCompileAndDiagnostics()
 endfunction
@@ -1000,6 +1389,24 @@ function! s:ShowDiagnostics()
 endfunction
 
 
+function! s:ShowProjectDiagnostics()
+  exec s:python_command "ycm_state.ShowProjectDiagnostics()"
+endfunction
+
+
+function! s:JumpToDiagnostic( forward, ... )
+  exec s:python_command "ycm_state.JumpToDiagnostic(" .
+        \ "vimsupport.GetBoolValue( 'a:forward' )," .
+        \ "*vim.eval( 'a:000' ) )"
+endfunction
+
+
+function! youcompleteme#DiagnosticSeveritiesComplete( arglead, cmdline,
+                                                     \ cursorpos )
+  return "error\nwarning"
+endfunction
+
+
 function! s:ShowDetailedDiagnostic()
   exec s:python_command "ycm_state.ShowDetailedDiagnostic()"
 endfunction
@@ -285,6 +285,33 @@ let g:ycm_clangd_args =
 let g:ycm_clangd_uses_ycmd_caching =
       \ get( g:, 'ycm_clangd_uses_ycmd_caching', 1 )
 
+let g:ycm_diagnostic_update_time_budget =
+      \ get( g:, 'ycm_diagnostic_update_time_budget', 4 )
+
+let g:ycm_max_buffers_with_state =
+      \ get( g:, 'ycm_max_buffers_with_state', 50 )
+
+let g:ycm_full_event_notifications =
+      \ get( g:, 'ycm_full_event_notifications', [ 'BufferVisit' ] )
+
+let g:ycm_parse_delay =
+      \ get( g:, 'ycm_parse_delay', 300 )
+
+let g:ycm_parse_max_staleness =
+      \ get( g:, 'ycm_parse_max_staleness', 2000 )
+
+let g:ycm_max_pre_parsed_buffers =
+      \ get( g:, 'ycm_max_pre_parsed_buffers', 3 )
+
+let g:ycm_large_file_threshold_kb =
+      \ get( g:, 'ycm_large_file_threshold_kb', 0 )
+
+let g:ycm_huge_file_threshold_kb =
+      \ get( g:, 'ycm_huge_file_threshold_kb', 0 )
+
+let g:ycm_max_unsaved_buffer_size_kb =
+      \ get( g:, 'ycm_max_unsaved_buffer_size_kb', 1000 )
+
 " This option is deprecated.
 let g:ycm_python_binary_path =
       \ get( g:, 'ycm_python_binary_path', '' )
@@ -22,8 +22,10 @@ from __future__ import absolute_import
 # Not installing aliases from python-future; it's unreliable and slow.
 from builtins import *  # noqa
 
+from future.utils import itervalues
 from ycm import vimsupport
 from ycmd import identifier_utils
+import sys
 
 YCM_VAR_PREFIX = 'ycm_'
 
@@ -146,3 +148,40 @@ def OverlapLength( left_string, right_string ):
     if left_string[ -length: ] == right_string[ :length ]:
       best = length
       length += 1
+
+
+def DeepSizeOf( obj, seen = None ):
+  """Estimate the memory in bytes used by |obj| and the containers and YCM
+  objects it references. Objects whose id is in the |seen| set are not counted
+  and counted objects are added to it so that memory shared by several objects
+  is only counted once."""
+  if seen is None:
+    seen = set()
+  size = 0
+  objects = [ obj ]
+  while objects:
+    obj = objects.pop()
+    if id( obj ) in seen:
+      continue
+    seen.add( id( obj ) )
+    size += sys.getsizeof( obj )
+    if isinstance( obj, dict ):
+      objects.extend( obj )
+      objects.extend( itervalues( obj ) )
+    elif isinstance( obj, ( list, tuple, set, frozenset ) ):
+      objects.extend( obj )
+    elif type( obj ).__module__.startswith( 'ycm.' ):
+      # Don't follow references to other libraries' objects, like the
+      # connection pool of a request future.
+      if hasattr( obj, '__dict__' ):
+        objects.append( obj.__dict__ )
+      objects.extend( _SlotValues( obj ) )
+  return size
+
+
+def _SlotValues( obj ):
+  for cls in type( obj ).__mro__:
+    for slot in cls.__dict__.get( '__slots__', () ):
+      value = getattr( obj, slot, None )
+      if value is not None:
+        yield value
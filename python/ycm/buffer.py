@@ -22,7 +22,10 @@ from __future__ import absolute_import
 # Not installing aliases from python-future; it's unreliable and slow.
 from builtins import *  # noqa
 
+from collections import OrderedDict
+from future.utils import itervalues
 from ycm import vimsupport
+from ycm.base import DeepSizeOf
 from ycm.client.event_notification import EventNotification
 from ycm.diagnostic_interface import DiagnosticInterface
 
@@ -37,42 +40,104 @@ DIAGNOSTIC_UI_ASYNC_FILETYPES = { 'java' }
 # request. Stores buffer change tick at the parse request moment, allowing
 # to effectively determine whether reparse is needed for the buffer.
 class Buffer( object ):
+  __slots__ = ( 'number', '_user_options', '_parse_tick', '_handled_tick',
+                '_parse_generation', '_parse_request', '_async_diags',
+                '_diag_interface' )
 
   def __init__( self, bufnr, user_options, async_diags ):
     self.number = bufnr
+    self._user_options = user_options
     self._parse_tick = 0
     self._handled_tick = 0
+    self._parse_generation = None
     self._parse_request = None
     self._async_diags = async_diags
     self._diag_interface = DiagnosticInterface( bufnr, user_options )
 
 
+  def ReleaseState( self ):
+    """Drop the last parse request and the diagnostics of the buffer to free
+    memory. Only cheap metadata like the parse ticks are kept. The buffer
+    variables backed by the diagnostics are reset while the signs still placed
+    in the buffer are synchronized on the next diagnostics update."""
+    self._parse_request = None
+    self._diag_interface = DiagnosticInterface( self.number,
+                                                self._user_options )
+    self._diag_interface.ResetBufferVariables()
+
+
+  def EstimateStateSize( self, seen ):
+    """Estimate the memory used by the last parse request and the diagnostics
+    of the buffer. See base.DeepSizeOf for |seen|."""
+    return ( DeepSizeOf( self._parse_request, seen ) +
+             DeepSizeOf( self._diag_interface, seen ) )
+
+
   def FileParseRequestReady( self, block = False ):
     return bool( self._parse_request and
                  ( block or self._parse_request.Done() ) )
 
 
-  def SendParseRequest( self, extra_data ):
-    self._parse_request = EventNotification( 'FileReadyToParse',
-                                             extra_data = extra_data )
-    self._parse_request.Start()
+  def ParseRequestInProgress( self ):
+    return bool( self._parse_request and not self._parse_request.Done() )
+
+
+  def SendParseRequest( self, extra_data, event_queue = None ):
+    """The parse request is sent after the events of |event_queue| if given
+    (see EventNotification.Start)."""
+    # Diagnostics are organized by line in a worker thread as soon as they are
+    # received so that only the UI updates are left to the main thread.
+    response_processor = None
+    if not self._async_diags:
+      response_processor = self._diag_interface.CreateUpdatePlanner()
+    self._parse_request = EventNotification(
+      'FileReadyToParse',
+      self.number,
+      extra_data = extra_data,
+      response_processor = response_processor )
+    self._parse_request.Start( event_queue )
     # Decrement handled tick to ensure correct handling when we are forcing
     # reparse on buffer visit and changed tick remains the same.
     self._handled_tick -= 1
     self._parse_tick = self._ChangedTick()
+    self._parse_generation = vimsupport.GetEditGeneration( self.number )
 
 
   def NeedsReparse( self ):
     return self._parse_tick != self._ChangedTick()
 
 
+  def InvalidateParse( self ):
+    """Make sure the buffer is parsed again on next visit (see
+    NeedsReparseOnVisit)."""
+    self._parse_generation = None
+
+
+  def NeedsReparseOnVisit( self ):
+    """The last parse may be outdated because of changes in other buffers.
+    Return False if neither this buffer nor the other ones changed since then
+    and the response of that parse was handled, in which case its diagnostics
+    are still valid."""
+    return ( not self._parse_request or
+             not self.IsResponseHandled() or
+             self.ShouldResendParseRequest() or
+             self.NeedsReparse() or
+             self._parse_generation !=
+               vimsupport.GetEditGeneration( self.number ) )
+
+
   def ShouldResendParseRequest( self ):
     return bool( self._parse_request and self._parse_request.ShouldResend() )
 
 
   def UpdateDiagnostics( self, force=False ):
     if force or not self._async_diags:
-      self.UpdateWithNewDiagnostics( self._parse_request.Response() )
+      diagnostics = self._parse_request.Response()
+      plan = self._parse_request.ProcessedResponse( diagnostics )
+      if plan:
+        self._diag_interface.ApplyUpdatePlan( plan )
+      else:
+        self.UpdateWithNewDiagnostics( diagnostics )
     else:
       # We need to call the response method, because it might throw an exception
       # or require extra config confirmation, even if we don't actually use the
@@ -84,14 +149,30 @@ class Buffer( object ):
     self._diag_interface.UpdateWithNewDiagnostics( diagnostics )
 
 
+  def HasPendingDiagnosticUpdates( self ):
+    return self._diag_interface.HasPendingUpdates()
+
+
+  def ApplyPendingDiagnosticUpdates( self, deadline = None ):
+    return self._diag_interface.ApplyPendingUpdates( deadline )
+
+
   def UpdateMatches( self ):
-    self._diag_interface.UpdateMatches()
+    return self._diag_interface.UpdateMatches()
 
 
   def PopulateLocationList( self ):
     return self._diag_interface.PopulateLocationList()
 
 
+  def GetNextDiagnosticPosition( self, line, column, forward = True,
+                                 kind = None ):
+    return self._diag_interface.GetNextDiagnosticPosition( line,
+                                                          column,
+                                                          forward,
+                                                          kind )
+
+
   def GetResponse( self ):
     return self._parse_request.Response()
 
@@ -104,10 +185,6 @@ class Buffer( object ):
     self._handled_tick = self._parse_tick
 
 
-  def OnCursorMoved( self ):
-    self._diag_interface.OnCursorMoved()
-
-
   def GetErrorCount( self ):
     return self._diag_interface.GetErrorCount()
 
@@ -116,6 +193,10 @@ class Buffer( object ):
     return self._diag_interface.GetWarningCount()
 
 
+  def GetDiagnosticCounts( self ):
+    return self._diag_interface.GetDiagnosticCounts()
+
+
   def _ChangedTick( self ):
     return vimsupport.GetBufferChangedTick( self.number )
 
@@ -124,6 +205,9 @@ class BufferDict( dict ):
 
   def __init__( self, user_options ):
     self._user_options = user_options
+    # Numbers of the buffers whose state is kept, from the least to the most
+    # recently entered.
+    self._buffers_with_state = OrderedDict()
 
 
   def __missing__( self, key ):
@@ -133,5 +217,56 @@ class BufferDict( dict ):
       self._user_options,
       any( x in DIAGNOSTIC_UI_ASYNC_FILETYPES
            for x in vimsupport.GetBufferFiletypes( key ) ) )
+    self._buffers_with_state[ key ] = True
 
     return new_value
+
+
+  def Remove( self, bufnr ):
+    """Forget buffer |bufnr|, e.g. when it's unloaded or wiped out."""
+    self.pop( bufnr, None )
+    self._buffers_with_state.pop( bufnr, None )
+
+
+  def OnBufferVisit( self, bufnr ):
+    """Mark buffer |bufnr| as the most recently entered and release the state
+    of the hidden buffers least recently entered if there are too many buffers
+    with state. Return True if some state was released."""
+    self[ bufnr ]
+    self._buffers_with_state.pop( bufnr, None )
+    self._buffers_with_state[ bufnr ] = True
+
+    excess = ( len( self._buffers_with_state ) -
+               self._user_options[ 'max_buffers_with_state' ] )
+    released = False
+    for number in list( self._buffers_with_state ):
+      if excess <= 0:
+        break
+      # Buffers displayed in a window are not released.
+      if not vimsupport.BufferIsVisible( number ):
+        self[ number ].ReleaseState()
+        del self._buffers_with_state[ number ]
+        excess -= 1
+        released = True
+    return released
+
+
+  def HasState( self, bufnr ):
+    return bufnr in self._buffers_with_state
+
+
+  def RecentlyEnteredBufferNumbers( self ):
+    """Return the numbers of the buffers with state, from the most to the least
+    recently entered."""
+    return list( reversed( self._buffers_with_state ) )
+
+
+  def GetMemoryUsage( self ):
+    """Return the number of buffers, the number of buffers with state, and an
+    estimate in bytes of the memory used by that state."""
+    seen = set()
+    # Don't count the objects shared by all buffers.
+    DeepSizeOf( self._user_options, seen )
+    size = sum( buffer_object.EstimateStateSize( seen )
+                for buffer_object in itervalues( self ) )
+    return len( self ), len( self._buffers_with_state ), size
@@ -96,6 +96,14 @@ class BaseRequest( object ):
     return None
 
 
+  @staticmethod
+  def JsonFromFuture( future ):
+    """Get the server response from a done |future| object. Unlike
+    HandleFuture, exceptions are not caught and the user is never prompted so
+    that it can be called from any thread."""
+    return _JsonFromFuture( future )
+
+
   # This method blocks
   # |timeout| is num seconds to tolerate no response from server before giving
   # up; see Requests docs for details (we just pass the param along).
@@ -203,9 +211,15 @@ class BaseRequest( object ):
   hmac_secret = ''
 
 
-def BuildRequestData( buffer_number = None ):
+def BuildRequestData( buffer_number = None,
+                      slim = False,
+                      truncate_large_file = False ):
   """Build request for the current buffer or the buffer with number
-  |buffer_number| if specified."""
+  |buffer_number| if specified. If |slim| is True, the file data only contains
+  the buffer with its filetypes and the line of the request position; the
+  server relies on the contents it received with previous requests. If
+  |truncate_large_file| is True, only the lines around the request position are
+  sent for a large buffer (see GetUnsavedAndSpecifiedBufferData)."""
   working_dir = GetCurrentDirectory()
   current_buffer = vim.current.buffer
 
@@ -218,8 +232,11 @@ def BuildRequestData( buffer_number = None ):
       'line_num': 1,
       'column_num': 1,
       'working_dir': working_dir,
-      'file_data': vimsupport.GetUnsavedAndSpecifiedBufferData( buffer_object,
-                                                                filepath )
+      'file_data': _BuildFileData( buffer_object,
+                                   filepath,
+                                   1,
+                                   slim,
+                                   truncate_large_file )
     }
 
   current_filepath = vimsupport.GetBufferFilepath( current_buffer )
@@ -230,11 +247,29 @@ def BuildRequestData( buffer_number = None ):
     'line_num': line + 1,
     'column_num': column + 1,
     'working_dir': working_dir,
-    'file_data': vimsupport.GetUnsavedAndSpecifiedBufferData( current_buffer,
-                                                              current_filepath )
+    'file_data': _BuildFileData( current_buffer,
+                                 current_filepath,
+                                 line + 1,
+                                 slim,
+                                 truncate_large_file )
   }
 
 
+def _BuildFileData( buffer_object,
+                    filepath,
+                    line_num,
+                    slim,
+                    truncate_large_file ):
+  if slim:
+    return { filepath: vimsupport.GetBufferLineData( buffer_object,
+                                                     line_num ) }
+  if not truncate_large_file:
+    line_num = None
+  return vimsupport.GetUnsavedAndSpecifiedBufferData( buffer_object,
+                                                      filepath,
+                                                      line_num )
+
+
 def _JsonFromFuture( future ):
   response = future.result()
   _ValidateResponseObject( response )
@@ -89,7 +89,7 @@ class CommandRequest( BaseRequest ):
   def _HandleGotoResponse( self, modifiers ):
     if isinstance( self._response, list ):
       vimsupport.SetQuickFixList(
-        [ _BuildQfListItem( x ) for x in self._response ] )
+        _BuildQfListItem( x ) for x in self._response )
       vimsupport.OpenQuickFixList( focus = True, autoclose = True )
     else:
       vimsupport.JumpToLocation( self._response[ 'filepath' ],
@@ -22,27 +22,82 @@ from __future__ import absolute_import
 # Not installing aliases from python-future; it's unreliable and slow.
 from builtins import *  # noqa
 
+from collections import deque, OrderedDict
+from concurrent.futures import Future
+from future.utils import itervalues
+import logging
+import threading
+
 from ycm.client.base_request import BaseRequest, BuildRequestData
 
+_logger = logging.getLogger( __name__ )
+
+# Number of queued events above which the queue is flushed without waiting for
+# the timer.
+EVENT_QUEUE_MAX_SIZE = 100
+# Maximum number of queued events sent at the same time.
+EVENT_QUEUE_MAX_POSTS_IN_PROGRESS = 4
+
 
 class EventNotification( BaseRequest ):
-  def __init__( self, event_name, buffer_number = None, extra_data = None ):
+  def __init__( self,
+                event_name,
+                buffer_number = None,
+                extra_data = None,
+                response_processor = None,
+                slim = False ):
+    """|response_processor| is an optional function called from a worker thread
+    with the response of the server as soon as it is received. It must not
+    interact with Vim. Its result is returned by ProcessedResponse. If |slim| is
+    True, the contents of the buffers are not sent (see BuildRequestData)."""
     super( EventNotification, self ).__init__()
     self._event_name = event_name
     self._buffer_number = buffer_number
     self._extra_data = extra_data
+    self._slim = slim
+    self._response_processor = response_processor
     self._response_future = None
     self._cached_response = None
+    self._processed_response = None
+
+
+  def Start( self, event_queue = None ):
+    """If |event_queue| is given, the events queued in it for the same file are
+    sent first and the notification is only posted once they are done so that
+    the server receives them in order."""
+    request_data = BuildEventRequestData( self._event_name,
+                                          self._buffer_number,
+                                          self._extra_data,
+                                          self._slim )
+
+    if event_queue is not None:
+      event_queue.Flush( last_event = ( request_data, self._OnPosted ) )
+      return
+
+    self._OnPosted( self.PostDataToHandlerAsync( request_data,
+                                                 'event_notification' ) )
+
 
+  def _OnPosted( self, future ):
+    # May be called from a worker thread when the notification is sent after
+    # queued events. The future is set last so that the request is not seen as
+    # done before the callback is added.
+    if self._response_processor:
+      future.add_done_callback( self._ProcessResponse )
+    self._response_future = future
 
-  def Start( self ):
-    request_data = BuildRequestData( self._buffer_number )
-    if self._extra_data:
-      request_data.update( self._extra_data )
-    request_data[ 'event_name' ] = self._event_name
 
-    self._response_future = self.PostDataToHandlerAsync( request_data,
-                                                         'event_notification' )
+  def _ProcessResponse( self, future ):
+    # Called from a worker thread. Errors are handled on the main thread when
+    # calling Response. If the response is needed before being processed, it is
+    # simply decoded again on the main thread.
+    try:
+      response = self.JsonFromFuture( future )
+      self._processed_response = ( response,
+                                   self._response_processor( response or [] ) )
+    except Exception:
+      _logger.debug( 'Unable to process the response of the %s event',
+                     self._event_name )
 
 
   def Done( self ):
@@ -56,14 +111,171 @@ class EventNotification( BaseRequest ):
     if not self._response_future or self._event_name != 'FileReadyToParse':
       return []
 
-    self._cached_response = self.HandleFuture( self._response_future,
-                                               truncate_message = True )
+    if self._processed_response:
+      # The response was already successfully decoded in the worker thread.
+      self._cached_response = self._processed_response[ 0 ]
+    else:
+      self._cached_response = self.HandleFuture( self._response_future,
+                                                 truncate_message = True )
 
     return self._cached_response if self._cached_response else []
 
 
+  def ProcessedResponse( self, response ):
+    """Return the result of the response processor if it was called on
+    |response|, None otherwise."""
+    if self._processed_response and self._processed_response[ 0 ] is response:
+      return self._processed_response[ 1 ]
+    return None
+
+
+class EventNotificationQueue( object ):
+  """Queue of event notifications that come in bursts, like BufferUnload when
+  deleting many buffers with :bufdo bd or BufferVisit when restoring a session.
+  Only the last occurrence of an event for a given file is kept. Queued events
+  are sent when flushed, at most EVENT_QUEUE_MAX_POSTS_IN_PROGRESS at a time,
+  so that a burst doesn't occupy all the workers of the request executor.
+  Events of the same file are sent one after the other in order. Their
+  responses are ignored."""
+
+  def __init__( self,
+                max_size = EVENT_QUEUE_MAX_SIZE,
+                max_posts_in_progress = EVENT_QUEUE_MAX_POSTS_IN_PROGRESS ):
+    self._max_size = max_size
+    self._max_posts_in_progress = max_posts_in_progress
+    self._events = OrderedDict()
+    # Flushed events waiting to be sent as tuples of filepath, request data, and
+    # function called with the future of the request. Shared with the worker
+    # threads like the attributes below.
+    self._pending_events = deque()
+    # Files with an event being sent.
+    self._files_in_progress = set()
+    self._num_posts_in_progress = 0
+    self._lock = threading.Lock()
+
+
+  def Add( self,
+           event_name,
+           buffer_number = None,
+           extra_data = None,
+           slim = False ):
+    # The request is built right away since the buffer may not exist anymore
+    # when the queue is flushed.
+    request_data = BuildEventRequestData( event_name,
+                                          buffer_number,
+                                          extra_data,
+                                          slim )
+    key = ( event_name, request_data[ 'filepath' ] )
+    self._events.pop( key, None )
+    self._events[ key ] = request_data
+    if len( self._events ) >= self._max_size:
+      self.Flush()
+
+
+  def Flush( self, last_event = None ):
+    """Send the queued events. |last_event| is an optional pair of request data
+    and function called with the future of the request. It is sent after the
+    events of the same file, including those of previous flushes still in
+    progress, without counting towards the limit of posts in progress."""
+    with self._lock:
+      self._pending_events.extend(
+        ( request_data[ 'filepath' ], request_data, None )
+        for request_data in itervalues( self._events ) )
+      self._events = OrderedDict()
+      if last_event:
+        request_data, on_posted = last_event
+        self._pending_events.append(
+          ( request_data[ 'filepath' ], request_data, on_posted ) )
+    self._PostPendingEvents()
+
+
+  def _PostPendingEvents( self ):
+    """Post the pending events that can be sent now. The others are posted from
+    a worker thread once an event is done."""
+    while True:
+      with self._lock:
+        event = self._PopNextEvent()
+        if not event:
+          return
+      filepath, request_data, on_posted = event
+      try:
+        future = EventNotification.PostDataToHandlerAsync(
+          request_data, 'event_notification' )
+      except Exception as error:
+        # The function must be called in all cases so that a request waiting
+        # for the events is never left in progress.
+        future = Future()
+        future.set_exception( error )
+      finally:
+        if on_posted:
+          on_posted( future )
+
+      if future.done():
+        self._OnEventDone( filepath, on_posted )
+      else:
+        future.add_done_callback(
+          lambda future, filepath = filepath, on_posted = on_posted:
+            self._OnEventDoneAndPost( filepath, on_posted ) )
+
+
+  def _PopNextEvent( self ):
+    """Remove and return the first pending event whose file has no event in
+    progress or before it in the queue, or None if there is none. Must be
+    called with the lock held."""
+    can_post_queued_event = (
+      self._num_posts_in_progress < self._max_posts_in_progress )
+    blocked_files = set( self._files_in_progress )
+    for index, event in enumerate( self._pending_events ):
+      filepath, _, on_posted = event
+      if ( filepath not in blocked_files and
+           ( on_posted or can_post_queued_event ) ):
+        del self._pending_events[ index ]
+        self._files_in_progress.add( filepath )
+        if not on_posted:
+          self._num_posts_in_progress += 1
+        return event
+      blocked_files.add( filepath )
+    return None
+
+
+  def _OnEventDone( self, filepath, on_posted ):
+    with self._lock:
+      self._files_in_progress.discard( filepath )
+      if not on_posted:
+        self._num_posts_in_progress -= 1
+
+
+  def _OnEventDoneAndPost( self, filepath, on_posted ):
+    # Called from a worker thread.
+    self._OnEventDone( filepath, on_posted )
+    self._PostPendingEvents()
+
+
+  def __len__( self ):
+    return len( self._events )
+
+
+def BuildEventRequestData( event_name,
+                           buffer_number = None,
+                           extra_data = None,
+                           slim = False ):
+  # Events only feed the identifier database and parse the buffer so the
+  # contents of a large buffer can be truncated.
+  request_data = BuildRequestData( buffer_number,
+                                   slim,
+                                   truncate_large_file = True )
+  if extra_data:
+    request_data.update( extra_data )
+  request_data[ 'event_name' ] = event_name
+  return request_data
+
+
 def SendEventNotificationAsync( event_name,
                                 buffer_number = None,
-                                extra_data = None ):
-  event = EventNotification( event_name, buffer_number, extra_data )
+                                extra_data = None,
+                                slim = False ):
+  event = EventNotification( event_name,
+                             buffer_number,
+                             extra_data,
+                             slim = slim )
   event.Start()
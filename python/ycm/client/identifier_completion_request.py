@@ -0,0 +1,107 @@
+# Copyright (C) 2019 YouCompleteMe contributors
+#
+# This file is part of YouCompleteMe.
+#
+# YouCompleteMe is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# YouCompleteMe is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with YouCompleteMe.  If not, see <http://www.gnu.org/licenses/>.
+
+from __future__ import unicode_literals
+from __future__ import print_function
+from __future__ import division
+from __future__ import absolute_import
+# Not installing aliases from python-future; it's unreliable and slow.
+from builtins import *  # noqa
+
+import re
+from ycmd.utils import ToBytes
+from ycm.client.completion_request import CompletionRequest
+from ycm import vimsupport
+
+IDENTIFIER_REGEX = re.compile( r'[^\W\d]\w*', re.UNICODE )
+IDENTIFIER_BEFORE_CURSOR_REGEX = re.compile( r'[^\W\d]\w*$', re.UNICODE )
+
+
+class VisibleIdentifierCompletionRequest( CompletionRequest ):
+  """Complete the identifier before the cursor with the identifiers of the
+  lines displayed in the current window. Used in huge files (see the
+  g:ycm_huge_file_threshold_kb option) instead of the server since they are
+  not sent to it."""
+
+  def __init__( self, request_data, user_options ):
+    super( VisibleIdentifierCompletionRequest, self ).__init__( request_data )
+    self._min_num_chars = user_options[ 'min_num_of_chars_for_completion' ]
+    self._max_candidates = user_options[ 'max_num_identifier_candidates' ]
+    self._start_column = request_data[ 'column_num' ]
+    self._results = []
+
+
+  def Start( self ):
+    match = IDENTIFIER_BEFORE_CURSOR_REGEX.search(
+      vimsupport.TextBeforeCursor() )
+    query = match.group() if match else ''
+    self._start_column = (
+      self.request_data[ 'column_num' ] - len( ToBytes( query ) ) )
+    if ( len( query ) < self._min_num_chars and
+         not self.request_data.get( 'force_semantic' ) ):
+      return
+
+    identifiers = set()
+    for line in vimsupport.GetVisibleLines():
+      identifiers.update( IDENTIFIER_REGEX.findall( line ) )
+    identifiers.discard( query )
+
+    self._results = _FilterAndSortCandidates( identifiers, query )
+    if self._max_candidates > 0:
+      self._results = self._results[ : self._max_candidates ]
+
+
+  def Done( self ):
+    return True
+
+
+  def _RawResponse( self ):
+    return {
+      'line': self.request_data[ 'line_num' ],
+      'column': self.request_data[ 'column_num' ],
+      'completion_start_column': self._start_column,
+      'completions': [ { 'insertion_text': identifier,
+                         'extra_menu_info': '[ID]' }
+                       for identifier in self._results ]
+    }
+
+
+  def OnCompleteDone( self ):
+    pass
+
+
+def _FilterAndSortCandidates( candidates, query ):
+  """Keep the candidates containing the characters of |query| in the same order
+  with smart case and sort them: candidates starting with |query| first, then
+  shorter ones first."""
+  ignore_case = query == query.lower()
+  if ignore_case:
+    query = query.lower()
+
+  matches = []
+  for candidate in candidates:
+    key = candidate.lower() if ignore_case else candidate
+    if _IsSubsequence( query, key ):
+      matches.append( ( not key.startswith( query ),
+                        len( candidate ),
+                        candidate ) )
+  return [ candidate for _, _, candidate in sorted( matches ) ]
+
+
+def _IsSubsequence( query, candidate ):
+  characters = iter( candidate )
+  return all( character in characters for character in query )
@@ -22,7 +22,10 @@ from __future__ import absolute_import
 # Not installing aliases from python-future; it's unreliable and slow.
 from builtins import *  # noqa
 
-from ycm.client.base_request import BaseRequest, BuildRequestData
+from collections import OrderedDict
+import vim
+from ycm.client.base_request import BaseRequest
+from ycm import vimsupport
 from ycm.vimsupport import PostVimMessage
 
 import logging
@@ -34,9 +37,13 @@ TIMEOUT_SECONDS = 60
 
 
 class MessagesPoll( BaseRequest ):
+  """Long poll for the messages and diagnostics pushed by the completer of
+  the current buffer. A single poll is kept for all buffers: the server sends
+  the diagnostics of every file in the project through it."""
+
   def __init__( self ):
     super( MessagesPoll, self ).__init__()
-    self._request_data = BuildRequestData()
+    self._request_data = _BuildPollRequestData()
     self._response_future = None
 
 
@@ -77,17 +84,27 @@ class MessagesPoll( BaseRequest ):
     return False
 
 
+def _BuildPollRequestData():
+  """The server only needs the filetypes of the buffer to select the completer
+  to poll. The contents of the buffer are not sent since they are not used and
+  the request is repeated for as long as the poll is running."""
+  filepath = vimsupport.GetBufferFilepath( vim.current.buffer )
+  return {
+    'filepath': filepath,
+    'line_num': 1,
+    'column_num': 1,
+    'file_data': {
+      filepath: {
+        'contents': '',
+        'filetypes': vimsupport.CurrentFiletypes()
+      }
+    }
+  }
+
+
 def _HandlePollResponse( response, diagnostics_handler ):
   if isinstance( response, list ):
-    for notification in response:
-      if 'message' in notification:
-        PostVimMessage( notification[ 'message' ],
-                        warning = False,
-                        truncate = True )
-      elif 'diagnostics' in notification:
-        diagnostics_handler.UpdateWithNewDiagnosticsForFile(
-          notification[ 'filepath' ],
-          notification[ 'diagnostics' ] )
+    _HandleNotifications( response, diagnostics_handler )
   elif response is False:
     # Don't keep polling for this file
     return False
@@ -96,3 +113,25 @@ def _HandlePollResponse( response, diagnostics_handler ):
 
   # Start the next poll (only if the last poll didn't raise an exception)
   return True
+
+
+def _HandleNotifications( notifications, diagnostics_handler ):
+  """Servers may push many notifications at once (e.g. the diagnostics of all
+  the files in a project after a build). Diagnostics are grouped by file, only
+  keeping the latest ones, and applied together. Only the last message is
+  displayed since each one would replace the previous one on the status line
+  anyway."""
+  last_message = None
+  diagnostics_by_file = OrderedDict()
+  for notification in notifications:
+    if 'message' in notification:
+      last_message = notification[ 'message' ]
+    elif 'diagnostics' in notification:
+      filepath = notification[ 'filepath' ]
+      diagnostics_by_file.pop( filepath, None )
+      diagnostics_by_file[ filepath ] = notification[ 'diagnostics' ]
+
+  if diagnostics_by_file:
+    diagnostics_handler.UpdateWithNewDiagnosticsForFiles( diagnostics_by_file )
+  if last_message is not None:
+    PostVimMessage( last_message, warning = False, truncate = True )
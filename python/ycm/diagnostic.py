@@ -0,0 +1,144 @@
+# Copyright (C) 2018 YouCompleteMe contributors
+#
+# This file is part of YouCompleteMe.
+#
+# YouCompleteMe is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# YouCompleteMe is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with YouCompleteMe.  If not, see <http://www.gnu.org/licenses/>.
+
+from __future__ import unicode_literals
+from __future__ import print_function
+from __future__ import division
+from __future__ import absolute_import
+# Not installing aliases from python-future; it's unreliable and slow.
+from builtins import *  # noqa
+
+
+class Diagnostic( object ):
+  """Compact representation of a diagnostic returned by the server. Positions
+  are kept as tuples of integers instead of nested dictionaries repeating the
+  file path. The extent and the ranges are tuples of the form (start line,
+  start column, end line, end column). Two diagnostics compare equal if
+  everything displayed about them is the same."""
+
+  __slots__ = ( 'kind', 'text', 'filepath', 'line_num', 'column_num',
+                'extent', 'ranges', 'fixit_available' )
+
+  def __init__( self,
+                kind,
+                text,
+                filepath,
+                line_num,
+                column_num,
+                extent,
+                ranges,
+                fixit_available ):
+    self.kind = kind
+    self.text = text
+    self.filepath = filepath
+    self.line_num = line_num
+    self.column_num = column_num
+    self.extent = extent
+    self.ranges = ranges
+    self.fixit_available = fixit_available
+
+
+  @staticmethod
+  def FromResponses( diagnostics ):
+    """Convert the diagnostics of a server response. The server response doesn't
+    share any string between diagnostics so the strings repeated across them
+    (kinds and file paths) are replaced by a single instance. The table of
+    shared strings is only kept while converting the list."""
+    interned_strings = {}
+    return [ Diagnostic.FromResponse( diagnostic, interned_strings )
+             for diagnostic in diagnostics ]
+
+
+  @staticmethod
+  def FromResponse( diagnostic, interned_strings = None ):
+    """Convert a diagnostic of a server response. See FromResponses for
+    |interned_strings|."""
+    if interned_strings is None:
+      interned_strings = {}
+    location = diagnostic[ 'location' ]
+    kind = diagnostic[ 'kind' ]
+    filepath = location[ 'filepath' ]
+    return Diagnostic( interned_strings.setdefault( kind, kind ),
+                       diagnostic[ 'text' ],
+                       interned_strings.setdefault( filepath, filepath ),
+                       location[ 'line_num' ],
+                       location[ 'column_num' ],
+                       _PackRange( diagnostic[ 'location_extent' ] ),
+                       tuple( _PackRange( diagnostic_range )
+                              for diagnostic_range in diagnostic[ 'ranges' ] ),
+                       diagnostic.get( 'fixit_available', False ) )
+
+
+  def ToResponse( self ):
+    """Return the diagnostic in the format of the server. All positions are in
+    the file of the diagnostic."""
+    return {
+      'kind': self.kind,
+      'text': self.text,
+      'fixit_available': self.fixit_available,
+      'location': _UnpackPosition( self.filepath,
+                                   self.line_num,
+                                   self.column_num ),
+      'location_extent': _UnpackRange( self.filepath, self.extent ),
+      'ranges': [ _UnpackRange( self.filepath, diagnostic_range )
+                  for diagnostic_range in self.ranges ]
+    }
+
+
+  def _Key( self ):
+    return ( self.kind,
+             self.text,
+             self.line_num,
+             self.column_num,
+             self.extent,
+             self.ranges,
+             self.fixit_available )
+
+
+  def __eq__( self, other ):
+    return isinstance( other, Diagnostic ) and self._Key() == other._Key()
+
+
+  def __ne__( self, other ):
+    return not self == other
+
+
+  def __hash__( self ):
+    return hash( self._Key() )
+
+
+def _PackRange( diagnostic_range ):
+  start = diagnostic_range[ 'start' ]
+  end = diagnostic_range[ 'end' ]
+  return ( start[ 'line_num' ], start[ 'column_num' ],
+           end[ 'line_num' ], end[ 'column_num' ] )
+
+
+def _UnpackPosition( filepath, line_num, column_num ):
+  return {
+    'filepath': filepath,
+    'line_num': line_num,
+    'column_num': column_num
+  }
+
+
+def _UnpackRange( filepath, diagnostic_range ):
+  start_line, start_column, end_line, end_column = diagnostic_range
+  return {
+    'start': _UnpackPosition( filepath, start_line, start_column ),
+    'end': _UnpackPosition( filepath, end_line, end_column )
+  }
@@ -27,24 +27,51 @@ from ycm import vimsupport
 import re
 
 
+# Inline flags like (?i) or (?x) at the start of a pattern apply to the whole
+# regex so such patterns can't be merged with others. Neither can patterns with
+# backreferences or conditional groups since the group numbers change.
+UNCOMBINABLE_REGEX = re.compile(
+  r'^\(\?[aiLmsux]+\)|\\[1-9]|\(\?P=|\(\?\(' )
+
+
 class DiagnosticFilter( object ):
   def __init__( self, config_or_filters ):
     if isinstance( config_or_filters, list ):
-      self._filters = config_or_filters
+      filters = config_or_filters
 
     else:
-      self._filters = _CompileFilters( config_or_filters )
+      filters = _ParseFilters( config_or_filters )
+
+    # Regex filters are merged into as few patterns as possible and level
+    # filters into a set of kinds so that each diagnostic is checked once
+    # whatever the number of filters.
+    self._levels = frozenset( value.upper() for filter_type, value in filters
+                              if filter_type == 'level' )
+    self._patterns = _CombineRegexes( [ value for filter_type, value in filters
+                                        if filter_type == 'regex' ] )
 
 
   def IsAllowed( self, diagnostic ):
     # NOTE: a diagnostic IsAllowed() ONLY if NO filters match it
-    for filterMatches in self._filters:
-      if filterMatches( diagnostic ):
+    if self._levels and diagnostic[ 'kind' ] in self._levels:
+      return False
+
+    text = diagnostic[ 'text' ]
+    for pattern in self._patterns:
+      if pattern.search( text ):
         return False
 
     return True
 
 
+  def Filter( self, diagnostics ):
+    """Return the list of allowed diagnostics from |diagnostics|."""
+    if not self._levels and not self._patterns:
+      return list( diagnostics )
+    return [ diagnostic for diagnostic in diagnostics
+             if self.IsAllowed( diagnostic ) ]
+
+
   def SubsetForTypes( self, filetypes ):
     """Return a sub-filter limited to the given filetypes"""
     # NOTE: actually, this class is already filtered
@@ -53,16 +80,24 @@ class DiagnosticFilter( object ):
 
   @staticmethod
   def CreateFromOptions( user_options ):
+    """Return the filter for the g:ycm_filter_diagnostics option. The filter is
+    shared by all buffers until the option changes."""
     all_filters = user_options[ 'filter_diagnostics' ]
-    compiled_by_type = {}
+    shared_filters, shared_filter = _SHARED_MASTER_FILTER
+    if shared_filter is not None and shared_filters == all_filters:
+      return shared_filter
+
+    filters_by_type = {}
     for type_spec, filter_value in iteritems( all_filters ):
       filetypes = [ type_spec ]
       if type_spec.find( ',' ) != -1:
         filetypes = type_spec.split( ',' )
       for filetype in filetypes:
-        compiled_by_type[ filetype ] = _CompileFilters( filter_value )
+        filters_by_type[ filetype ] = _ParseFilters( filter_value )
 
-    return _MasterDiagnosticFilter( compiled_by_type )
+    master_filter = _MasterDiagnosticFilter( filters_by_type )
+    _SHARED_MASTER_FILTER[ : ] = [ all_filters, master_filter ]
+    return master_filter
 
 
 class _MasterDiagnosticFilter( object ):
@@ -100,6 +135,10 @@ class _MasterDiagnosticFilter( object ):
     return new_filter
 
 
+# The g:ycm_filter_diagnostics option and the filter created from it.
+_SHARED_MASTER_FILTER = [ None, None ]
+
+
 def _ListOf( config_entry ):
   if isinstance( config_entry, list ):
     return config_entry
@@ -131,20 +170,46 @@ def CompileLevel( level ):
   return FilterLevel
 
 
-FILTER_COMPILERS = { 'regex' : CompileRegex,
-                     'level' : CompileLevel }
+FILTER_TYPES = [ 'regex', 'level' ]
 
 
-def _CompileFilters( config ):
-  """Given a filter config dictionary, return a list of compiled filters"""
+def _ParseFilters( config ):
+  """Given a filter config dictionary, return a list of (type, value) filter
+  specifications"""
   filters = []
 
   for filter_type in iterkeys( config ):
-    compiler = FILTER_COMPILERS.get( filter_type )
-
-    if compiler is not None:
+    if filter_type in FILTER_TYPES:
       for filter_config in _ListOf( config[ filter_type ] ):
-        compiledFilter = compiler( filter_config )
-        filters.append( compiledFilter )
+        filters.append( ( filter_type, filter_config ) )
 
   return filters
+
+
+def _CombineRegexes( raw_regexes ):
+  """Compile the list of regexes |raw_regexes| into a list of patterns,
+  merging them into a single alternation when possible."""
+  combinable = []
+  patterns = []
+  for raw_regex in raw_regexes:
+    if raw_regex in combinable:
+      continue
+    if UNCOMBINABLE_REGEX.search( raw_regex ):
+      patterns.append( re.compile( raw_regex, re.IGNORECASE ) )
+    else:
+      combinable.append( raw_regex )
+
+  if len( combinable ) == 1:
+    return [ re.compile( combinable[ 0 ], re.IGNORECASE ) ] + patterns
+
+  if combinable:
+    try:
+      return [ re.compile( '|'.join( '(?:{0})'.format( raw_regex )
+                                     for raw_regex in combinable ),
+                           re.IGNORECASE ) ] + patterns
+    except re.error:
+      # E.g. the same group name is used in two regexes.
+      patterns.extend( re.compile( raw_regex, re.IGNORECASE )
+                       for raw_regex in combinable )
+
+  return patterns
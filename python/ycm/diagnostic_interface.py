@@ -22,38 +22,114 @@ from __future__ import absolute_import
 # Not installing aliases from python-future; it's unreliable and slow.
 from builtins import *  # noqa
 
-from future.utils import itervalues, iteritems
+from future.utils import iteritems, itervalues
 from collections import defaultdict
+import bisect
+import itertools
+import time
 from ycm import vimsupport
-from ycm.diagnostic_filter import DiagnosticFilter, CompileLevel
+from ycm.diagnostic import Diagnostic
+from ycm.diagnostic_filter import DiagnosticFilter
+
+# Window-local variable holding the state of the diagnostic matches last added
+# to a window. See UpdateMatches.
+MATCHES_FINGERPRINT_VARIABLE = 'ycm_diagnostic_matches_fingerprint'
+
+# Buffer-local variable holding the number of errors, warnings, and diagnostics
+# with a FixIt available in a buffer. Read by youcompleteme#GetErrorCount and
+# youcompleteme#GetWarningCount without going through Python.
+DIAGNOSTIC_COUNTS_VARIABLE = 'ycm_diagnostic_counts'
+DIAGNOSTIC_COUNTS_KEYS = [ 'error', 'warning', 'fixit' ]
+
+# Buffer-local variable mapping line numbers to the message echoed when the
+# cursor is on that line, and buffer-local variable holding the line of the
+# message currently echoed (0 if none). They are used by Vimscript to echo the
+# diagnostics on CursorMoved without going through Python.
+DIAGNOSTIC_MESSAGES_VARIABLE = 'ycm_diagnostic_messages'
+DIAGNOSTIC_ECHOED_LINE_VARIABLE = 'ycm_diagnostic_echoed_line'
+
+# Generation numbers of the matches are shared by all buffers so that they are
+# never reused, even when the diagnostic interface of a buffer is recreated.
+_generation_counter = itertools.count( 1 )
 
 
 class DiagnosticInterface( object ):
+  __slots__ = ( '_bufnr', '_user_options', '_diagnostics', '_diag_filter',
+                '_line_to_diags', '_line_to_matches', '_line_to_counts',
+                '_counts', '_line_to_message', '_placed_signs',
+                '_pending_sign_lines', '_pending_match_lines',
+                '_pending_lines_order', '_window_matches',
+                '_matches_generation', '_received_diagnostics', '_positions' )
+
   def __init__( self, bufnr, user_options ):
     self._bufnr = bufnr
     self._user_options = user_options
+    # Diagnostics are stored as ycm.diagnostic.Diagnostic objects.
     self._diagnostics = []
     self._diag_filter = DiagnosticFilter.CreateFromOptions( user_options )
-    # Line and column numbers are 1-based
-    self._line_to_diags = defaultdict( list )
-    self._previous_diag_line_number = -1
-    self._diag_message_needs_clearing = False
-
-
-  def OnCursorMoved( self ):
-    if self._user_options[ 'echo_current_diagnostic' ]:
-      line, _ = vimsupport.CurrentLineAndColumn()
-      line += 1  # Convert to 1-based
-      if line != self._previous_diag_line_number:
-        self._EchoDiagnosticForLine( line )
+    # Line and column numbers are 1-based. Diagnostics compare equal if they
+    # are displayed the same way, so that only the lines whose diagnostics
+    # changed between two updates are updated.
+    self._line_to_diags = {}
+    # Groups and patterns of the matches added for the diagnostics on each line.
+    self._line_to_matches = {}
+    # Number of errors, warnings, and FixIts on each line and in the buffer.
+    # Only the changed lines are recounted when receiving new diagnostics.
+    self._line_to_counts = {}
+    self._counts = dict.fromkeys( DIAGNOSTIC_COUNTS_KEYS, 0 )
+    # Message echoed for the first diagnostic on each line.
+    self._line_to_message = {}
+    # Signs placed for each line. None until the signs are first synchronized
+    # with the ones in the buffer.
+    self._placed_signs = None
+    # Lines whose signs or matches are not up-to-date with the diagnostics. They
+    # are updated in chunks by ApplyPendingUpdates to not block Vim when a lot
+    # of diagnostics changed.
+    self._pending_sign_lines = set()
+    self._pending_match_lines = set()
+    # Pending lines sorted from the farthest to the closest to the cursor so
+    # that the next line to update is popped from the end. None when lines were
+    # added to the pending ones since it was sorted.
+    self._pending_lines_order = None
+    # Diagnostic matches of the current window grouped by group and pattern,
+    # kept between chunks of updates. None when they must be read again from the
+    # window.
+    self._window_matches = None
+    # Generation of the matches added to the current window, stored in a window
+    # variable. See UpdateMatches.
+    self._matches_generation = 0
+    self._received_diagnostics = False
+    # Sorted positions of the diagnostics of each kind and of all diagnostics
+    # under the None key. See GetNextDiagnosticPosition.
+    self._positions = {}
 
 
   def GetErrorCount( self ):
-    return self._DiagnosticsCount( _DiagnosticIsError )
+    return self._counts[ 'error' ]
 
 
   def GetWarningCount( self ):
-    return self._DiagnosticsCount( _DiagnosticIsWarning )
+    return self._counts[ 'warning' ]
+
+
+  def GetDiagnosticCounts( self ):
+    return dict( self._counts )
+
+
+  def GetNextDiagnosticPosition( self, line, column, forward = True,
+                                 kind = None ):
+    """Return the 1-based line and column of the first diagnostic after the
+    1-based |line| and |column|, or of the last one before if |forward| is
+    False, wrapping around the buffer. Only diagnostics of |kind| ('ERROR' or
+    'WARNING') are considered if given. Return None if there are none."""
+    positions = self._positions.get( kind )
+    if not positions:
+      return None
+    if forward:
+      index = bisect.bisect_right( positions, ( line, column ) )
+      return positions[ index % len( positions ) ]
+    index = bisect.bisect_left( positions, ( line, column ) )
+    return positions[ index - 1 ]
 
 
   def PopulateLocationList( self ):
@@ -64,26 +140,132 @@ class DiagnosticInterface( object ):
 
 
   def UpdateWithNewDiagnostics( self, diags ):
-    self._diagnostics = [ _NormalizeDiagnostic( x ) for x in
-                            self._ApplyDiagnosticFilter( diags ) ]
-    self._ConvertDiagListToDict()
+    self.ApplyUpdatePlan( self.CreateUpdatePlanner()( diags ) )
 
-    if self._user_options[ 'echo_current_diagnostic' ]:
-      self._EchoDiagnostic()
 
-    if self._user_options[ 'enable_diagnostic_signs' ]:
-      self._UpdateSigns()
+  def CreateUpdatePlanner( self ):
+    """Return a function that takes the diagnostics returned by the server for
+    this buffer and computes a DiagnosticUpdatePlan. That function doesn't
+    interact with Vim so that it can be called from a worker thread; the state
+    of the buffer it needs is taken when calling this method."""
+    filepath = vimsupport.GetBufferFilepathForNumber( self._bufnr )
+    filetypes = vimsupport.GetBufferFiletypes( self._bufnr )
+    diag_filter = self._diag_filter.SubsetForTypes( filetypes )
+    num_lines = vimsupport.GetBufferNumLines( self._bufnr )
+    line_to_diags = self._line_to_diags
+
+    def Planner( diags ):
+      return DiagnosticUpdatePlan( diags,
+                                   filepath,
+                                   diag_filter,
+                                   num_lines,
+                                   line_to_diags )
+
+    return Planner
+
+
+  def ApplyUpdatePlan( self, plan ):
+    # The plan was computed against the diagnostics at the time the planner
+    # was created. They may have been updated since then.
+    if plan.previous_line_to_diags is self._line_to_diags:
+      changed_lines = plan.changed_lines
+    else:
+      changed_lines = _ChangedLines( self._line_to_diags, plan.line_to_diags )
+
+    # The location list also contains the diagnostics of other files (e.g.
+    # included headers) so it is compared as a whole.
+    location_list_changed = ( _LocationListKey( self._diagnostics ) !=
+                              _LocationListKey( plan.diagnostics ) )
+    self._diagnostics = plan.diagnostics
+    self._line_to_diags = plan.line_to_diags
+    self._positions = plan.positions
+
+    # Reparsing a file after moving the cursor or making an edit that doesn't
+    # affect the diagnostics is common. Don't touch the UI in that case.
+    if not changed_lines and self._received_diagnostics:
+      if ( location_list_changed and
+           self._user_options[ 'always_populate_location_list' ] ):
+        self._UpdateLocationLists()
+      return
+    self._received_diagnostics = True
 
-    self.UpdateMatches()
+    self._UpdateCounts( changed_lines, plan.line_to_counts )
+
+    self._line_to_message = plan.line_to_message
+    if self._user_options[ 'echo_current_diagnostic' ]:
+      vimsupport.SetBufferVariable( self._bufnr,
+                                    DIAGNOSTIC_MESSAGES_VARIABLE,
+                                    plan.messages )
+      # The diagnostics of a buffer parsed in the background are echoed when
+      # the cursor moves in that buffer.
+      if vimsupport.GetCurrentBufferNumber() == self._bufnr:
+        self._EchoDiagnostic()
+
+    # Lines still pending from a previous update are superseded by these
+    # diagnostics: they will be updated with the new ones.
+    if self._user_options[ 'enable_diagnostic_signs' ]:
+      self._pending_sign_lines.update( changed_lines )
+    if self._user_options[ 'enable_diagnostic_highlighting' ]:
+      self._pending_match_lines.update( changed_lines )
+    self._pending_lines_order = None
+    self.ApplyPendingUpdates( DiagnosticUpdateDeadline( self._user_options ) )
 
     if self._user_options[ 'always_populate_location_list' ]:
       self._UpdateLocationLists()
 
 
-  def _ApplyDiagnosticFilter( self, diags ):
-    filetypes = vimsupport.GetBufferFiletypes( self._bufnr )
-    diag_filter = self._diag_filter.SubsetForTypes( filetypes )
-    return filter( diag_filter.IsAllowed, diags )
+  def HasPendingUpdates( self ):
+    return bool( self._pending_sign_lines or self._pending_match_lines )
+
+
+  def ApplyPendingUpdates( self, deadline = None ):
+    """Update the signs and matches of the lines whose diagnostics changed,
+    starting with the lines closest to the cursor, until |deadline| (as returned
+    by time.time()) is reached. All lines are updated if |deadline| is None.
+    Returns True if some lines remain to be updated."""
+    if ( self._user_options[ 'enable_diagnostic_signs' ] and
+         self._placed_signs is None ):
+      self._SynchronizeSigns()
+
+    window_matches = self._PrepareMatchesUpdate()
+
+    # The order of the pending lines is only computed once for all the chunks
+    # of an update.
+    if self._pending_lines_order is None:
+      self._pending_lines_order = sorted(
+        self._pending_sign_lines.union( self._pending_match_lines ),
+        key = self._DistanceFromCursor() )
+      self._pending_lines_order.reverse()
+
+    order = self._pending_lines_order
+    while order:
+      line = order.pop()
+      if line in self._pending_sign_lines:
+        self._UpdateSignsForLine( line )
+        self._pending_sign_lines.discard( line )
+      if line in self._pending_match_lines:
+        self._UpdateMatchesForLine( line, window_matches )
+        self._pending_match_lines.discard( line )
+      if deadline is not None and time.time() >= deadline:
+        break
+
+    if not self._pending_match_lines:
+      self._window_matches = None
+
+    if window_matches is not None:
+      self._matches_generation = next( _generation_counter )
+      vimsupport.SetCurrentWindowVariable(
+        MATCHES_FINGERPRINT_VARIABLE,
+        self._MatchesFingerprint( self._matches_generation ) )
+
+    return self.HasPendingUpdates()
+
+
+  def _DistanceFromCursor( self ):
+    cursor_line = 1
+    if vimsupport.GetCurrentBufferNumber() == self._bufnr:
+      cursor_line = vimsupport.CurrentLineAndColumn()[ 0 ] + 1
+    return lambda line: abs( line - cursor_line )
 
 
   def _EchoDiagnostic( self ):
@@ -93,30 +275,58 @@ class DiagnosticInterface( object ):
 
 
   def _EchoDiagnosticForLine( self, line_num ):
-    self._previous_diag_line_number = line_num
-
-    diags = self._line_to_diags[ line_num ]
-    if not diags:
-      if self._diag_message_needs_clearing:
+    message = self._line_to_message.get( line_num )
+    if not message:
+      if self._GetEchoedLine():
         # Clear any previous diag echo
         vimsupport.PostVimMessage( '', warning = False )
-        self._diag_message_needs_clearing = False
+        self._SetEchoedLine( 0 )
       return
 
-    first_diag = diags[ 0 ]
-    text = first_diag[ 'text' ]
-    if first_diag.get( 'fixit_available', False ):
-      text += ' (FixIt)'
+    vimsupport.PostVimMessage( message, warning = False, truncate = True )
+    self._SetEchoedLine( line_num )
+
+
+  def _GetEchoedLine( self ):
+    # The line is shared with Vimscript, which echoes the diagnostics when the
+    # cursor moves (see s:EchoDiagnosticForCurrentLine).
+    return vimsupport.GetBufferVariable( self._bufnr,
+                                         DIAGNOSTIC_ECHOED_LINE_VARIABLE ) or 0
+
 
-    vimsupport.PostVimMessage( text, warning = False, truncate = True )
-    self._diag_message_needs_clearing = True
+  def _SetEchoedLine( self, line_num ):
+    vimsupport.SetBufferVariable( self._bufnr,
+                                  DIAGNOSTIC_ECHOED_LINE_VARIABLE,
+                                  line_num )
 
 
-  def _DiagnosticsCount( self, predicate ):
-    count = 0
-    for diags in itervalues( self._line_to_diags ):
-      count += sum( 1 for d in diags if predicate( d ) )
-    return count
+  def _UpdateCounts( self, changed_lines, line_to_counts ):
+    no_counts = ( 0, ) * len( DIAGNOSTIC_COUNTS_KEYS )
+    for line in changed_lines:
+      previous_counts = self._line_to_counts.get( line, no_counts )
+      counts = line_to_counts.get( line, no_counts )
+      for key, previous_count, count in zip( DIAGNOSTIC_COUNTS_KEYS,
+                                             previous_counts,
+                                             counts ):
+        self._counts[ key ] += count - previous_count
+    self._line_to_counts = line_to_counts
+
+    vimsupport.SetBufferVariable( self._bufnr,
+                                  DIAGNOSTIC_COUNTS_VARIABLE,
+                                  self.GetDiagnosticCounts() )
+
+
+  def ResetBufferVariables( self ):
+    """Reset the buffer-local variables holding the diagnostic counts and the
+    messages echoed for each line to match an interface without diagnostics."""
+    vimsupport.SetBufferVariable( self._bufnr,
+                                  DIAGNOSTIC_COUNTS_VARIABLE,
+                                  self.GetDiagnosticCounts() )
+    if self._user_options[ 'echo_current_diagnostic' ]:
+      vimsupport.SetBufferVariable( self._bufnr,
+                                    DIAGNOSTIC_MESSAGES_VARIABLE,
+                                    {} )
+      self._SetEchoedLine( 0 )
 
 
   def _UpdateLocationLists( self ):
@@ -125,108 +335,325 @@ class DiagnosticInterface( object ):
       vimsupport.ConvertDiagnosticsToQfList( self._diagnostics ) )
 
 
-  def UpdateMatches( self ):
-    if not self._user_options[ 'enable_diagnostic_highlighting' ]:
-      return
+  def _MatchesFingerprint( self, generation ):
+    return '{0}:{1}:{2}'.format( generation,
+                                 self._bufnr,
+                                 vimsupport.GetCurrentBufferNumLines() )
+
 
+  def _CanUpdateMatchesInCurrentWindow( self ):
     # Vim doesn't provide a way to update the matches for a different window
     # than the current one (which is a view of the current buffer).
-    if vimsupport.GetCurrentBufferNumber() != self._bufnr:
-      return
+    return bool( self._user_options[ 'enable_diagnostic_highlighting' ] and
+                 vimsupport.GetCurrentBufferNumber() == self._bufnr )
 
-    matches_to_remove = vimsupport.GetDiagnosticMatchesInCurrentWindow()
 
-    for diags in itervalues( self._line_to_diags ):
-      # Insert squiggles in reverse order so that errors overlap warnings.
-      for diag in reversed( diags ):
-        group = ( 'YcmErrorSection' if _DiagnosticIsError( diag ) else
-                  'YcmWarningSection' )
-
-        for pattern in _ConvertDiagnosticToMatchPatterns( diag ):
-          # The id doesn't matter for matches that we may add.
-          match = vimsupport.DiagnosticMatch( 0, group, pattern )
-          try:
-            matches_to_remove.remove( match )
-          except ValueError:
-            vimsupport.AddDiagnosticMatch( match )
+  def UpdateMatches( self ):
+    """Update the diagnostic matches of the current window. Returns True if the
+    matches were recomputed, False if there was nothing to do."""
+    if not self._CanUpdateMatchesInCurrentWindow():
+      return False
+
+    # Matches only depend on the diagnostics and on the buffer they are clamped
+    # to. If none of these changed since the matches were last added to the
+    # window, we can skip the costly comparison with getmatches().
+    if ( not self._pending_match_lines and
+         vimsupport.GetCurrentWindowVariable( MATCHES_FINGERPRINT_VARIABLE ) ==
+         self._MatchesFingerprint( self._matches_generation ) ):
+      return False
+
+    self._UpdateAllMatches(
+      vimsupport.GetDiagnosticMatchesInCurrentWindow() )
+    return True
+
+
+  def _UpdateAllMatches( self, matches_to_remove ):
+    self._line_to_matches = {}
+    for line, diags in iteritems( self._line_to_diags ):
+      matches = self._line_to_matches[ line ] = _ConvertDiagnosticsToMatches(
+        diags )
+      for group, pattern in matches:
+        # The id doesn't matter for matches that we may add.
+        match = vimsupport.DiagnosticMatch( 0, group, pattern )
+        try:
+          matches_to_remove.remove( match )
+        except ValueError:
+          vimsupport.AddDiagnosticMatch( match )
 
     for match in matches_to_remove:
       vimsupport.RemoveDiagnosticMatch( match )
 
+    self._pending_match_lines.clear()
+    self._window_matches = None
+    self._matches_generation = next( _generation_counter )
+    vimsupport.SetCurrentWindowVariable(
+      MATCHES_FINGERPRINT_VARIABLE,
+      self._MatchesFingerprint( self._matches_generation ) )
+
+
+  def _PrepareMatchesUpdate( self ):
+    """Return the diagnostic matches of the current window, grouped by group and
+    pattern, if the matches of the pending lines can be updated one line at a
+    time. Otherwise, return None. The matches are only read from the window
+    when it changed since the last chunk of updates."""
+    if not self._CanUpdateMatchesInCurrentWindow():
+      self._window_matches = None
+      if self._pending_match_lines:
+        # The matches will be entirely updated the next time a window displays
+        # the buffer.
+        self._pending_match_lines.clear()
+        self._matches_generation = next( _generation_counter )
+      return None
+
+    if ( vimsupport.GetCurrentWindowVariable( MATCHES_FINGERPRINT_VARIABLE ) !=
+         self._MatchesFingerprint( self._matches_generation ) ):
+      self._window_matches = None
+      # We don't know which matches of the window correspond to which lines.
+      matches = vimsupport.GetDiagnosticMatchesInCurrentWindow()
+      if matches:
+        self._UpdateAllMatches( matches )
+        return None
+      # The window has no matches (e.g. the buffer was just opened) so they can
+      # all be added in chunks.
+      self._line_to_matches = {}
+      self._pending_match_lines = _LinesWithDiagnostics( self._line_to_diags )
+      self._pending_lines_order = None
+      self._window_matches = defaultdict( list )
+      return self._window_matches
+
+    if not self._pending_match_lines:
+      return None
+
+    if self._window_matches is None:
+      self._window_matches = defaultdict( list )
+      for match in vimsupport.GetDiagnosticMatchesInCurrentWindow():
+        self._window_matches[ ( match.group, match.pattern ) ].append( match )
+    return self._window_matches
+
+
+  def _UpdateMatchesForLine( self, line, window_matches ):
+    for key in self._line_to_matches.pop( line, [] ):
+      if window_matches[ key ]:
+        vimsupport.RemoveDiagnosticMatch( window_matches[ key ].pop() )
+
+    diags = self._line_to_diags.get( line )
+    if not diags:
+      return
 
-  def _UpdateSigns( self ):
+    matches = self._line_to_matches[ line ] = _ConvertDiagnosticsToMatches(
+      diags )
+    for group, pattern in matches:
+      match_id = vimsupport.AddDiagnosticMatch(
+        vimsupport.DiagnosticMatch( 0, group, pattern ) )
+      # Keep the window matches up-to-date for the next chunks.
+      window_matches[ ( group, pattern ) ].append(
+        vimsupport.DiagnosticMatch( match_id, group, pattern ) )
+
+
+  def _UpdateSignsForLine( self, line ):
+    diags = self._line_to_diags.get( line )
+    name = _SignName( diags ) if diags else None
+    sign = self._placed_signs.get( line )
+    if sign and sign.name == name:
+      return
+
+    if sign:
+      vimsupport.UnplaceSign( sign )
+      del self._placed_signs[ line ]
+
+    if name:
+      sign = vimsupport.CreateSign( line, name, self._bufnr )
+      vimsupport.PlaceSign( sign )
+      self._placed_signs[ line ] = sign
+
+
+  def _SynchronizeSigns( self ):
+    # Signs may have been placed in the buffer before this interface was created
+    # (e.g. before the server was restarted) so we compare with the signs
+    # actually present in the buffer.
+    self._placed_signs = {}
     signs_to_unplace = vimsupport.GetSignsInBuffer( self._bufnr )
+    if not signs_to_unplace:
+      # Nothing to synchronize; the signs can be placed in chunks.
+      self._pending_sign_lines = _LinesWithDiagnostics( self._line_to_diags )
+      self._pending_lines_order = None
+      return
 
     for line, diags in iteritems( self._line_to_diags ):
       if not diags:
         continue
 
-      # We always go for the first diagnostic on the line because diagnostics
-      # are sorted by errors in priority and Vim can only display one sign by
-      # line.
-      name = 'YcmError' if _DiagnosticIsError( diags[ 0 ] ) else 'YcmWarning'
-      sign = vimsupport.CreateSign( line, name, self._bufnr )
+      sign = vimsupport.CreateSign( line, _SignName( diags ), self._bufnr )
 
       try:
-        signs_to_unplace.remove( sign )
+        sign = signs_to_unplace.pop( signs_to_unplace.index( sign ) )
       except ValueError:
         vimsupport.PlaceSign( sign )
+      self._placed_signs[ line ] = sign
 
     for sign in signs_to_unplace:
       vimsupport.UnplaceSign( sign )
 
-
-  def _ConvertDiagListToDict( self ):
-    self._line_to_diags = defaultdict( list )
-    for diag in self._diagnostics:
-      location = diag[ 'location' ]
-      bufnr = vimsupport.GetBufferNumberForFilename( location[ 'filepath' ] )
-      if bufnr == self._bufnr:
-        line_number = location[ 'line_num' ]
-        self._line_to_diags[ line_number ].append( diag )
-
-    for diags in itervalues( self._line_to_diags ):
+    self._pending_sign_lines.clear()
+
+
+class DiagnosticUpdatePlan( object ):
+  """The diagnostics of a buffer organized by line, as needed to update the UI.
+  Computing a plan doesn't involve Vim so that it can be done in a worker
+  thread when receiving the response of a parse request. Only the matches
+  patterns are computed when applying the plan since they are clamped to the
+  current buffer contents. The diagnostics of the server are converted to
+  ycm.diagnostic.Diagnostic objects once filtered."""
+
+  __slots__ = ( 'diagnostics', 'line_to_diags', 'line_to_counts',
+                'line_to_message', 'positions', 'messages',
+                'previous_line_to_diags', 'changed_lines' )
+
+  def __init__( self,
+                diags,
+                filepath,
+                diag_filter,
+                num_lines,
+                previous_line_to_diags ):
+    self.diagnostics = [
+      _NormalizeDiagnostic( diag )
+      for diag in Diagnostic.FromResponses( diag_filter.Filter( diags ) ) ]
+
+    # Line numbers are 1-based.
+    line_to_diags = defaultdict( list )
+    for diag in self.diagnostics:
+      if vimsupport.GetRealPath( diag.filepath ) == filepath:
+        # Diagnostics past the end of the buffer (e.g. at the end of the file)
+        # are displayed on its last line.
+        line = min( diag.line_num, max( num_lines, 1 ) )
+        line_to_diags[ line ].append( diag )
+
+    self.line_to_diags = {}
+    self.line_to_counts = {}
+    self.line_to_message = {}
+    for line, diags in iteritems( line_to_diags ):
       # We also want errors to be listed before warnings so that errors aren't
       # hidden by the warnings; Vim won't place a sign over an existing one.
-      diags.sort( key = lambda diag: ( diag[ 'kind' ],
-                                       diag[ 'location' ][ 'column_num' ] ) )
+      diags = self.line_to_diags[ line ] = tuple( sorted(
+        diags, key = lambda diag: ( diag.kind, diag.column_num ) ) )
+      self.line_to_counts[ line ] = _CountDiagnostics( diags )
+      self.line_to_message[ line ] = _DiagnosticMessage( diags[ 0 ] )
+
+    self.positions = _DiagnosticPositions( self.line_to_diags )
+
+    # Vim dictionary keys are strings.
+    self.messages = { str( line ): message for line, message in
+                      iteritems( self.line_to_message ) }
 
+    self.previous_line_to_diags = previous_line_to_diags
+    self.changed_lines = _ChangedLines( previous_line_to_diags,
+                                        self.line_to_diags )
 
-_DiagnosticIsError = CompileLevel( 'error' )
-_DiagnosticIsWarning = CompileLevel( 'warning' )
+
+def _LocationListKey( diagnostics ):
+  # Diagnostics compare equal regardless of their file.
+  return [ ( diag.filepath, diag ) for diag in diagnostics ]
+
+
+def _DiagnosticIsError( diag ):
+  return diag.kind == 'ERROR'
+
+
+def _DiagnosticIsWarning( diag ):
+  return diag.kind == 'WARNING'
+
+
+def DiagnosticUpdateDeadline( user_options ):
+  """Return the time until which pending diagnostic updates can be applied, or
+  None if there is no time budget."""
+  budget = user_options[ 'diagnostic_update_time_budget' ]
+  if budget <= 0:
+    return None
+  return time.time() + budget / 1000
 
 
 def _NormalizeDiagnostic( diag ):
   def ClampToOne( value ):
     return value if value > 0 else 1
 
-  location = diag[ 'location' ]
-  location[ 'column_num' ] = ClampToOne( location[ 'column_num' ] )
-  location[ 'line_num' ] = ClampToOne( location[ 'line_num' ] )
+  diag.column_num = ClampToOne( diag.column_num )
+  diag.line_num = ClampToOne( diag.line_num )
   return diag
 
 
+def _ChangedLines( previous_line_to_diags, line_to_diags ):
+  lines = set( previous_line_to_diags )
+  lines.update( line_to_diags )
+  return { line for line in lines
+           if previous_line_to_diags.get( line ) != line_to_diags.get( line ) }
+
+
+def _LinesWithDiagnostics( line_to_diags ):
+  return { line for line, diags in iteritems( line_to_diags ) if diags }
+
+
+def _DiagnosticMessage( diag ):
+  # Newlines are replaced here so that Vimscript only has to truncate the
+  # message to the window width when echoing it.
+  text = diag.text.replace( '\n', ' ' )
+  if diag.fixit_available:
+    text += ' (FixIt)'
+  return text
+
+
+def _DiagnosticPositions( line_to_diags ):
+  positions = defaultdict( list )
+  for line, diags in iteritems( line_to_diags ):
+    for diag in diags:
+      position = ( line, diag.column_num )
+      positions[ None ].append( position )
+      positions[ diag.kind ].append( position )
+  for kind_positions in itervalues( positions ):
+    kind_positions.sort()
+  return dict( positions )
+
+
+def _CountDiagnostics( diags ):
+  """Return the number of errors, warnings, and diagnostics with a FixIt
+  available in |diags|, in the order of DIAGNOSTIC_COUNTS_KEYS."""
+  errors = sum( 1 for diag in diags if _DiagnosticIsError( diag ) )
+  warnings = sum( 1 for diag in diags if _DiagnosticIsWarning( diag ) )
+  fixits = sum( 1 for diag in diags if diag.fixit_available )
+  return ( errors, warnings, fixits )
+
+
+def _SignName( diags ):
+  # We always go for the first diagnostic on the line because diagnostics are
+  # sorted by errors in priority and Vim can only display one sign by line.
+  return 'YcmError' if _DiagnosticIsError( diags[ 0 ] ) else 'YcmWarning'
+
+
+def _ConvertDiagnosticsToMatches( diags ):
+  """Return the groups and patterns of the matches for the diagnostics |diags|
+  on a line."""
+  matches = []
+  # Insert squiggles in reverse order so that errors overlap warnings.
+  for diag in reversed( diags ):
+    group = ( 'YcmErrorSection' if _DiagnosticIsError( diag ) else
+              'YcmWarningSection' )
+    matches.extend( ( group, pattern ) for pattern in
+                    _ConvertDiagnosticToMatchPatterns( diag ) )
+  return matches
+
+
 def _ConvertDiagnosticToMatchPatterns( diagnostic ):
   patterns = []
 
-  location_extent = diagnostic[ 'location_extent' ]
-  if location_extent[ 'start' ][ 'line_num' ] <= 0:
-    location = diagnostic[ 'location' ]
+  if diagnostic.extent[ 0 ] <= 0:
     patterns.append( vimsupport.GetDiagnosticMatchPattern(
-      location[ 'line_num' ],
-      location[ 'column_num' ] ) )
+      diagnostic.line_num,
+      diagnostic.column_num ) )
   else:
     patterns.append( vimsupport.GetDiagnosticMatchPattern(
-      location_extent[ 'start' ][ 'line_num' ],
-      location_extent[ 'start' ][ 'column_num' ],
-      location_extent[ 'end' ][ 'line_num' ],
-      location_extent[ 'end' ][ 'column_num' ] ) )
+      *diagnostic.extent ) )
 
-  for diagnostic_range in diagnostic[ 'ranges' ]:
+  for diagnostic_range in diagnostic.ranges:
     patterns.append( vimsupport.GetDiagnosticMatchPattern(
-      diagnostic_range[ 'start' ][ 'line_num' ],
-      diagnostic_range[ 'start' ][ 'column_num' ],
-      diagnostic_range[ 'end' ][ 'line_num' ],
-      diagnostic_range[ 'end' ][ 'column_num' ] ) )
+      *diagnostic_range ) )
 
   return patterns
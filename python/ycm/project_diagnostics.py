@@ -0,0 +1,91 @@
+# Copyright (C) 2018 YouCompleteMe contributors
+#
+# This file is part of YouCompleteMe.
+#
+# YouCompleteMe is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# YouCompleteMe is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with YouCompleteMe.  If not, see <http://www.gnu.org/licenses/>.
+
+from __future__ import unicode_literals
+from __future__ import print_function
+from __future__ import division
+from __future__ import absolute_import
+# Not installing aliases from python-future; it's unreliable and slow.
+from builtins import *  # noqa
+
+from collections import OrderedDict
+from future.utils import itervalues
+from ycm import vimsupport
+from ycm.diagnostic import Diagnostic
+
+# Above this number of diagnostics, the diagnostics of the files that were
+# least recently updated are dropped.
+MAX_PROJECT_DIAGNOSTICS = 50000
+
+
+class ProjectDiagnostics( object ):
+  """Store the diagnostics that the server pushes for files that are not
+  displayed in any window so that they can be shown when the file is opened or
+  listed with the :YcmProjectDiags command. Diagnostics are stored in their
+  compact form (see ycm.diagnostic.Diagnostic)."""
+
+  def __init__( self, max_diagnostics = MAX_PROJECT_DIAGNOSTICS ):
+    self._max_diagnostics = max_diagnostics
+    # Files are ordered from the least to the most recently updated.
+    self._diagnostics_for_file = OrderedDict()
+    self._num_diagnostics = 0
+
+
+  def Update( self, filepath, diagnostics ):
+    filepath = vimsupport.GetRealPath( filepath )
+    self._Remove( filepath )
+    if not diagnostics:
+      return
+    diagnostics = tuple( Diagnostic.FromResponses( diagnostics ) )
+    self._diagnostics_for_file[ filepath ] = diagnostics
+    self._num_diagnostics += len( diagnostics )
+    while ( self._num_diagnostics > self._max_diagnostics and
+            len( self._diagnostics_for_file ) > 1 ):
+      _, evicted = self._diagnostics_for_file.popitem( last = False )
+      self._num_diagnostics -= len( evicted )
+
+
+  def Pop( self, filepath ):
+    """Remove the diagnostics of |filepath| from the store and return them in
+    the format of the server. Return None if there are none."""
+    filepath = vimsupport.GetRealPath( filepath )
+    diagnostics = self._Remove( filepath )
+    if diagnostics is None:
+      return None
+    return [ diagnostic.ToResponse() for diagnostic in diagnostics ]
+
+
+  def Discard( self, filepath ):
+    self._Remove( vimsupport.GetRealPath( filepath ) )
+
+
+  def GetAll( self ):
+    """Generate all the diagnostics in the store as Diagnostic objects."""
+    for diagnostics in itervalues( self._diagnostics_for_file ):
+      for diagnostic in diagnostics:
+        yield diagnostic
+
+
+  def __len__( self ):
+    return self._num_diagnostics
+
+
+  def _Remove( self, filepath ):
+    diagnostics = self._diagnostics_for_file.pop( filepath, None )
+    if diagnostics is not None:
+      self._num_diagnostics -= len( diagnostics )
+    return diagnostics
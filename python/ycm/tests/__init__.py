@@ -50,6 +50,16 @@ DEFAULT_CLIENT_OPTIONS = {
   'g:ycm_echo_current_diagnostic': 1,
   'g:ycm_filter_diagnostics': {},
   'g:ycm_always_populate_location_list': 0,
+  'g:ycm_diagnostic_update_time_budget': 0,
+  'g:ycm_max_buffers_with_state': 50,
+  'g:ycm_full_event_notifications': [ 'BufferVisit' ],
+  'g:ycm_parse_delay': 300,
+  'g:ycm_parse_max_staleness': 2000,
+  'g:ycm_max_pre_parsed_buffers': 3,
+  'g:ycm_large_file_threshold_kb': 0,
+  'g:ycm_huge_file_threshold_kb': 0,
+  'g:ycm_disable_for_files_larger_than_kb': 1000,
+  'g:ycm_max_unsaved_buffer_size_kb': 1000,
   'g:ycm_collect_identifiers_from_tags_files': 0,
   'g:ycm_seed_identifiers_with_syntax': 0,
   'g:ycm_goto_buffer_command': 'same-buffer',
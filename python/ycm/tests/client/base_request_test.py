@@ -25,7 +25,7 @@ from builtins import *  # noqa
 from ycm.tests.test_utils import MockVimBuffers, MockVimModule, VimBuffer
 MockVimModule()
 
-from hamcrest import assert_that, has_entry
+from hamcrest import assert_that, equal_to, has_entry
 from mock import patch
 from ycm.client.base_request import BuildRequestData
 
@@ -45,3 +45,70 @@ def BuildRequestData_AddWorkingDirWithFileName_test( *args ):
   with MockVimBuffers( [ current_buffer ], [ current_buffer ] ):
     assert_that( BuildRequestData( current_buffer.number ),
                  has_entry( 'working_dir', '/some/dir' ) )
+
+
+def BuildRequestData_Slim_test():
+  current_buffer = VimBuffer( 'foo',
+                              number = 1,
+                              contents = [ 'first', 'second', 'third' ],
+                              filetype = 'c',
+                              modified = True )
+  other_buffer = VimBuffer( 'bar',
+                            number = 2,
+                            contents = [ 'other' ],
+                            filetype = 'c',
+                            modified = True )
+  with MockVimBuffers( [ current_buffer, other_buffer ],
+                       [ current_buffer ],
+                       ( 2, 1 ) ):
+    assert_that( BuildRequestData( slim = True )[ 'file_data' ], equal_to( {
+      current_buffer.name: {
+        'contents': 'first\nsecond\n',
+        'filetypes': [ 'c' ]
+      }
+    } ) )
+    assert_that( BuildRequestData( 2, slim = True )[ 'file_data' ], equal_to( {
+      other_buffer.name: {
+        'contents': 'other\n',
+        'filetypes': [ 'c' ]
+      }
+    } ) )
+
+
+def BuildRequestData_Slim_NewLineAfterIdentifier_test():
+  # After <CR>, the server needs the previous line to find the identifier that
+  # was just finished.
+  current_buffer = VimBuffer( 'foo',
+                              contents = [ 'first', 'foo', '' ],
+                              filetype = 'c' )
+  with MockVimBuffers( [ current_buffer ], [ current_buffer ], ( 3, 0 ) ):
+    assert_that( BuildRequestData( slim = True )[ 'file_data' ], equal_to( {
+      current_buffer.name: {
+        'contents': '\nfoo\n\n',
+        'filetypes': [ 'c' ]
+      }
+    } ) )
+
+
+@patch( 'ycm.vimsupport.NON_SEMANTIC_FILETYPES', { 'c' } )
+def BuildRequestData_TruncateLargeFile_test():
+  current_buffer = VimBuffer( 'foo',
+                              contents = [ 'first', 'second', 'third' ],
+                              filetype = 'c' )
+  current_buffer.vars[ 'ycm_large_file_tier' ] = 2
+  with MockVimBuffers( [ current_buffer ], [ current_buffer ], ( 3, 0 ) ):
+    # Semantic requests need the whole buffer.
+    assert_that( BuildRequestData()[ 'file_data' ], equal_to( {
+      current_buffer.name: {
+        'contents': 'first\nsecond\nthird\n',
+        'filetypes': [ 'c' ]
+      }
+    } ) )
+    assert_that(
+      BuildRequestData( truncate_large_file = True )[ 'file_data' ],
+      equal_to( {
+        current_buffer.name: {
+          'contents': '\nsecond\nthird\n',
+          'filetypes': [ 'c' ]
+        }
+      } ) )
@@ -0,0 +1,284 @@
+# Copyright (C) 2018 YouCompleteMe Contributors
+#
+# This file is part of YouCompleteMe.
+#
+# YouCompleteMe is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# YouCompleteMe is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with YouCompleteMe.  If not, see <http://www.gnu.org/licenses/>.
+
+from __future__ import unicode_literals
+from __future__ import print_function
+from __future__ import division
+from __future__ import absolute_import
+# Not installing aliases from python-future; it's unreliable and slow.
+from builtins import *  # noqa
+
+from ycm.tests.test_utils import MockVimModule
+MockVimModule()
+
+from concurrent.futures import Future
+from hamcrest import assert_that, contains, equal_to, none, same_instance
+from mock import call, MagicMock, patch
+
+from ycm.client.event_notification import ( EventNotification,
+                                            EventNotificationQueue )
+from ycmd.responses import ServerError
+
+
+def StartEvent( response_processor ):
+  future = Future()
+  event = EventNotification( 'FileReadyToParse',
+                             response_processor = response_processor )
+  with patch( 'ycm.client.event_notification.BuildRequestData',
+              return_value = {} ):
+    with patch.object( event, 'PostDataToHandlerAsync',
+                       return_value = future ):
+      event.Start()
+  return event, future
+
+
+@patch( 'ycm.vimsupport.PostVimMessage' )
+def EventNotification_ResponseProcessor_ProcessedOnce_test( *args ):
+  diagnostics = [ { 'text': 'diagnostic' } ]
+  processor = MagicMock( return_value = 'processed diagnostics' )
+  event, future = StartEvent( processor )
+
+  with patch( 'ycm.client.base_request._JsonFromFuture',
+              return_value = diagnostics ) as json_from_future:
+    future.set_result( None )
+    processor.assert_called_once_with( diagnostics )
+
+    # The response decoded when processing it is reused.
+    response = event.Response()
+    assert_that( response, same_instance( diagnostics ) )
+    json_from_future.assert_called_once_with( future )
+
+  assert_that( event.ProcessedResponse( response ),
+               equal_to( 'processed diagnostics' ) )
+  assert_that( event.ProcessedResponse( [] ), none() )
+
+
+@patch( 'ycm.vimsupport.PostVimMessage' )
+def EventNotification_ResponseProcessor_Error_test( post_vim_message ):
+  processor = MagicMock()
+  event, future = StartEvent( processor )
+
+  with patch( 'ycm.client.base_request._JsonFromFuture',
+              side_effect = ServerError( 'Server error' ) ):
+    future.set_result( None )
+    processor.assert_not_called()
+
+    # The error is handled on the main thread.
+    assert_that( event.Response(), equal_to( [] ) )
+
+  post_vim_message.assert_called_once_with( 'Server error', truncate = True )
+  assert_that( event.ProcessedResponse( [] ), none() )
+
+
+def BuildFakeRequestData( buffer_number = None,
+                          slim = False,
+                          truncate_large_file = False ):
+  return { 'filepath': '/file{}'.format( buffer_number ) }
+
+
+@patch( 'ycm.client.event_notification.BuildRequestData',
+        side_effect = BuildFakeRequestData )
+def EventNotificationQueue_CoalesceEvents_test( *args ):
+  queue = EventNotificationQueue()
+  queue.Add( 'BufferVisit', 1 )
+  queue.Add( 'BufferVisit', 2 )
+  queue.Add( 'BufferUnload', 1 )
+  queue.Add( 'BufferVisit', 1, extra_data = { 'key': 'value' } )
+  assert_that( len( queue ), equal_to( 3 ) )
+
+  with patch.object( EventNotification, 'PostDataToHandlerAsync',
+                     return_value = MagicMock() ) as post_data_to_handler:
+    post_data_to_handler.return_value.done.return_value = True
+    queue.Flush()
+    assert_that( post_data_to_handler.call_args_list, contains(
+      call( { 'filepath': '/file2', 'event_name': 'BufferVisit' },
+            'event_notification' ),
+      call( { 'filepath': '/file1', 'event_name': 'BufferUnload' },
+            'event_notification' ),
+      call( { 'filepath': '/file1', 'key': 'value',
+              'event_name': 'BufferVisit' },
+            'event_notification' )
+    ) )
+
+  assert_that( len( queue ), equal_to( 0 ) )
+
+
+@patch( 'ycm.client.event_notification.BuildRequestData',
+        side_effect = BuildFakeRequestData )
+def EventNotificationQueue_PostEventsOfSameFileInOrder_test( *args ):
+  queue = EventNotificationQueue()
+  queue.Add( 'BufferUnload', 1 )
+  queue.Add( 'BufferVisit', 1 )
+  queue.Add( 'BufferUnload', 2 )
+
+  futures = [ Future(), Future(), Future() ]
+  with patch.object( EventNotification, 'PostDataToHandlerAsync',
+                     side_effect = futures ) as post_data_to_handler:
+    queue.Flush()
+    # Events of different files are sent at the same time.
+    assert_that( post_data_to_handler.call_args_list, contains(
+      call( { 'filepath': '/file1', 'event_name': 'BufferUnload' },
+            'event_notification' ),
+      call( { 'filepath': '/file2', 'event_name': 'BufferUnload' },
+            'event_notification' )
+    ) )
+
+    # The next event of a file is sent once the previous one is done.
+    futures[ 1 ].set_result( None )
+    assert_that( post_data_to_handler.call_count, equal_to( 2 ) )
+    futures[ 0 ].set_result( None )
+    assert_that( post_data_to_handler.call_count, equal_to( 3 ) )
+    post_data_to_handler.assert_called_with(
+      { 'filepath': '/file1', 'event_name': 'BufferVisit' },
+      'event_notification' )
+
+
+@patch( 'ycm.client.event_notification.BuildRequestData',
+        side_effect = BuildFakeRequestData )
+def EventNotificationQueue_MaxPostsInProgress_test( *args ):
+  queue = EventNotificationQueue( max_posts_in_progress = 2 )
+  queue.Add( 'BufferUnload', 1 )
+  queue.Add( 'BufferUnload', 2 )
+  queue.Add( 'BufferUnload', 3 )
+
+  futures = [ Future(), Future(), Future() ]
+  with patch.object( EventNotification, 'PostDataToHandlerAsync',
+                     side_effect = futures ) as post_data_to_handler:
+    queue.Flush()
+    assert_that( post_data_to_handler.call_count, equal_to( 2 ) )
+
+    futures[ 1 ].set_result( None )
+    assert_that( post_data_to_handler.call_count, equal_to( 3 ) )
+    post_data_to_handler.assert_called_with(
+      { 'filepath': '/file3', 'event_name': 'BufferUnload' },
+      'event_notification' )
+
+
+@patch( 'ycm.client.event_notification.BuildRequestData',
+        side_effect = BuildFakeRequestData )
+def EventNotificationQueue_PostError_test( *args ):
+  queue = EventNotificationQueue()
+  queue.Add( 'BufferUnload', 1 )
+  queue.Add( 'BufferVisit', 1 )
+
+  futures = [ RuntimeError( 'error' ), Future() ]
+  with patch.object( EventNotification, 'PostDataToHandlerAsync',
+                     side_effect = futures ) as post_data_to_handler:
+    queue.Flush()
+    # The next event is sent despite the error.
+    assert_that( post_data_to_handler.call_count, equal_to( 2 ) )
+
+
+@patch( 'ycm.client.event_notification.BuildRequestData',
+        side_effect = BuildFakeRequestData )
+def EventNotificationQueue_FlushWhenFull_test( *args ):
+  queue = EventNotificationQueue( max_size = 2 )
+  with patch.object( EventNotification, 'PostDataToHandlerAsync',
+                     return_value = MagicMock() ) as post_data_to_handler:
+    post_data_to_handler.return_value.done.return_value = True
+    queue.Add( 'BufferUnload', 1 )
+    post_data_to_handler.assert_not_called()
+    queue.Add( 'BufferUnload', 2 )
+    assert_that( post_data_to_handler.call_count, equal_to( 2 ) )
+
+  assert_that( len( queue ), equal_to( 0 ) )
+
+
+@patch( 'ycm.client.event_notification.BuildRequestData',
+        side_effect = BuildFakeRequestData )
+def EventNotification_StartAfterQueuedEvents_test( *args ):
+  queue = EventNotificationQueue()
+  queue.Add( 'BufferVisit', 1 )
+  queue.Add( 'BufferUnload', 2 )
+  event = EventNotification( 'FileReadyToParse', 1 )
+
+  futures = [ Future(), Future(), Future() ]
+  with patch.object( EventNotification, 'PostDataToHandlerAsync',
+                     side_effect = futures ) as post_data_to_handler:
+    event.Start( queue )
+    assert_that( post_data_to_handler.call_count, equal_to( 2 ) )
+    assert_that( event.Done(), equal_to( False ) )
+
+    # The parse request only waits for the events of the same file.
+    futures[ 0 ].set_result( None )
+    assert_that( post_data_to_handler.call_args_list, contains(
+      call( { 'filepath': '/file1', 'event_name': 'BufferVisit' },
+            'event_notification' ),
+      call( { 'filepath': '/file2', 'event_name': 'BufferUnload' },
+            'event_notification' ),
+      call( { 'filepath': '/file1', 'event_name': 'FileReadyToParse' },
+            'event_notification' )
+    ) )
+    assert_that( event.Done(), equal_to( False ) )
+
+    futures[ 2 ].set_result( None )
+    assert_that( event.Done(), equal_to( True ) )
+
+  assert_that( len( queue ), equal_to( 0 ) )
+
+
+@patch( 'ycm.client.event_notification.BuildRequestData',
+        side_effect = BuildFakeRequestData )
+def EventNotification_StartAfterPreviousFlush_test( *args ):
+  queue = EventNotificationQueue( max_posts_in_progress = 1 )
+  queue.Add( 'BufferUnload', 2 )
+  queue.Add( 'BufferUnload', 3 )
+  event = EventNotification( 'FileReadyToParse', 1 )
+
+  futures = [ Future(), Future(), Future(), Future() ]
+  with patch.object( EventNotification, 'PostDataToHandlerAsync',
+                     side_effect = futures ) as post_data_to_handler:
+    queue.Flush()
+    queue.Add( 'BufferVisit', 1 )
+
+    # The parse request is not limited by the number of events in progress but
+    # still waits for the event of the same file.
+    event.Start( queue )
+    assert_that( post_data_to_handler.call_count, equal_to( 1 ) )
+
+    futures[ 0 ].set_result( None )
+    futures[ 1 ].set_result( None )
+    assert_that( post_data_to_handler.call_count, equal_to( 3 ) )
+    futures[ 2 ].set_result( None )
+    assert_that( post_data_to_handler.call_args_list, contains(
+      call( { 'filepath': '/file2', 'event_name': 'BufferUnload' },
+            'event_notification' ),
+      call( { 'filepath': '/file3', 'event_name': 'BufferUnload' },
+            'event_notification' ),
+      call( { 'filepath': '/file1', 'event_name': 'BufferVisit' },
+            'event_notification' ),
+      call( { 'filepath': '/file1', 'event_name': 'FileReadyToParse' },
+            'event_notification' )
+    ) )
+
+
+@patch( 'ycm.vimsupport.PostVimMessage' )
+@patch( 'ycm.client.event_notification.BuildRequestData',
+        side_effect = BuildFakeRequestData )
+def EventNotification_StartAfterQueuedEvents_PostError_test(
+    build_request_data, post_vim_message ):
+  queue = EventNotificationQueue()
+  event = EventNotification( 'FileReadyToParse', 1 )
+
+  with patch.object( EventNotification, 'PostDataToHandlerAsync',
+                     side_effect = ServerError( 'Server error' ) ):
+    event.Start( queue )
+
+  # The parse request is failed instead of being left in progress.
+  assert_that( event.Done(), equal_to( True ) )
+  assert_that( event.Response(), equal_to( [] ) )
+  post_vim_message.assert_called_once_with( 'Server error', truncate = True )
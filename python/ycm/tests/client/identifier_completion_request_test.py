@@ -0,0 +1,109 @@
+# Copyright (C) 2019 YouCompleteMe Contributors
+#
+# This file is part of YouCompleteMe.
+#
+# YouCompleteMe is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# YouCompleteMe is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with YouCompleteMe.  If not, see <http://www.gnu.org/licenses/>.
+
+from __future__ import unicode_literals
+from __future__ import print_function
+from __future__ import division
+from __future__ import absolute_import
+# Not installing aliases from python-future; it's unreliable and slow.
+from builtins import *  # noqa
+
+from ycm.tests.test_utils import MockVimModule
+MockVimModule()
+
+from hamcrest import assert_that, contains, empty, equal_to, has_entries
+from mock import patch
+
+from ycm.client.identifier_completion_request import (
+    VisibleIdentifierCompletionRequest )
+from ycm.tests.test_utils import MockVimBuffers, VimBuffer
+
+USER_OPTIONS = {
+  'min_num_of_chars_for_completion': 2,
+  'max_num_identifier_candidates': 10
+}
+
+
+def BuildVisibleIdentifierCompletionRequest( line,
+                                             visible_lines,
+                                             force_semantic = False,
+                                             user_options = USER_OPTIONS ):
+  current_buffer = VimBuffer( 'current', contents = [ line ] )
+  column = len( line )
+  request_data = {
+    'line_num': 1,
+    'column_num': column + 1,
+    'force_semantic': force_semantic
+  }
+  request = VisibleIdentifierCompletionRequest( request_data, user_options )
+  with MockVimBuffers( [ current_buffer ],
+                       [ current_buffer ],
+                       ( 1, column ) ):
+    with patch( 'ycm.vimsupport.GetVisibleLines',
+                return_value = visible_lines ):
+      request.Start()
+  return request
+
+
+def CompletionWords( request ):
+  return [ completion[ 'word' ]
+           for completion in request.Response()[ 'completions' ] ]
+
+
+def VisibleIdentifierCompletionRequest_Done_AlwaysTrue_test():
+  request = BuildVisibleIdentifierCompletionRequest( 'fo', [] )
+  assert_that( request.Done(), equal_to( True ) )
+
+
+def VisibleIdentifierCompletionRequest_FilterAndSort_test():
+  request = BuildVisibleIdentifierCompletionRequest(
+    '  x = fo',
+    [ 'def foobar( f_o, fo ):',
+      '  return afoo + foo + Foo + 1fo',
+      '  x = fo' ] )
+  assert_that( request.Response(), has_entries( {
+    'line': 1,
+    'column': 9,
+    'completion_start_column': 7
+  } ) )
+  # Candidates starting with the query come first, then shorter ones. The query
+  # itself is not a candidate.
+  assert_that( CompletionWords( request ),
+               contains( 'Foo', 'foo', 'foobar', 'f_o', 'afoo' ) )
+
+
+def VisibleIdentifierCompletionRequest_SmartCase_test():
+  request = BuildVisibleIdentifierCompletionRequest(
+    'Fo', [ 'foo Foo fOo FooBar' ] )
+  assert_that( CompletionWords( request ), contains( 'Foo', 'FooBar' ) )
+
+
+def VisibleIdentifierCompletionRequest_MinNumChars_test():
+  request = BuildVisibleIdentifierCompletionRequest( 'f', [ 'foo' ] )
+  assert_that( CompletionWords( request ), empty() )
+
+  # Forcing completion ignores the minimum number of characters.
+  request = BuildVisibleIdentifierCompletionRequest( 'f', [ 'foo' ],
+                                                     force_semantic = True )
+  assert_that( CompletionWords( request ), contains( 'foo' ) )
+
+
+def VisibleIdentifierCompletionRequest_MaxNumCandidates_test():
+  user_options = dict( USER_OPTIONS, max_num_identifier_candidates = 2 )
+  request = BuildVisibleIdentifierCompletionRequest(
+    'ab', [ 'abc abcd abcde' ], user_options = user_options )
+  assert_that( CompletionWords( request ), contains( 'abc', 'abcd' ) )
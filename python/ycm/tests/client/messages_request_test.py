@@ -26,11 +26,36 @@ from builtins import *  # noqa
 from ycm.tests.test_utils import MockVimModule
 MockVimModule()
 
+from collections import OrderedDict
 from hamcrest import assert_that, equal_to
 from mock import patch, call
 
-from ycm.client.messages_request import _HandlePollResponse
-from ycm.tests.test_utils import ExtendedMock
+from ycm.client.messages_request import _HandlePollResponse, MessagesPoll
+from ycm.tests.test_utils import ExtendedMock, MockVimBuffers, VimBuffer
+
+
+@patch( 'ycm.client.messages_request.MessagesPoll.PostDataToHandlerAsync' )
+def MessagesPoll_RequestWithoutContents_test( post_data_to_handler_async ):
+  current_buffer = VimBuffer( '/current',
+                              contents = [ 'some', 'contents' ],
+                              filetype = 'java',
+                              modified = True )
+
+  with MockVimBuffers( [ current_buffer ], [ current_buffer ], ( 2, 3 ) ):
+    poll = MessagesPoll()
+  poll.Poll( None )
+
+  post_data_to_handler_async.assert_called_once_with( {
+    'filepath': '/current',
+    'line_num': 1,
+    'column_num': 1,
+    'file_data': {
+      '/current': {
+        'contents': '',
+        'filetypes': [ 'java' ]
+      }
+    }
+  }, 'receive_messages', timeout = 60 )
 
 
 def HandlePollResponse_NoMessages_test():
@@ -69,8 +94,8 @@ def HandlePollResponse_MultipleMessages_test( post_vim_message ):
                                     None ),
                equal_to( True ) )
 
+  # Only the last message is displayed.
   post_vim_message.assert_has_exact_calls( [
-    call( 'this is a message', warning=False, truncate=True ),
     call( 'this is another one', warning=False, truncate=True )
   ] )
 
@@ -82,8 +107,8 @@ def HandlePollResponse_SingleDiagnostic_test():
   ]
   assert_that( _HandlePollResponse( messages, diagnostics_handler ),
                equal_to( True ) )
-  diagnostics_handler.UpdateWithNewDiagnosticsForFile.assert_has_exact_calls( [
-    call( 'foo', [ 'PLACEHOLDER' ] )
+  diagnostics_handler.UpdateWithNewDiagnosticsForFiles.assert_has_exact_calls( [
+    call( { 'foo': [ 'PLACEHOLDER' ] } )
   ] )
 
 
@@ -97,11 +122,11 @@ def HandlePollResponse_MultipleDiagnostics_test():
   ]
   assert_that( _HandlePollResponse( messages, diagnostics_handler ),
                equal_to( True ) )
-  diagnostics_handler.UpdateWithNewDiagnosticsForFile.assert_has_exact_calls( [
-    call( 'foo', [ 'PLACEHOLDER1' ] ),
-    call( 'bar', [ 'PLACEHOLDER2' ] ),
-    call( 'baz', [ 'PLACEHOLDER3' ] ),
-    call( 'foo', [ 'PLACEHOLDER4' ] )
+  # Diagnostics are grouped by file and the latest ones win.
+  diagnostics_handler.UpdateWithNewDiagnosticsForFiles.assert_has_exact_calls( [
+    call( OrderedDict( [ ( 'bar', [ 'PLACEHOLDER2' ] ),
+                         ( 'baz', [ 'PLACEHOLDER3' ] ),
+                         ( 'foo', [ 'PLACEHOLDER4' ] ) ] ) )
   ] )
 
 
@@ -121,21 +146,14 @@ def HandlePollResponse_MultipleMessagesAndDiagnostics_test( post_vim_message ):
   ]
   assert_that( _HandlePollResponse( messages, diagnostics_handler ),
                equal_to( True ) )
-  diagnostics_handler.UpdateWithNewDiagnosticsForFile.assert_has_exact_calls( [
-    call( 'foo', [ 'PLACEHOLDER1' ] ),
-    call( 'bar', [ 'PLACEHOLDER2' ] ),
-    call( 'baz', [ 'PLACEHOLDER3' ] ),
-    call( 'foo', [ 'PLACEHOLDER4' ] )
+  # Diagnostics are grouped by file and the latest ones win.
+  diagnostics_handler.UpdateWithNewDiagnosticsForFiles.assert_has_exact_calls( [
+    call( OrderedDict( [ ( 'bar', [ 'PLACEHOLDER2' ] ),
+                         ( 'baz', [ 'PLACEHOLDER3' ] ),
+                         ( 'foo', [ 'PLACEHOLDER4' ] ) ] ) )
   ] )
 
   post_vim_message.assert_has_exact_calls( [
-    call( 'On the first day of Christmas, my VimScript gave to me',
-          warning=False,
-          truncate=True ),
-    call( 'A test file in a Command-T', warning=False, truncate=True ),
-    call( 'On the second day of Christmas, my VimScript gave to me',
-          warning=False,
-          truncate=True ),
     call( 'Two popup menus, and a test file in a Command-T',
           warning=False,
           truncate=True ),
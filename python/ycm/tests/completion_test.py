@@ -155,3 +155,26 @@ def SendCompletionRequest_ErrorFromServer_test( ycm,
           'completion_start_column': -1
         } )
       )
+
+
+@YouCompleteMeInstance()
+@patch( 'ycm.youcompleteme.BuildRequestData' )
+def SendCompletionRequest_HugeFile_test( ycm, build_request_data ):
+  current_buffer = VimBuffer( 'buffer', contents = [ 'foobar', 'fo' ] )
+  current_buffer.vars[ 'ycm_large_file_tier' ] = 2
+  with MockVimBuffers( [ current_buffer ], [ current_buffer ], ( 2, 2 ) ):
+    with patch( 'ycm.vimsupport.GetVisibleLines',
+                return_value = current_buffer.contents ):
+      ycm.SendCompletionRequest()
+    ok_( ycm.CompletionRequestReady() )
+    assert_that(
+      ycm.GetCompletionResponse(),
+      has_entries( {
+        'completions': contains( has_entries( { 'word': 'foobar' } ) ),
+        'completion_start_column': 1
+      } )
+    )
+
+  # The contents of the buffers are not built for the completion of the
+  # visible identifiers.
+  build_request_data.assert_not_called()
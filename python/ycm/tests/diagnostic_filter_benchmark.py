@@ -0,0 +1,87 @@
+# Copyright (C) 2018 YouCompleteMe contributors
+#
+# This file is part of YouCompleteMe.
+#
+# YouCompleteMe is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# YouCompleteMe is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with YouCompleteMe.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Benchmark of diagnostic filtering with many regex filters. Run it from the
+python folder with:
+
+  python -m ycm.tests.diagnostic_filter_benchmark
+"""
+
+from __future__ import unicode_literals
+from __future__ import print_function
+from __future__ import division
+from __future__ import absolute_import
+# Not installing aliases from python-future; it's unreliable and slow.
+from builtins import *  # noqa
+
+from ycm.tests.test_utils import MockVimModule
+MockVimModule()
+
+import re
+import timeit
+from ycm.diagnostic_filter import DiagnosticFilter
+
+NUM_PATTERNS = 50
+NUM_DIAGNOSTICS = 10000
+NUM_RUNS = 10
+
+
+def _Patterns():
+  return [ 'unused (variable|parameter) .*_{0}$'.format( index )
+           for index in range( NUM_PATTERNS ) ]
+
+
+def _Diagnostics():
+  return [ {
+    'kind': 'WARNING' if index % 3 else 'ERROR',
+    'text': 'unused variable foo_{0}'.format( index % ( 2 * NUM_PATTERNS ) )
+  } for index in range( NUM_DIAGNOSTICS ) ]
+
+
+def _FilterWithSeparateRegexes( patterns, diagnostics ):
+  """Filtering as it was done before the regexes were combined, for
+  comparison."""
+  compiled = [ re.compile( pattern, re.IGNORECASE ) for pattern in patterns ]
+  return [ diagnostic for diagnostic in diagnostics
+           if not any( pattern.search( diagnostic[ 'text' ] )
+                       for pattern in compiled ) ]
+
+
+def Main():
+  patterns = _Patterns()
+  diagnostics = _Diagnostics()
+  diagnostic_filter = DiagnosticFilter.CreateFromOptions( {
+    'filter_diagnostics': { 'cpp': { 'regex': patterns } }
+  } ).SubsetForTypes( [ 'cpp' ] )
+
+  allowed = diagnostic_filter.Filter( diagnostics )
+  assert allowed == _FilterWithSeparateRegexes( patterns, diagnostics )
+
+  separate = timeit.timeit(
+    lambda: _FilterWithSeparateRegexes( patterns, diagnostics ),
+    number = NUM_RUNS ) / NUM_RUNS
+  combined = timeit.timeit( lambda: diagnostic_filter.Filter( diagnostics ),
+                            number = NUM_RUNS ) / NUM_RUNS
+
+  print( '{0} patterns x {1} diagnostics ({2} allowed)'.format(
+    NUM_PATTERNS, NUM_DIAGNOSTICS, len( allowed ) ) )
+  print( 'Separate regexes: {0:.1f}ms'.format( separate * 1000 ) )
+  print( 'Combined regex:   {0:.1f}ms'.format( combined * 1000 ) )
+
+
+if __name__ == '__main__':
+  Main()
@@ -25,7 +25,7 @@ from builtins import *  # noqa
 from ycm.tests.test_utils import MockVimModule
 MockVimModule()
 
-from hamcrest import assert_that, equal_to
+from hamcrest import assert_that, contains, equal_to, is_not, same_instance
 from ycm.diagnostic_filter import DiagnosticFilter
 
 
@@ -140,3 +140,51 @@ def CommaSeparatedFiletypes_test():
 
   _assert_rejects( f, 'This is a Taco' )
   _assert_accepts( f, 'This is a Burrito' )
+
+
+def RegexCombined_test():
+  opts = _JavaFilter( { 'regex' : [ '(taco|burrito)s? (are|is) (\\w+)',
+                                    '(?P<food>nacho)s? (?P=food)',
+                                    '(?x) enchilada',
+                                    '(\\w+) and \\1' ] } )
+  f = _CreateFilterForTypes( opts, [ 'java' ] )
+
+  _assert_rejects( f, 'Tacos are great' )
+  _assert_rejects( f, 'nacho nacho' )
+  _assert_rejects( f, 'This is an enchilada' )
+  _assert_rejects( f, 'Taco and taco' )
+  _assert_accepts( f, 'nacho burrito' )
+  _assert_accepts( f, 'Taco and burrito' )
+
+
+def RegexCombined_ConditionalGroup_test():
+  # Once combined, the conditional group would refer to the group of the first
+  # regex.
+  opts = _JavaFilter( { 'regex' : [ '(burrito)s?',
+                                    '(<)?taco(?(1)>|$)' ] } )
+  f = _CreateFilterForTypes( opts, [ 'java' ] )
+
+  _assert_rejects( f, 'Burritos' )
+  _assert_rejects( f, 'A <taco>' )
+  _assert_rejects( f, 'A taco' )
+  _assert_accepts( f, 'A taco bell' )
+
+
+def Filter_test():
+  opts = _JavaFilter( { 'regex' : 'taco', 'level' : 'warning' } )
+  f = _CreateFilterForTypes( opts, [ 'java' ] )
+
+  taco = { 'text' : 'This taco will NOT be shown', 'kind' : 'ERROR' }
+  burrito = { 'text' : 'This burrito will be shown', 'kind' : 'ERROR' }
+  warning = { 'text' : 'This burrito will NOT be shown', 'kind' : 'WARNING' }
+  assert_that( f.Filter( [ taco, burrito, warning ] ), contains( burrito ) )
+
+
+def SharedAcrossBuffers_test():
+  opts = _JavaFilter( { 'regex' : 'taco' } )
+  assert_that( DiagnosticFilter.CreateFromOptions( opts ),
+               same_instance( DiagnosticFilter.CreateFromOptions(
+                 _JavaFilter( { 'regex' : 'taco' } ) ) ) )
+  assert_that( DiagnosticFilter.CreateFromOptions( opts ),
+               is_not( same_instance( DiagnosticFilter.CreateFromOptions(
+                 _JavaFilter( { 'regex' : 'burrito' } ) ) ) ) )
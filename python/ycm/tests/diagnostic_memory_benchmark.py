@@ -0,0 +1,93 @@
+# Copyright (C) 2018 YouCompleteMe contributors
+#
+# This file is part of YouCompleteMe.
+#
+# YouCompleteMe is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# YouCompleteMe is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with YouCompleteMe.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Benchmark of the memory used by the diagnostics of a buffer. Run it from the
+python folder with:
+
+  python -m ycm.tests.diagnostic_memory_benchmark
+"""
+
+from __future__ import unicode_literals
+from __future__ import print_function
+from __future__ import division
+from __future__ import absolute_import
+# Not installing aliases from python-future; it's unreliable and slow.
+from builtins import *  # noqa
+
+from ycm.tests.test_utils import MockVimModule
+MockVimModule()
+
+import json
+from ycm.base import DeepSizeOf
+from ycm.diagnostic_filter import DiagnosticFilter
+from ycm.diagnostic_interface import DiagnosticUpdatePlan
+from ycm.project_diagnostics import ProjectDiagnostics
+
+FILEPATH = '/home/user/project/src/some_module/some_file.cpp'
+NUM_DIAGNOSTICS = 100000
+NUM_LINES = 20000
+
+
+def _Position( line_num, column_num ):
+  return { 'filepath': FILEPATH,
+           'line_num': line_num,
+           'column_num': column_num }
+
+
+def _Range( line_num, start_column, end_column ):
+  return { 'start': _Position( line_num, start_column ),
+           'end': _Position( line_num, end_column ) }
+
+
+def _Response():
+  """Return the diagnostics as decoded from the response of the server, which
+  doesn't share any string between them."""
+  diagnostics = []
+  for index in range( NUM_DIAGNOSTICS ):
+    line_num = index % NUM_LINES + 1
+    column_num = index // NUM_LINES * 10 + 1
+    diagnostics.append( {
+      'kind': 'WARNING' if index % 3 else 'ERROR',
+      'text': 'unused variable foo_{0}'.format( index ),
+      'fixit_available': index % 2 == 0,
+      'location': _Position( line_num, column_num ),
+      'location_extent': _Range( line_num, column_num, column_num + 5 ),
+      'ranges': [ _Range( line_num, column_num + 1, column_num + 3 ) ]
+    } )
+  return json.loads( json.dumps( diagnostics ) )
+
+
+def Main():
+  diag_filter = DiagnosticFilter( [] )
+  plan = DiagnosticUpdatePlan( _Response(),
+                               FILEPATH,
+                               diag_filter,
+                               NUM_LINES,
+                               {} )
+  print( 'Buffer with {0} diagnostics: {1:.1f} MiB'.format(
+    len( plan.diagnostics ), DeepSizeOf( plan ) / 1024 / 1024 ) )
+
+  project_diagnostics = ProjectDiagnostics(
+    max_diagnostics = NUM_DIAGNOSTICS )
+  project_diagnostics.Update( FILEPATH, _Response() )
+  print( 'Project diagnostics with {0} diagnostics: {1:.1f} MiB'.format(
+    len( project_diagnostics ),
+    DeepSizeOf( project_diagnostics ) / 1024 / 1024 ) )
+
+
+if __name__ == '__main__':
+  Main()
@@ -0,0 +1,90 @@
+# Copyright (C) 2018 YouCompleteMe contributors
+#
+# This file is part of YouCompleteMe.
+#
+# YouCompleteMe is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# YouCompleteMe is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with YouCompleteMe.  If not, see <http://www.gnu.org/licenses/>.
+
+from __future__ import unicode_literals
+from __future__ import print_function
+from __future__ import division
+from __future__ import absolute_import
+# Not installing aliases from python-future; it's unreliable and slow.
+from builtins import *  # noqa
+
+
+from hamcrest import assert_that, equal_to, is_not, same_instance
+from ycm.diagnostic import Diagnostic
+
+
+def _Position( filepath, line_num, column_num ):
+  return {
+    'filepath': filepath,
+    'line_num': line_num,
+    'column_num': column_num
+  }
+
+
+def _Response( filepath, text ):
+  return {
+    'kind': 'ERROR',
+    'text': text,
+    'fixit_available': True,
+    'location': _Position( filepath, 3, 1 ),
+    'location_extent': {
+      'start': _Position( filepath, 3, 1 ),
+      'end': _Position( filepath, 3, 5 )
+    },
+    'ranges': [ {
+      'start': _Position( filepath, 3, 2 ),
+      'end': _Position( filepath, 4, 3 )
+    } ]
+  }
+
+
+def Diagnostic_FromResponse_test():
+  diagnostic = Diagnostic.FromResponse( _Response( '/foo', 'error' ) )
+  assert_that( diagnostic.kind, equal_to( 'ERROR' ) )
+  assert_that( diagnostic.text, equal_to( 'error' ) )
+  assert_that( diagnostic.filepath, equal_to( '/foo' ) )
+  assert_that( diagnostic.line_num, equal_to( 3 ) )
+  assert_that( diagnostic.column_num, equal_to( 1 ) )
+  assert_that( diagnostic.extent, equal_to( ( 3, 1, 3, 5 ) ) )
+  assert_that( diagnostic.ranges, equal_to( ( ( 3, 2, 4, 3 ), ) ) )
+  assert_that( diagnostic.fixit_available, equal_to( True ) )
+
+
+def Diagnostic_ToResponse_test():
+  response = _Response( '/foo', 'error' )
+  assert_that( Diagnostic.FromResponse( response ).ToResponse(),
+               equal_to( response ) )
+
+
+def Diagnostic_FilepathAndKindAreShared_test():
+  # Build the strings at runtime so that they are distinct objects.
+  first, second = Diagnostic.FromResponses( [
+    _Response( ''.join( [ '/', 'foo' ] ), 'first' ),
+    _Response( ''.join( [ '/', 'foo' ] ), 'second' ) ] )
+  assert_that( first.filepath, same_instance( second.filepath ) )
+  assert_that( first.kind, same_instance( second.kind ) )
+
+
+def Diagnostic_Equality_test():
+  diagnostic = Diagnostic.FromResponse( _Response( '/foo', 'error' ) )
+  # The file path isn't displayed.
+  assert_that( Diagnostic.FromResponse( _Response( '/bar', 'error' ) ),
+               equal_to( diagnostic ) )
+  assert_that( hash( Diagnostic.FromResponse( _Response( '/bar', 'error' ) ) ),
+               equal_to( hash( diagnostic ) ) )
+  assert_that( Diagnostic.FromResponse( _Response( '/foo', 'warning' ) ),
+               is_not( equal_to( diagnostic ) ) )
@@ -38,8 +38,8 @@ from ycm.vimsupport import SIGN_BUFFER_ID_INITIAL_VALUE
 from ycmd.responses import ( BuildDiagnosticData, Diagnostic, Location, Range,
                              UnknownExtraConf, ServerError )
 
-from hamcrest import ( assert_that, contains, empty, has_entries, has_entry,
-                       has_item, has_items, has_key, is_not )
+from hamcrest import ( all_of, assert_that, contains, empty, has_entries,
+                       has_entry, has_item, has_items, has_key, is_not )
 from mock import call, MagicMock, patch
 from nose.tools import eq_, ok_
 
@@ -430,6 +430,9 @@ def EventNotification_FileReadyToParse_TagFiles_UnicodeWorkingDirectory_test(
 @YouCompleteMeInstance()
 def EventNotification_BufferVisit_BuildRequestForCurrentAndUnsavedBuffers_test(
     ycm, *args ):
+  # BufferVisit is not slim by default since completers may sync the contents of
+  # the buffer on that event. A slim notification would replace them on the
+  # server with a mostly blank document.
 
   current_buffer_file = os.path.realpath( 'current_buffer' )
   current_buffer = VimBuffer( name = current_buffer_file,
@@ -457,6 +460,7 @@ def EventNotification_BufferVisit_BuildRequestForCurrentAndUnsavedBuffers_test(
                          [ current_buffer ],
                          ( 1, 5 ) ):
       ycm.OnBufferVisit()
+      ycm.FlushEventQueue()
 
     assert_that(
       # Positional arguments passed to PostDataToHandlerAsync.
@@ -483,7 +487,8 @@ def EventNotification_BufferVisit_BuildRequestForCurrentAndUnsavedBuffers_test(
     )
 
 
-@YouCompleteMeInstance()
+@YouCompleteMeInstance( {
+  'g:ycm_full_event_notifications': [ 'BufferUnload' ] } )
 def EventNotification_BufferUnload_BuildRequestForDeletedAndUnsavedBuffers_test(
     ycm ):
   current_buffer_file = os.path.realpath( 'current_βuffer' )
@@ -505,6 +510,7 @@ def EventNotification_BufferUnload_BuildRequestForDeletedAndUnsavedBuffers_test(
     with MockVimBuffers( [ current_buffer, deleted_buffer ],
                          [ current_buffer ] ):
       ycm.OnBufferUnload( deleted_buffer.number )
+      ycm.FlushEventQueue()
 
   assert_that(
     # Positional arguments passed to PostDataToHandlerAsync.
@@ -531,6 +537,81 @@ def EventNotification_BufferUnload_BuildRequestForDeletedAndUnsavedBuffers_test(
   )
 
 
+@patch( 'ycm.youcompleteme.YouCompleteMe._AddUltiSnipsDataIfNeeded' )
+@YouCompleteMeInstance( { 'g:ycm_full_event_notifications': [] } )
+def EventNotification_BufferVisit_Slim_test( ycm, *args ):
+  current_buffer_file = os.path.realpath( 'current_buffer' )
+  current_buffer = VimBuffer( name = current_buffer_file,
+                              number = 1,
+                              contents = [ 'first line', 'second line' ],
+                              filetype = 'some_filetype',
+                              modified = True )
+
+  modified_buffer_file = os.path.realpath( 'modified_buffer' )
+  modified_buffer = VimBuffer( name = modified_buffer_file,
+                               number = 2,
+                               contents = [ 'modified_buffer_contents' ],
+                               filetype = 'some_filetype',
+                               modified = True )
+
+  with patch( 'ycm.client.event_notification.EventNotification.'
+              'PostDataToHandlerAsync' ) as post_data_to_handler_async:
+    with MockVimBuffers( [ current_buffer, modified_buffer ],
+                         [ current_buffer ],
+                         ( 2, 5 ) ):
+      ycm.OnBufferVisit()
+      ycm.FlushEventQueue()
+
+    assert_that(
+      # Positional arguments passed to PostDataToHandlerAsync.
+      post_data_to_handler_async.call_args[ 0 ],
+      contains(
+        has_entries( {
+          'filepath': current_buffer_file,
+          'line_num': 2,
+          'column_num': 6,
+          'file_data': all_of(
+            has_entries( {
+              current_buffer_file: has_entries( {
+                'contents': 'first line\nsecond line\n',
+                'filetypes': [ 'some_filetype' ]
+              } )
+            } ),
+            is_not( has_key( modified_buffer_file ) )
+          ),
+          'event_name': 'BufferVisit'
+        } ),
+        'event_notification'
+      )
+    )
+
+
+@patch( 'ycm.youcompleteme.YouCompleteMe._AddUltiSnipsDataIfNeeded' )
+@YouCompleteMeInstance()
+def EventNotification_FileReadyToParse_AfterQueuedEvents_test( ycm, *args ):
+  current_buffer = VimBuffer( name = os.path.realpath( 'current_buffer' ),
+                              number = 1,
+                              filetype = 'some_filetype' )
+  deleted_buffer = VimBuffer( name = os.path.realpath( 'deleted_buffer' ),
+                              number = 2,
+                              filetype = 'some_filetype' )
+
+  with patch( 'ycm.client.event_notification.EventNotification.'
+              'PostDataToHandlerAsync' ) as post_data_to_handler_async:
+    with MockVimBuffers( [ current_buffer, deleted_buffer ],
+                         [ current_buffer ] ):
+      ycm.OnBufferUnload( deleted_buffer.number )
+      ycm.OnBufferVisit()
+      ycm.OnFileReadyToParse()
+
+    # The queued events are posted before the parse request.
+    assert_that(
+      [ args[ 0 ][ 'event_name' ]
+        for args, _ in post_data_to_handler_async.call_args_list ],
+      contains( 'BufferUnload', 'BufferVisit', 'FileReadyToParse' )
+    )
+
+
 @patch( 'ycm.vimsupport.CaptureVimCommand', return_value = """
 fooGroup xxx foo bar
              links to Statement""" )
@@ -0,0 +1,91 @@
+# Copyright (C) 2018 YouCompleteMe contributors
+#
+# This file is part of YouCompleteMe.
+#
+# YouCompleteMe is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# YouCompleteMe is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with YouCompleteMe.  If not, see <http://www.gnu.org/licenses/>.
+
+from __future__ import unicode_literals
+from __future__ import print_function
+from __future__ import division
+from __future__ import absolute_import
+# Not installing aliases from python-future; it's unreliable and slow.
+from builtins import *  # noqa
+
+from ycm.tests.test_utils import MockVimModule
+MockVimModule()
+
+import os
+from hamcrest import assert_that, contains, empty, equal_to, none
+from ycm.project_diagnostics import ProjectDiagnostics
+
+
+def _Position( filepath, line_num, column_num ):
+  return {
+    'filepath': filepath,
+    'line_num': line_num,
+    'column_num': column_num
+  }
+
+
+def _Diagnostic( filepath, line_num, text ):
+  return {
+    'kind': 'ERROR',
+    'text': text,
+    'fixit_available': False,
+    'location': _Position( filepath, line_num, 1 ),
+    'location_extent': {
+      'start': _Position( filepath, line_num, 1 ),
+      'end': _Position( filepath, line_num, 5 )
+    },
+    'ranges': [ {
+      'start': _Position( filepath, line_num, 2 ),
+      'end': _Position( filepath, line_num, 3 )
+    } ]
+  }
+
+
+def ProjectDiagnostics_PopUnpacksDiagnostics_test():
+  filepath = os.path.realpath( 'foo' )
+  diagnostic = _Diagnostic( filepath, 3, 'error' )
+  store = ProjectDiagnostics()
+  store.Update( filepath, [ diagnostic ] )
+  assert_that( len( store ), equal_to( 1 ) )
+  assert_that( store.Pop( filepath ), contains( diagnostic ) )
+  assert_that( store.Pop( filepath ), none() )
+  assert_that( len( store ), equal_to( 0 ) )
+
+
+def ProjectDiagnostics_EmptyDiagnosticsRemoveFile_test():
+  filepath = os.path.realpath( 'foo' )
+  store = ProjectDiagnostics()
+  store.Update( filepath, [ _Diagnostic( filepath, 1, 'error' ) ] )
+  store.Update( filepath, [] )
+  assert_that( list( store.GetAll() ), empty() )
+  assert_that( len( store ), equal_to( 0 ) )
+
+
+def ProjectDiagnostics_EvictLeastRecentlyUpdatedFiles_test():
+  foo = os.path.realpath( 'foo' )
+  bar = os.path.realpath( 'bar' )
+  baz = os.path.realpath( 'baz' )
+  store = ProjectDiagnostics( max_diagnostics = 3 )
+  store.Update( foo, [ _Diagnostic( foo, 1, 'foo error' ) ] )
+  store.Update( bar, [ _Diagnostic( bar, 1, 'bar error' ) ] )
+  store.Update( foo, [ _Diagnostic( foo, 2, 'foo error' ) ] )
+  store.Update( baz, [ _Diagnostic( baz, 1, 'first baz error' ),
+                      _Diagnostic( baz, 2, 'second baz error' ) ] )
+  assert_that(
+    [ diagnostic.text for diagnostic in store.GetAll() ],
+    contains( 'foo error', 'first baz error', 'second baz error' ) )
+  assert_that( len( store ), equal_to( 3 ) )
@@ -83,6 +83,7 @@ VIM_SIGNS = []
 VIM_OPTIONS = {
   '&previewheight': 12,
   '&columns': 80,
+  '&lines': 24,
   '&ruler': 0,
   '&showcmd': 1,
   '&hidden': 0,
@@ -307,8 +308,11 @@ def _MockVimEval( value ):
 def _MockWipeoutBuffer( buffer_number ):
   buffers = VIM_MOCK.buffers
 
+  from ycm.vimsupport import RemoveBufferFromIndex
+
   for index, buffer in enumerate( buffers ):
     if buffer.number == buffer_number:
+      RemoveBufferFromIndex( buffer_number )
       return buffers.pop( index )
 
 
@@ -424,6 +428,7 @@ class VimBuffer( object ):
     }
     self.visual_start = visual_start
     self.visual_end = visual_end
+    self.vars = {}
 
 
   def __getitem__( self, index ):
@@ -478,6 +483,11 @@ class VimBuffers( object ):
     return iter( self._buffers )
 
 
+  def __len__( self ):
+    """Emulates len( vim.buffers )"""
+    return len( self._buffers )
+
+
   def pop( self, index ):
     return self._buffers.pop( index )
 
@@ -494,6 +504,7 @@ class VimWindow( object ):
     self.buffer = buffer_object
     self.cursor = cursor
     self.options = {}
+    self.vars = {}
 
 
   def __repr__( self ):
@@ -544,7 +555,8 @@ class VimMatch( object ):
 
   def __init__( self, group, pattern ):
     current_window = VIM_MOCK.current.window.number
-    self.id = len( VIM_MATCHES_FOR_WINDOW[ current_window ] ) + 1
+    self.id = max( [ 0 ] + [ vim_match.id for vim_match in
+                             VIM_MATCHES_FOR_WINDOW[ current_window ] ] ) + 1
     self.group = group
     self.pattern = pattern
 
@@ -563,6 +575,8 @@ class VimMatch( object ):
       return self.group
     elif key == 'id':
       return self.id
+    elif key == 'pattern':
+      return self.pattern
 
 
 class VimSign( object ):
@@ -612,11 +626,22 @@ def MockVimBuffers( buffers, window_buffers, cursor_position = ( 1, 1 ) ):
     raise RuntimeError( 'Second parameter must contain at least one element '
                         'which corresponds to the current window.' )
 
+  # The buffer number index, the set of modified buffers, and the buffer
+  # metadata cache are kept up to date by autocommands in Vim.
+  from ycm.vimsupport import ( BufferMetadataCache, BufferNumberIndex,
+                               ModifiedBufferSet )
+
   with patch( 'vim.buffers', VimBuffers( buffers ) ):
     with patch( 'vim.windows', VimWindows( window_buffers,
                                            cursor_position ) ) as windows:
       with patch( 'vim.current', VimCurrent( windows[ 0 ] ) ):
-        yield VIM_MOCK
+        with patch( 'ycm.vimsupport.BUFFER_NUMBER_INDEX',
+                    BufferNumberIndex() ):
+          with patch( 'ycm.vimsupport.MODIFIED_BUFFERS',
+                      ModifiedBufferSet() ):
+            with patch( 'ycm.vimsupport.BUFFER_METADATA_CACHE',
+                        BufferMetadataCache() ):
+              yield VIM_MOCK
 
 
 def MockVimModule():
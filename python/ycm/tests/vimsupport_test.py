@@ -32,8 +32,8 @@ MockVimModule()
 
 from ycm import vimsupport
 from nose.tools import eq_
-from hamcrest import ( assert_that, calling, contains, empty, equal_to,
-                       has_entry, raises )
+from hamcrest import ( all_of, assert_that, calling, contains, empty,
+                       equal_to, has_entry, has_key, is_not, raises )
 from mock import MagicMock, call, patch
 from ycmd.utils import ToBytes
 import os
@@ -1515,6 +1515,168 @@ def GetUnsavedAndSpecifiedBufferData_EncodedUnicodeCharsInBuffers_test():
                             has_entry( u'contents', u'abc\nfДa\n' ) ) )
 
 
+def GetUnsavedAndSpecifiedBufferData_OnlyModifiedBuffers_test():
+  current_buffer = VimBuffer( 'current', number = 1 )
+  modified_buffer = VimBuffer( 'modified', number = 2, modified = True )
+  saved_buffer = VimBuffer( 'saved', number = 3 )
+  buffers = [ current_buffer, modified_buffer, saved_buffer ]
+
+  with MockVimBuffers( buffers, [ current_buffer ] ):
+    assert_that(
+      vimsupport.GetUnsavedAndSpecifiedBufferData( current_buffer,
+                                                   current_buffer.name ),
+      all_of( has_key( current_buffer.name ),
+              has_key( modified_buffer.name ),
+              is_not( has_key( saved_buffer.name ) ) ) )
+
+    # The modified buffer is saved and the saved one is modified.
+    modified_buffer.options[ 'mod' ] = False
+    vimsupport.SetBufferModified( 2, False )
+    saved_buffer.options[ 'mod' ] = True
+    vimsupport.SetBufferModified( 3, True )
+
+    assert_that(
+      vimsupport.GetUnsavedAndSpecifiedBufferData( current_buffer,
+                                                   current_buffer.name ),
+      all_of( has_key( current_buffer.name ),
+              is_not( has_key( modified_buffer.name ) ),
+              has_key( saved_buffer.name ) ) )
+
+    # The 'modified' option is still checked in case the set was not updated.
+    saved_buffer.options[ 'mod' ] = False
+    assert_that(
+      vimsupport.GetUnsavedAndSpecifiedBufferData( current_buffer,
+                                                   current_buffer.name ),
+      is_not( has_key( saved_buffer.name ) ) )
+
+
+@patch( 'ycm.vimsupport.NON_SEMANTIC_FILETYPES', { 'text' } )
+def GetUnsavedAndSpecifiedBufferData_LargeBuffers_test():
+  contents = [ 'line{0}'.format( i ) for i in range( 1, 11 ) ]
+  current_buffer = VimBuffer( 'current',
+                              number = 1,
+                              contents = contents,
+                              filetype = 'text' )
+  modified_buffer = VimBuffer( 'modified', number = 2, modified = True )
+  buffers = [ current_buffer, modified_buffer ]
+
+  with MockVimBuffers( buffers, [ current_buffer ] ):
+    # Only a window of lines around the cursor is sent for a large buffer.
+    current_buffer.vars[ 'ycm_large_file_tier' ] = 1
+    with patch( 'ycm.vimsupport.LARGE_FILE_WINDOW_LINES', 4 ):
+      assert_that(
+        vimsupport.GetUnsavedAndSpecifiedBufferData( current_buffer,
+                                                     current_buffer.name,
+                                                     6 ),
+        has_entry( current_buffer.name, has_entry(
+          'contents', '\n\n\nline4\nline5\nline6\nline7\n' ) ) )
+
+    # Only the current and previous lines are sent for a huge buffer.
+    current_buffer.vars[ 'ycm_large_file_tier' ] = 2
+    assert_that(
+      vimsupport.GetUnsavedAndSpecifiedBufferData( current_buffer,
+                                                   current_buffer.name,
+                                                   3 ),
+      has_entry( current_buffer.name,
+                 has_entry( 'contents', '\nline2\nline3\n' ) ) )
+
+    # The whole buffer is sent if no line is given.
+    assert_that(
+      vimsupport.GetUnsavedAndSpecifiedBufferData( current_buffer,
+                                                   current_buffer.name ),
+      has_entry( current_buffer.name,
+                 has_entry( 'contents', '\n'.join( contents ) + '\n' ) ) )
+
+    # The whole buffer is always sent to semantic completers so that they
+    # don't switch between two documents.
+    current_buffer.vars[ 'ycm_large_file_tier' ] = 1
+    current_buffer.filetype = 'cpp'
+    assert_that(
+      vimsupport.GetUnsavedAndSpecifiedBufferData( current_buffer,
+                                                   current_buffer.name,
+                                                   6 ),
+      has_entry( current_buffer.name,
+                 has_entry( 'contents', '\n'.join( contents ) + '\n' ) ) )
+
+    # Other large buffers are left out.
+    modified_buffer.vars[ 'ycm_large_file_tier' ] = 1
+    assert_that(
+      vimsupport.GetUnsavedAndSpecifiedBufferData( current_buffer,
+                                                   current_buffer.name ),
+      is_not( has_key( modified_buffer.name ) ) )
+
+
+@patch( 'ycm.vimsupport.UNSAVED_BUFFER_FILTER',
+        vimsupport.UnsavedBufferFilter() )
+def GetUnsavedAndSpecifiedBufferData_FiletypeAndSize_test():
+  current_buffer = VimBuffer( 'current', number = 1, filetype = 'cpp' )
+  header_buffer = VimBuffer( 'header',
+                             number = 2,
+                             filetype = 'c',
+                             modified = True,
+                             contents = [ 'int x;' ] )
+  log_buffer = VimBuffer( 'log',
+                          number = 3,
+                          filetype = 'log',
+                          modified = True,
+                          contents = [ 'some log' ] )
+  buffers = [ current_buffer, header_buffer, log_buffer ]
+
+  with MockVimBuffers( buffers, [ current_buffer ] ):
+    # Only buffers of the same filetype family are included.
+    assert_that(
+      vimsupport.GetUnsavedAndSpecifiedBufferData( current_buffer,
+                                                   current_buffer.name ),
+      all_of( has_key( current_buffer.name ),
+              has_key( header_buffer.name ),
+              is_not( has_key( log_buffer.name ) ) ) )
+    assert_that( vimsupport.GetNumSkippedUnsavedBuffers(), equal_to( 1 ) )
+
+    # Buffers bigger than the max size are left out. The size of buffers
+    # already excluded by their filetype is not computed.
+    vimsupport.SetMaxUnsavedBufferSize( 5 )
+    cache = vimsupport.BUFFER_METADATA_CACHE
+    with patch.object( cache, 'GetSize', wraps = cache.GetSize ) as get_size:
+      assert_that(
+        vimsupport.GetUnsavedAndSpecifiedBufferData( current_buffer,
+                                                     current_buffer.name ),
+        all_of( has_key( current_buffer.name ),
+                is_not( has_key( header_buffer.name ) ),
+                is_not( has_key( log_buffer.name ) ) ) )
+    get_size.assert_called_once_with( header_buffer )
+    assert_that( vimsupport.GetNumSkippedUnsavedBuffers(), equal_to( 3 ) )
+
+
+def GetEditGeneration_ChangesInOtherBuffers_test():
+  current_buffer = VimBuffer( 'current', number = 1, modified = True )
+  other_buffer = VimBuffer( 'other', number = 2, modified = True )
+  buffers = [ current_buffer, other_buffer ]
+
+  with MockVimBuffers( buffers, [ current_buffer ] ):
+    generation = vimsupport.GetEditGeneration( 1 )
+
+    # Changes in the excluded buffer are ignored.
+    current_buffer.changedtick += 1
+    assert_that( vimsupport.GetEditGeneration( 1 ), equal_to( generation ) )
+
+    other_buffer.changedtick += 1
+    assert_that( vimsupport.GetEditGeneration( 1 ),
+                 is_not( equal_to( generation ) ) )
+    generation = vimsupport.GetEditGeneration( 1 )
+
+    # Saving a buffer changes the generation.
+    other_buffer.options[ 'mod' ] = False
+    vimsupport.SetBufferModified( 2, False )
+    assert_that( vimsupport.GetEditGeneration( 1 ),
+                 is_not( equal_to( generation ) ) )
+    generation = vimsupport.GetEditGeneration( 1 )
+
+    # Clearing a buffer that was not modified doesn't.
+    vimsupport.SetBufferModified( 2, False )
+    vimsupport.SetBufferModified( 3, False )
+    assert_that( vimsupport.GetEditGeneration( 1 ), equal_to( generation ) )
+
+
 def GetBufferFilepath_NoBufferName_UnicodeWorkingDirectory_test():
   vim_buffer = VimBuffer( '', number = 42 )
   unicode_dir = PathToTestFile( u'uni¢𐍈d€' )
@@ -1638,6 +1800,29 @@ def Filetypes_IntegerFiletype_test():
                  contains( '42' ) )
 
 
+def BufferMetadata_CachedUntilInvalidated_test():
+  current_buffer = VimBuffer( 'buffer', number = 1, filetype = 'c' )
+  with MockVimBuffers( [ current_buffer ], [ current_buffer ] ):
+    assert_that( vimsupport.CurrentFiletypes(), contains( 'c' ) )
+    assert_that( vimsupport.GetCurrentBufferFilepath(),
+                 equal_to( os.path.realpath( 'buffer' ) ) )
+
+    current_buffer.filetype = 'cpp.doxygen'
+    assert_that( vimsupport.GetBufferFiletypes( 1 ), contains( 'c' ) )
+    vimsupport.InvalidateBufferMetadata( 1 )
+    assert_that( vimsupport.GetBufferFiletypes( 1 ),
+                 contains( 'cpp', 'doxygen' ) )
+
+    # The path is recomputed when the buffer is renamed.
+    current_buffer.name = os.path.realpath( 'renamed' )
+    assert_that( vimsupport.GetCurrentBufferFilepath(),
+                 equal_to( os.path.realpath( 'renamed' ) ) )
+
+    current_buffer.filetype = 'python'
+    vimsupport.InvalidateBufferMetadata()
+    assert_that( vimsupport.CurrentFiletypes(), contains( 'python' ) )
+
+
 @patch( 'ycm.vimsupport.VariableExists', return_value = False )
 @patch( 'ycm.vimsupport.SearchInCurrentBuffer', return_value = 0 )
 @patch( 'vim.current' )
@@ -1990,3 +2175,70 @@ def VimVersionAtLeast_test():
   assert_that( not vimsupport.VimVersionAtLeast( '7.4.1579' ) )
   assert_that( not vimsupport.VimVersionAtLeast( '7.4.1898' ) )
   assert_that( not vimsupport.VimVersionAtLeast( '8.1.278' ) )
+
+
+def GetBufferNumberForFilename_Index_test():
+  foo_buffer = VimBuffer( os.path.realpath( 'foo' ), number = 1 )
+  bar_buffer = VimBuffer( os.path.realpath( 'bar' ), number = 2 )
+  unnamed_buffer = VimBuffer( '', number = 3 )
+  buffers = [ foo_buffer, bar_buffer, unnamed_buffer ]
+  with MockVimBuffers( buffers, [ foo_buffer ] ):
+    with patch( 'vim.eval' ) as vim_eval:
+      assert_that( vimsupport.GetBufferNumberForFilename( 'foo' ),
+                   equal_to( 1 ) )
+      assert_that( vimsupport.GetBufferNumberForFilename( 'bar' ),
+                   equal_to( 2 ) )
+      assert_that( vimsupport.GetBufferNumberForFilename( 'baz' ),
+                   equal_to( -1 ) )
+
+      # Buffer is renamed.
+      bar_buffer.name = os.path.realpath( 'baz' )
+      vimsupport.AddBufferToIndex( 2 )
+      assert_that( vimsupport.GetBufferNumberForFilename( 'bar' ),
+                   equal_to( -1 ) )
+      assert_that( vimsupport.GetBufferNumberForFilename( 'baz' ),
+                   equal_to( 2 ) )
+
+      # Buffer is wiped out.
+      vimsupport.RemoveBufferFromIndex( 1 )
+      buffers.remove( foo_buffer )
+      assert_that( vimsupport.GetBufferNumberForFilename( 'foo' ),
+                   equal_to( -1 ) )
+
+      # Buffer is added without triggering the autocommands.
+      buffers.append( VimBuffer( os.path.realpath( 'qux' ), number = 4 ) )
+      assert_that( vimsupport.GetBufferNumberForFilename( 'qux' ),
+                   equal_to( 4 ) )
+
+      vim_eval.assert_not_called()
+
+
+@patch( 'ycm.vimsupport.QUICKFIX_LIST_CHUNK_SIZE', 2 )
+@patch( 'vim.eval', new_callable = ExtendedMock )
+def SetQuickFixList_Chunks_test( vim_eval ):
+  quickfix_list = [ { 'filename': 'foo', 'lnum': line } for line in range( 5 ) ]
+  vimsupport.SetQuickFixList( iter( quickfix_list ) )
+  vim_eval.assert_has_exact_calls( [
+    call( 'setqflist( {0} )'.format( json.dumps( quickfix_list[ 0 : 2 ] ) ) ),
+    call( "setqflist( {0}, 'a' )".format(
+      json.dumps( quickfix_list[ 2 : 4 ] ) ) ),
+    call( "setqflist( {0}, 'a' )".format(
+      json.dumps( quickfix_list[ 4 : ] ) ) )
+  ] )
+
+
+@patch( 'vim.eval', new_callable = ExtendedMock )
+def SetQuickFixList_Empty_test( vim_eval ):
+  vimsupport.SetQuickFixList( [] )
+  vim_eval.assert_has_exact_calls( [ call( 'setqflist( [] )' ) ] )
+
+
+@patch( 'vim.command' )
+def SetFittingHeightForCurrentWindow_LongList_test( vim_command, *args ):
+  current_buffer = VimBuffer( 'buffer', contents = [ 'a' * 140 ] * 1000 )
+  with MockVimBuffers( [ current_buffer ], [ current_buffer ] ) as vim:
+    vim.current.window.width = 120
+    vim.current.window.options[ 'wrap' ] = True
+    vimsupport.SetFittingHeightForCurrentWindow()
+  # The height is capped by the number of lines of the screen.
+  vim_command.assert_called_once_with( '24wincmd _' )
@@ -31,10 +31,13 @@ from ycm.tests.test_utils import ( ExtendedMock,
                                    VimSign )
 MockVimModule()
 
+import json
 import os
 import sys
-from hamcrest import ( assert_that, contains, empty, equal_to, has_entries,
-                       is_in, is_not, matches_regexp )
+from hamcrest import ( assert_that, contains, contains_inanyorder, empty,
+                       equal_to, has_entries, has_key, is_in, is_not,
+                       matches_regexp, none,
+                       starts_with )
 from mock import call, MagicMock, patch
 
 from ycm import vimsupport
@@ -242,10 +245,55 @@ def YouCompleteMe_DebugInfo_ServerNotRunning_test( ycm ):
         'Server process ID: \\d+\n'
         'Server logfiles:\n'
         '  .+\n'
-        '  .+' )
+        '  .+\n'
+        'Diagnostic matches updates: 0 performed, 0 skipped\n'
+        'Buffers: 0 tracked, 0 with state using about 0 KiB\n'
+        'Project diagnostics: 0 stored using about 0 KiB\n'
+        'Large file thresholds: 0 KiB \\(large\\), 0 KiB \\(huge\\), '
+        '1000 KiB \\(disabled\\)\n'
+        'Current buffer large file tier: 0\n'
+        'Unsaved buffers left out of requests: \\d+' )
     )
 
 
+@YouCompleteMeInstance( { 'g:ycm_max_buffers_with_state': 2 } )
+def YouCompleteMe_OnBufferVisit_ReleaseHiddenBuffersState_test( ycm ):
+  buffers = [ VimBuffer( 'buffer{0}'.format( number ),
+                         filetype = 'c',
+                         number = number ) for number in range( 1, 5 ) ]
+
+  def BuffersWithState():
+    return [ buffer_object.number for buffer_object in buffers
+             if ycm._buffers[ buffer_object.number ]._parse_request ]
+
+  for current_buffer in buffers:
+    with MockVimBuffers( buffers, [ current_buffer ] ):
+      ycm.OnBufferVisit()
+      ycm.OnFileReadyToParse()
+
+  assert_that( BuffersWithState(), contains( 3, 4 ) )
+
+  # Buffers displayed in a window keep their state.
+  with MockVimBuffers( buffers, [ buffers[ 2 ], buffers[ 3 ] ] ):
+    ycm.OnBufferVisit()
+    ycm.OnFileReadyToParse()
+  assert_that( BuffersWithState(), contains( 3, 4 ) )
+
+  with MockVimBuffers( buffers, [ buffers[ 0 ], buffers[ 2 ] ] ):
+    buffers[ 3 ].vars[ 'ycm_diagnostic_counts' ] = {
+      'error': 1, 'warning': 2, 'fixit': 0 }
+    ycm.OnBufferVisit()
+    ycm.OnFileReadyToParse()
+  assert_that( BuffersWithState(), contains( 1, 3 ) )
+  # The diagnostic counts of released buffers are reset.
+  assert_that( buffers[ 3 ].vars[ 'ycm_diagnostic_counts' ],
+               equal_to( { 'error': 0, 'warning': 0, 'fixit': 0 } ) )
+
+  # Unloaded buffers are forgotten.
+  ycm.OnBufferUnload( 3 )
+  assert_that( ycm._buffers, is_not( has_key( 3 ) ) )
+
+
 @YouCompleteMeInstance()
 def YouCompleteMe_OnVimLeave_RemoveClientLogfileByDefault_test( ycm ):
   client_logfile = ycm._client_logfile
@@ -630,6 +678,17 @@ def YouCompleteMe_UpdateDiagnosticInterface(
       "expected ';' after expression (FixIt)",
       truncate = True, warning = False )
 
+    # Messages are published for Vimscript to echo them on CursorMoved.
+    assert_that(
+      current_buffer.vars,
+      has_entries( {
+        'ycm_diagnostic_messages': {
+          '3': "expected ';' after expression (FixIt)"
+        },
+        'ycm_diagnostic_echoed_line': 3
+      } )
+    )
+
     # Error match is added after warning matches.
     assert_that(
       test_utils.VIM_MATCHES_FOR_WINDOW,
@@ -650,31 +709,29 @@ def YouCompleteMe_UpdateDiagnosticInterface(
       )
     )
 
-  # The error is not echoed again when moving the cursor along the line.
-  with MockVimBuffers( [ current_buffer ], [ current_buffer ], ( 3, 2 ) ):
-    post_vim_message.reset_mock()
-    ycm.OnCursorMoved()
-    post_vim_message.assert_not_called()
-
-  # The error is cleared when moving the cursor to another line.
-  with MockVimBuffers( [ current_buffer ], [ current_buffer ], ( 2, 2 ) ):
-    post_vim_message.reset_mock()
-    ycm.OnCursorMoved()
-    post_vim_message.assert_called_once_with( "", warning = False )
-
-  # The error is echoed when moving the cursor back.
+  # Moving the cursor is handled by Vimscript from the published messages.
+  # The message of the current line is echoed again when new diagnostics are
+  # received.
   with MockVimBuffers( [ current_buffer ], [ current_buffer ], ( 3, 2 ) ):
     post_vim_message.reset_mock()
-    ycm.OnCursorMoved()
-    post_vim_message.assert_called_once_with(
-      "expected ';' after expression (FixIt)",
-      truncate = True, warning = False )
-
     with patch( 'ycm.client.event_notification.EventNotification.Response',
                 return_value = diagnostics[ 1 : ] ):
       ycm.OnFileReadyToParse()
       ycm.HandleFileParseRequest( block = True )
 
+    post_vim_message.assert_called_once_with(
+      'equality comparison result unused (FixIt)',
+      truncate = True, warning = False )
+    assert_that(
+      current_buffer.vars,
+      has_entries( {
+        'ycm_diagnostic_messages': {
+          '3': 'equality comparison result unused (FixIt)'
+        },
+        'ycm_diagnostic_echoed_line': 3
+      } )
+    )
+
     assert_that(
       test_utils.VIM_MATCHES_FOR_WINDOW,
       has_entries( {
@@ -702,6 +759,427 @@ def YouCompleteMe_UpdateDiagnosticInterface_NewVim_test():
   YouCompleteMe_UpdateDiagnosticInterface()
 
 
+@YouCompleteMeInstance( { 'g:ycm_echo_current_diagnostic': 1,
+                          'g:ycm_enable_diagnostic_signs': 1,
+                          'g:ycm_enable_diagnostic_highlighting': 1,
+                          'g:ycm_always_populate_location_list': 1 } )
+@patch( 'ycm.youcompleteme.YouCompleteMe.FiletypeCompleterExistsForFiletype',
+        return_value = True )
+@patch( 'ycm.vimsupport.PostVimMessage', new_callable = ExtendedMock )
+def YouCompleteMe_UpdateDiagnosticInterface_IdenticalDiagnostics_test(
+  ycm, post_vim_message, *args ):
+
+  diagnostics = [ {
+    'kind': 'ERROR',
+    'text': 'error text',
+    'location': {
+      'filepath': 'buffer',
+      'line_num': 2,
+      'column_num': 1
+    },
+    'location_extent': {
+      'start': {
+        'filepath': 'buffer',
+        'line_num': 2,
+        'column_num': 1,
+      },
+      'end': {
+        'filepath': 'buffer',
+        'line_num': 2,
+        'column_num': 3,
+      }
+    },
+    'ranges': []
+  } ]
+
+  current_buffer = VimBuffer( 'buffer',
+                              filetype = 'c',
+                              contents = [ 'line' ] * 3,
+                              number = 5 )
+
+  test_utils.VIM_MATCHES_FOR_WINDOW.clear()
+  test_utils.VIM_SIGNS = []
+  vimsupport.SIGN_ID_FOR_BUFFER.clear()
+
+  with MockVimBuffers( [ current_buffer ], [ current_buffer ], ( 2, 1 ) ):
+    with patch( 'ycm.client.event_notification.EventNotification.Response',
+                return_value = diagnostics ):
+      with patch( 'ycm.vimsupport.SetLocationListForWindow',
+                  new_callable = ExtendedMock ) as set_location_list:
+        ycm.OnFileReadyToParse()
+        ycm.HandleFileParseRequest( block = True )
+
+        post_vim_message.assert_called_once_with(
+          'error text', truncate = True, warning = False )
+        set_location_list.assert_called_once()
+
+        post_vim_message.reset_mock()
+        set_location_list.reset_mock()
+
+        # Nothing is updated when receiving the same diagnostics.
+        with patch( 'ycm.vimsupport.GetSignsInBuffer' ) as get_signs:
+          with patch( 'ycm.vimsupport.'
+                      'GetDiagnosticMatchesInCurrentWindow' ) as get_matches:
+            ycm.OnFileReadyToParse()
+            ycm.HandleFileParseRequest( block = True )
+
+            post_vim_message.assert_not_called()
+            set_location_list.assert_not_called()
+            get_signs.assert_not_called()
+            get_matches.assert_not_called()
+
+    assert_that(
+      test_utils.VIM_MATCHES_FOR_WINDOW,
+      has_entries( {
+        1: contains(
+          VimMatch( 'YcmErrorSection', '\\%2l\\%1c\\_.\\{-}\\%2l\\%3c' )
+        )
+      } )
+    )
+
+    assert_that(
+      test_utils.VIM_SIGNS,
+      contains(
+        VimSign( SIGN_BUFFER_ID_INITIAL_VALUE, 2, 'YcmError', 5 )
+      )
+    )
+
+
+@YouCompleteMeInstance( { 'g:ycm_always_populate_location_list': 1 } )
+@patch( 'ycm.youcompleteme.YouCompleteMe.FiletypeCompleterExistsForFiletype',
+        return_value = True )
+@patch( 'ycm.vimsupport.PostVimMessage', new_callable = ExtendedMock )
+def YouCompleteMe_UpdateDiagnosticInterface_OtherFileDiagnosticChanged_test(
+  ycm, *args ):
+
+  def Diagnostic( filepath, text ):
+    location = { 'filepath': filepath, 'line_num': 1, 'column_num': 1 }
+    return {
+      'kind': 'ERROR',
+      'text': text,
+      'location': location,
+      'location_extent': { 'start': location, 'end': location },
+      'ranges': []
+    }
+
+  current_buffer = VimBuffer( 'buffer',
+                              filetype = 'c',
+                              contents = [ 'line' ] * 3,
+                              number = 5 )
+
+  with MockVimBuffers( [ current_buffer ], [ current_buffer ] ):
+    with patch( 'ycm.vimsupport.SetLocationListForWindow',
+                new_callable = ExtendedMock ) as set_location_list:
+      with patch( 'ycm.client.event_notification.EventNotification.Response',
+                  return_value = [
+                    Diagnostic( 'buffer', 'error text' ),
+                    Diagnostic( 'header', 'old header error' ) ] ):
+        ycm.OnFileReadyToParse()
+        ycm.HandleFileParseRequest( block = True )
+      set_location_list.assert_called_once()
+      set_location_list.reset_mock()
+
+      # Only the diagnostic of the header changed: the diagnostics of the
+      # buffer are untouched but the location list is updated.
+      with patch( 'ycm.client.event_notification.EventNotification.Response',
+                  return_value = [
+                    Diagnostic( 'buffer', 'error text' ),
+                    Diagnostic( 'header', 'new header error' ) ] ):
+        ycm.OnFileReadyToParse()
+        ycm.HandleFileParseRequest( block = True )
+      set_location_list.assert_called_once()
+      assert_that( set_location_list.call_args[ 0 ][ 1 ], contains(
+        has_entries( { 'text': 'error text' } ),
+        has_entries( { 'text': 'new header error' } ) ) )
+
+
+@YouCompleteMeInstance()
+@patch( 'ycm.youcompleteme.YouCompleteMe.FiletypeCompleterExistsForFiletype',
+        return_value = True )
+@patch( 'ycm.vimsupport.PostVimMessage', new_callable = ExtendedMock )
+def YouCompleteMe_UpdateDiagnosticInterface_DiagnosticCounts_test(
+  ycm, *args ):
+
+  def Diagnostic( filepath, line, kind, fixit_available ):
+    location = { 'filepath': filepath, 'line_num': line, 'column_num': 1 }
+    return {
+      'kind': kind,
+      'text': 'diagnostic text',
+      'location': location,
+      'location_extent': { 'start': location, 'end': location },
+      'ranges': [],
+      'fixit_available': fixit_available
+    }
+
+  current_buffer = VimBuffer( 'current_buffer',
+                              filetype = 'c',
+                              contents = [ 'line' ] * 3,
+                              number = 1 )
+  other_buffer = VimBuffer( 'other_buffer',
+                            filetype = 'c',
+                            contents = [ 'line' ] * 3,
+                            number = 2 )
+
+  def TotalDiagnosticCounts( vim_command ):
+    command = vim_command.call_args[ 0 ][ 0 ]
+    assert_that( command, starts_with( 'let g:ycm_diagnostic_counts = ' ) )
+    return json.loads( command.split( ' = ', 1 )[ 1 ] )
+
+  with MockVimBuffers( [ current_buffer, other_buffer ],
+                       [ other_buffer, current_buffer ] ):
+    with patch( 'ycm.client.event_notification.EventNotification.Response',
+                return_value = [
+                  Diagnostic( 'other_buffer', 3, 'WARNING', True ) ] ):
+      ycm.OnFileReadyToParse()
+      ycm.HandleFileParseRequest( block = True )
+
+  with MockVimBuffers( [ current_buffer, other_buffer ],
+                       [ current_buffer, other_buffer ] ) as vim:
+    with patch( 'ycm.client.event_notification.EventNotification.Response',
+                return_value = [
+                  Diagnostic( 'current_buffer', 1, 'ERROR', True ),
+                  Diagnostic( 'current_buffer', 1, 'WARNING', False ),
+                  Diagnostic( 'current_buffer', 2, 'ERROR', False ) ] ):
+      ycm.OnFileReadyToParse()
+      ycm.HandleFileParseRequest( block = True )
+
+    assert_that( current_buffer.vars[ 'ycm_diagnostic_counts' ],
+                 equal_to( { 'error': 2, 'warning': 1, 'fixit': 1 } ) )
+    assert_that( other_buffer.vars[ 'ycm_diagnostic_counts' ],
+                 equal_to( { 'error': 0, 'warning': 1, 'fixit': 1 } ) )
+    assert_that( ycm.GetErrorCount(), equal_to( 2 ) )
+    assert_that( ycm.GetWarningCount(), equal_to( 1 ) )
+    assert_that( TotalDiagnosticCounts( vim.command ),
+                 equal_to( { 'error': 2, 'warning': 2, 'fixit': 2 } ) )
+
+    # Only the counts of the changed line are updated.
+    ycm.UpdateWithNewDiagnosticsForFile( 'current_buffer', [
+      Diagnostic( 'current_buffer', 1, 'ERROR', True ),
+      Diagnostic( 'current_buffer', 1, 'WARNING', False ) ] )
+
+    assert_that( current_buffer.vars[ 'ycm_diagnostic_counts' ],
+                 equal_to( { 'error': 1, 'warning': 1, 'fixit': 1 } ) )
+    assert_that( TotalDiagnosticCounts( vim.command ),
+                 equal_to( { 'error': 1, 'warning': 2, 'fixit': 2 } ) )
+
+    # The diagnostics of unloaded and wiped out buffers are not counted.
+    ycm.OnBufferUnload( 2 )
+    assert_that( TotalDiagnosticCounts( vim.command ),
+                 equal_to( { 'error': 1, 'warning': 1, 'fixit': 1 } ) )
+    ycm.OnBufferWipeout( 1 )
+    assert_that( TotalDiagnosticCounts( vim.command ),
+                 equal_to( { 'error': 0, 'warning': 0, 'fixit': 0 } ) )
+
+
+# A tiny time budget means that the UI is updated one line at a time.
+@YouCompleteMeInstance( { 'g:ycm_enable_diagnostic_signs': 1,
+                          'g:ycm_enable_diagnostic_highlighting': 1,
+                          'g:ycm_diagnostic_update_time_budget': 1e-9 } )
+@patch( 'ycm.youcompleteme.YouCompleteMe.FiletypeCompleterExistsForFiletype',
+        return_value = True )
+@patch( 'ycm.vimsupport.PostVimMessage', new_callable = ExtendedMock )
+def YouCompleteMe_UpdateDiagnosticInterface_TimeSliced_test( ycm, *args ):
+
+  def Diagnostics( lines, kind ):
+    diagnostics = []
+    for line in lines:
+      location = { 'filepath': 'buffer', 'line_num': line, 'column_num': 1 }
+      diagnostics.append( {
+        'kind': kind,
+        'text': 'diagnostic text',
+        'location': location,
+        'location_extent': {
+          'start': location,
+          'end': { 'filepath': 'buffer', 'line_num': line, 'column_num': 3 }
+        },
+        'ranges': []
+      } )
+    return diagnostics
+
+  def SignsOnLines():
+    return [ ( sign.line, sign.name ) for sign in test_utils.VIM_SIGNS ]
+
+  current_buffer = VimBuffer( 'buffer',
+                              filetype = 'c',
+                              contents = [ 'line' ] * 10,
+                              number = 5 )
+
+  test_utils.VIM_MATCHES_FOR_WINDOW.clear()
+  test_utils.VIM_SIGNS = []
+  vimsupport.SIGN_ID_FOR_BUFFER.clear()
+
+  with MockVimBuffers( [ current_buffer ], [ current_buffer ], ( 4, 1 ) ):
+    with patch( 'ycm.client.event_notification.EventNotification.Response',
+                return_value = Diagnostics( [ 1, 4, 6, 9 ], 'ERROR' ) ):
+      ycm.OnFileReadyToParse()
+      ycm.HandleFileParseRequest( block = True )
+
+    # Only the line closest to the cursor is updated.
+    assert_that( SignsOnLines(), contains( ( 4, 'YcmError' ) ) )
+    assert_that( ycm.HasPendingDiagnosticUpdates(), equal_to( True ) )
+
+    assert_that( ycm.ApplyPendingDiagnosticUpdates(), equal_to( True ) )
+    assert_that( SignsOnLines(), contains( ( 4, 'YcmError' ),
+                                           ( 6, 'YcmError' ) ) )
+
+    # New diagnostics supersede the update in progress.
+    with patch( 'ycm.client.event_notification.EventNotification.Response',
+                return_value = Diagnostics( [ 1, 4, 6, 9 ], 'WARNING' ) ):
+      ycm.OnFileReadyToParse()
+      ycm.HandleFileParseRequest( block = True )
+
+    while ycm.ApplyPendingDiagnosticUpdates():
+      pass
+
+    assert_that( ycm.HasPendingDiagnosticUpdates(), equal_to( False ) )
+    assert_that( SignsOnLines(), contains_inanyorder( ( 1, 'YcmWarning' ),
+                                                      ( 4, 'YcmWarning' ),
+                                                      ( 6, 'YcmWarning' ),
+                                                      ( 9, 'YcmWarning' ) ) )
+    assert_that(
+      test_utils.VIM_MATCHES_FOR_WINDOW,
+      has_entries( {
+        1: contains_inanyorder(
+          VimMatch( 'YcmWarningSection',
+                    '\\%1l\\%1c\\_.\\{-}\\%1l\\%3c' ),
+          VimMatch( 'YcmWarningSection',
+                    '\\%4l\\%1c\\_.\\{-}\\%4l\\%3c' ),
+          VimMatch( 'YcmWarningSection',
+                    '\\%6l\\%1c\\_.\\{-}\\%6l\\%3c' ),
+          VimMatch( 'YcmWarningSection',
+                    '\\%9l\\%1c\\_.\\{-}\\%9l\\%3c' )
+        )
+      } )
+    )
+
+
+# A tiny time budget means that the UI is updated one line at a time.
+@YouCompleteMeInstance( { 'g:ycm_enable_diagnostic_highlighting': 1,
+                          'g:ycm_diagnostic_update_time_budget': 1e-9 } )
+@patch( 'ycm.youcompleteme.YouCompleteMe.FiletypeCompleterExistsForFiletype',
+        return_value = True )
+@patch( 'ycm.vimsupport.PostVimMessage', new_callable = ExtendedMock )
+def YouCompleteMe_UpdateDiagnosticInterface_TimeSliced_ReadMatchesOnce_test(
+    ycm, *args ):
+
+  def Diagnostics( kind ):
+    diagnostics = []
+    for line in [ 1, 4, 6, 9 ]:
+      location = { 'filepath': 'buffer', 'line_num': line, 'column_num': 1 }
+      diagnostics.append( {
+        'kind': kind,
+        'text': 'diagnostic text',
+        'location': location,
+        'location_extent': {
+          'start': location,
+          'end': { 'filepath': 'buffer', 'line_num': line, 'column_num': 3 }
+        },
+        'ranges': []
+      } )
+    return diagnostics
+
+  current_buffer = VimBuffer( 'buffer',
+                              filetype = 'c',
+                              contents = [ 'line' ] * 10,
+                              number = 5 )
+
+  test_utils.VIM_MATCHES_FOR_WINDOW.clear()
+
+  with MockVimBuffers( [ current_buffer ], [ current_buffer ], ( 4, 1 ) ):
+    with patch( 'ycm.client.event_notification.EventNotification.Response',
+                return_value = Diagnostics( 'ERROR' ) ):
+      ycm.OnFileReadyToParse()
+      ycm.HandleFileParseRequest( block = True )
+
+    while ycm.ApplyPendingDiagnosticUpdates():
+      pass
+
+    matches_in_window = vimsupport.GetDiagnosticMatchesInCurrentWindow
+    with patch( 'ycm.vimsupport.GetDiagnosticMatchesInCurrentWindow',
+                wraps = matches_in_window ) as get_matches:
+      with patch( 'ycm.client.event_notification.EventNotification.Response',
+                  return_value = Diagnostics( 'WARNING' ) ):
+        ycm.OnFileReadyToParse()
+        ycm.HandleFileParseRequest( block = True )
+
+      while ycm.ApplyPendingDiagnosticUpdates():
+        pass
+
+      # The matches of the window are only read for the first chunk.
+      get_matches.assert_called_once_with()
+
+    assert_that(
+      test_utils.VIM_MATCHES_FOR_WINDOW,
+      has_entries( {
+        1: contains_inanyorder(
+          VimMatch( 'YcmWarningSection',
+                    '\\%1l\\%1c\\_.\\{-}\\%1l\\%3c' ),
+          VimMatch( 'YcmWarningSection',
+                    '\\%4l\\%1c\\_.\\{-}\\%4l\\%3c' ),
+          VimMatch( 'YcmWarningSection',
+                    '\\%6l\\%1c\\_.\\{-}\\%6l\\%3c' ),
+          VimMatch( 'YcmWarningSection',
+                    '\\%9l\\%1c\\_.\\{-}\\%9l\\%3c' )
+        )
+      } )
+    )
+
+
+@YouCompleteMeInstance()
+@patch( 'ycm.youcompleteme.YouCompleteMe.FiletypeCompleterExistsForFiletype',
+        return_value = True )
+@patch( 'ycm.vimsupport.PostVimMessage', new_callable = ExtendedMock )
+def YouCompleteMe_JumpToDiagnostic_test( ycm, post_vim_message, *args ):
+
+  def Diagnostic( line, column, kind ):
+    location = { 'filepath': 'buffer', 'line_num': line, 'column_num': column }
+    return {
+      'kind': kind,
+      'text': 'diagnostic text',
+      'location': location,
+      'location_extent': { 'start': location, 'end': location },
+      'ranges': []
+    }
+
+  current_buffer = VimBuffer( 'buffer',
+                              filetype = 'c',
+                              contents = [ 'some line' ] * 10,
+                              number = 5 )
+
+  with MockVimBuffers( [ current_buffer ],
+                       [ current_buffer ],
+                       ( 5, 0 ) ) as vim:
+    with patch( 'ycm.client.event_notification.EventNotification.Response',
+                return_value = [ Diagnostic( 8, 2, 'WARNING' ),
+                                 Diagnostic( 5, 4, 'ERROR' ),
+                                 Diagnostic( 2, 3, 'ERROR' ),
+                                 Diagnostic( 5, 1, 'WARNING' ) ] ):
+      ycm.OnFileReadyToParse()
+      ycm.HandleFileParseRequest( block = True )
+
+    def JumpTo( forward, severity = '' ):
+      ycm.JumpToDiagnostic( forward, severity )
+      return vim.current.window.cursor
+
+    assert_that( JumpTo( True ), equal_to( ( 5, 3 ) ) )
+    assert_that( JumpTo( True ), equal_to( ( 8, 1 ) ) )
+    # Wrap around the end of the buffer.
+    assert_that( JumpTo( True ), equal_to( ( 2, 2 ) ) )
+    assert_that( JumpTo( False ), equal_to( ( 8, 1 ) ) )
+    assert_that( JumpTo( False ), equal_to( ( 5, 3 ) ) )
+    assert_that( JumpTo( False ), equal_to( ( 5, 0 ) ) )
+    assert_that( JumpTo( True, 'error' ), equal_to( ( 5, 3 ) ) )
+    assert_that( JumpTo( True, 'error' ), equal_to( ( 2, 2 ) ) )
+    assert_that( JumpTo( False, 'WARNING' ), equal_to( ( 8, 1 ) ) )
+
+    post_vim_message.assert_not_called()
+
+    # Invalid severity.
+    assert_that( JumpTo( True, 'fixit' ), equal_to( ( 8, 1 ) ) )
+    post_vim_message.assert_called_once_with(
+      'Invalid severity "fixit". Use "error" or "warning".' )
+
+
 @YouCompleteMeInstance( { 'g:ycm_enable_diagnostic_highlighting': 1 } )
 def YouCompleteMe_UpdateMatches_ClearDiagnosticMatchesInNewBuffer_test( ycm ):
   current_buffer = VimBuffer( 'buffer',
@@ -722,6 +1200,31 @@ def YouCompleteMe_UpdateMatches_ClearDiagnosticMatchesInNewBuffer_test( ycm ):
                has_entries( { 1: empty() } ) )
 
 
+@YouCompleteMeInstance( { 'g:ycm_enable_diagnostic_highlighting': 1 } )
+def YouCompleteMe_UpdateMatches_SkipUpdateIfNothingChanged_test( ycm ):
+  current_buffer = VimBuffer( 'buffer',
+                              filetype = 'c',
+                              contents = [ 'line' ] * 3,
+                              number = 5 )
+
+  test_utils.VIM_MATCHES_FOR_WINDOW.clear()
+
+  with MockVimBuffers( [ current_buffer ], [ current_buffer ] ):
+    with patch( 'ycm.vimsupport.GetDiagnosticMatchesInCurrentWindow',
+                return_value = [] ) as get_matches:
+      ycm.UpdateMatches()
+      ycm.UpdateMatches()
+      get_matches.assert_called_once_with()
+
+      # Changing the number of lines of the buffer invalidates the matches.
+      current_buffer.contents.append( 'line' )
+      ycm.UpdateMatches()
+      assert_that( get_matches.call_count, equal_to( 2 ) )
+
+  assert_that( ycm.GetMatchesUpdateCounts(),
+               has_entries( { 'performed': 2, 'skipped': 1 } ) )
+
+
 @YouCompleteMeInstance( { 'g:ycm_echo_current_diagnostic': 1,
                           'g:ycm_always_populate_location_list': 1,
                           'g:ycm_enable_diagnostic_highlighting': 1 } )
@@ -865,10 +1368,7 @@ def YouCompleteMe_AsyncDiagnosticUpdate_SingleFile_test( ycm,
       {
         'lnum': 8,
         'col': 4,
-        'bufnr': -1, # sic: Our mocked bufnr function actually returns -1,
-                     # even though YCM is passing "create if needed".
-                     # FIXME? we shouldn't do that, and we should pass
-                     # filename instead
+        'filename': '/not_open',
         'valid': 1,
         'type': 'E',
         'text': 'error text in buffer not open in Vim'
@@ -1075,6 +1575,121 @@ def YouCompleteMe_AsyncDiagnosticUpdate_PerFile_test( ycm,
   )
 
 
+@YouCompleteMeInstance()
+@patch( 'ycm.youcompleteme.YouCompleteMe.FiletypeCompleterExistsForFiletype',
+        return_value = True )
+def YouCompleteMe_UpdateWithNewDiagnosticsForFiles_HiddenFilesStored_test(
+    ycm, *args ):
+
+  def Diagnostic( filepath ):
+    location = { 'filepath': filepath, 'line_num': 1, 'column_num': 1 }
+    return {
+      'kind': 'ERROR',
+      'text': 'error in ' + filepath,
+      'location': location,
+      'location_extent': { 'start': location, 'end': location },
+      'ranges': []
+    }
+
+  current_buffer = VimBuffer( '/current',
+                              filetype = 'ycmtest',
+                              contents = [ 'current' ],
+                              number = 1 )
+  hidden_buffer = VimBuffer( '/hidden',
+                             filetype = 'ycmtest',
+                             contents = [ 'hidden' ],
+                             number = 2 )
+  buffers = [ current_buffer, hidden_buffer ]
+
+  for current in buffers:
+    with MockVimBuffers( buffers, [ current ] ):
+      ycm.OnFileReadyToParse()
+
+  with MockVimBuffers( buffers, [ current_buffer ] ):
+    ycm.UpdateWithNewDiagnosticsForFiles( {
+      '/current': [ Diagnostic( '/current' ) ],
+      '/hidden': [ Diagnostic( '/hidden' ) ],
+      '/not_open': [ Diagnostic( '/not_open' ) ]
+    } )
+
+    assert_that( ycm.GetErrorCount(), equal_to( 1 ) )
+  assert_that( len( ycm._project_diagnostics ), equal_to( 2 ) )
+
+
+@YouCompleteMeInstance()
+@patch( 'ycm.youcompleteme.MAX_PARSE_REQUESTS_IN_PROGRESS', 1 )
+@patch( 'ycm.client.event_notification.EventNotification.'
+        'PostDataToHandlerAsync',
+        side_effect = lambda *args: MockAsyncServerResponseInProgress() )
+def YouCompleteMe_OnFileReadyToParse_DeferParseRequests_test(
+    ycm, post_data_to_handler_async ):
+  buffers = [ VimBuffer( 'buffer{0}'.format( number ),
+                         filetype = 'ycmtest',
+                         number = number ) for number in range( 1, 4 ) ]
+
+  for current_buffer in buffers:
+    with MockVimBuffers( buffers, [ current_buffer ] ):
+      ycm.OnFileReadyToParse()
+
+  # Only one request is in progress; the others are deferred.
+  assert_that( post_data_to_handler_async.call_count, equal_to( 1 ) )
+  assert_that( ycm.HasDeferredParseRequests(), equal_to( True ) )
+
+  # Once the request is done, the deferred request of the current buffer is
+  # sent while the one of the hidden buffer is dropped.
+  ycm._buffers[ 1 ]._parse_request._response_future = (
+    MockAsyncServerResponseDone( [] ) )
+  with MockVimBuffers( buffers, [ buffers[ 2 ] ] ):
+    assert_that( ycm.ProcessDeferredParseRequests(), equal_to( True ) )
+
+  assert_that( post_data_to_handler_async.call_count, equal_to( 2 ) )
+  assert_that( ycm.HasDeferredParseRequests(), equal_to( False ) )
+  assert_that( ycm._buffers[ 3 ].ParseRequestInProgress(), equal_to( True ) )
+  assert_that( ycm._buffers[ 2 ]._parse_request, none() )
+
+
+@YouCompleteMeInstance()
+@patch( 'ycm.client.event_notification.EventNotification.'
+        'PostDataToHandlerAsync',
+        side_effect = lambda *args: MockAsyncServerResponseInProgress() )
+def YouCompleteMe_ProcessDeferredParseRequests_BackgroundParseReleased_test(
+    ycm, *args ):
+  buffers = [ VimBuffer( 'buffer{0}'.format( number ),
+                         filetype = 'ycmtest',
+                         number = number ) for number in range( 1, 3 ) ]
+
+  with MockVimBuffers( buffers, [ buffers[ 0 ] ] ):
+    ycm.OnBufferVisit()
+    ycm.OnFileReadyToParse()
+    ycm._buffers[ 1 ]._parse_request._response_future = (
+      MockAsyncServerResponseDone( [] ) )
+    ycm.StartPreParse()
+    assert_that( ycm.PreParseBuffer( [ 2 ] ), equal_to( True ) )
+    assert_that( ycm.HasDeferredParseRequests(), equal_to( True ) )
+
+    # The state of the pre-parsed buffer is released before its response is
+    # handled.
+    ycm._buffers[ 2 ].ReleaseState()
+    ycm.ProcessDeferredParseRequests()
+    assert_that( ycm.HasDeferredParseRequests(), equal_to( False ) )
+
+
+@YouCompleteMeInstance()
+@patch( 'ycm.vimsupport.GetAlternateBufferNumber', return_value = 4 )
+def YouCompleteMe_GetBuffersToPreParse_test( ycm, *args ):
+  buffers = [ VimBuffer( 'buffer{0}'.format( number ),
+                         filetype = 'ycmtest',
+                         number = number ) for number in range( 1, 6 ) ]
+
+  for current_buffer in buffers[ : 3 ]:
+    with MockVimBuffers( buffers, [ current_buffer ] ):
+      ycm.OnBufferVisit()
+
+  # Alternate buffer first, then other windows, then recently entered buffers.
+  with MockVimBuffers( buffers, [ buffers[ 0 ], buffers[ 4 ] ] ):
+    assert_that( ycm.GetBuffersToPreParse(), contains( 4, 5, 3, 2 ) )
+
+
 @YouCompleteMeInstance()
 def YouCompleteMe_OnPeriodicTick_ServerNotRunning_test( ycm, *args ):
   with patch.object( ycm, 'IsServerAlive', return_value = False ):
@@ -1235,3 +1850,17 @@ def YouCompleteMe_ShouldResendFileParseRequest_NoParseRequest_test( ycm ):
   current_buffer = VimBuffer( 'current_buffer' )
   with MockVimBuffers( [ current_buffer ], [ current_buffer ] ):
     assert_that( ycm.ShouldResendFileParseRequest(), equal_to( False ) )
+
+
+@YouCompleteMeInstance()
+@patch( 'ycm.youcompleteme.SendCompleterAvailableRequest',
+        side_effect = lambda filetype: filetype == 'cpp' )
+def YouCompleteMe_FiletypeCompleterExistsForFiletype_NonSemantic_test(
+    ycm, *args ):
+  vimsupport.NON_SEMANTIC_FILETYPES.clear()
+  assert_that( ycm.FiletypeCompleterExistsForFiletype( 'cpp' ),
+               equal_to( True ) )
+  assert_that( ycm.FiletypeCompleterExistsForFiletype( 'text' ),
+               equal_to( False ) )
+  # Only large buffers of filetypes without a semantic completer are truncated.
+  assert_that( vimsupport.NON_SEMANTIC_FILETYPES, equal_to( { 'text' } ) )
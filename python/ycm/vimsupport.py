@@ -22,9 +22,10 @@ from __future__ import absolute_import
 # Not installing aliases from python-future; it's unreliable and slow.
 from builtins import *  # noqa
 
-from future.utils import iterkeys
+from future.utils import iteritems, iterkeys
 import vim
 import os
+import itertools
 import json
 import re
 from collections import defaultdict, namedtuple
@@ -72,6 +73,35 @@ SIGN_ID_FOR_BUFFER = defaultdict( lambda: SIGN_BUFFER_ID_INITIAL_VALUE )
 SIGN_PLACE_REGEX = re.compile(
   r"^.*=(?P<line>\d+).*=(?P<id>\d+).*=(?P<name>Ycm\w+)" )
 
+# Quickfix and location lists are populated by chunks of this number of entries
+# to avoid building and evaluating a huge expression at once.
+QUICKFIX_LIST_CHUNK_SIZE = 1000
+
+# Above this number of entries, the cache of resolved paths is cleared.
+REALPATH_CACHE_MAX_SIZE = 10000
+
+# Large file tiers set by the s:LargeFileTier function. In large files, only a
+# window of LARGE_FILE_WINDOW_LINES lines around the cursor is sent with event
+# notifications. Huge files are not parsed at all.
+LARGE_FILE_TIER_LARGE = 1
+LARGE_FILE_TIER_HUGE = 2
+LARGE_FILE_WINDOW_LINES = 1000
+# Filetypes known to have no semantic completer on the server (see
+# YouCompleteMe.FiletypeCompleterExistsForFiletype). Large buffers are only
+# truncated for these filetypes so that semantic completers always get the
+# whole document.
+NON_SEMANTIC_FILETYPES = set()
+
+# Modified buffers are only sent with the requests of buffers of the same
+# filetype family since completers don't use files of other languages.
+FILETYPE_FAMILIES = [
+  [ 'c', 'cpp', 'cuda', 'objc', 'objcpp' ],
+  [ 'javascript', 'javascriptreact', 'typescript', 'typescriptreact' ]
+]
+FILETYPE_FAMILY = { filetype: frozenset( family )
+                    for family in FILETYPE_FAMILIES
+                    for filetype in family }
+
 NO_COMPLETIONS = {
   'line': -1,
   'column': -1,
@@ -145,18 +175,83 @@ def GetBufferData( buffer_object ):
   }
 
 
-def GetUnsavedAndSpecifiedBufferData( included_buffer, included_filepath ):
+def GetBufferLineData( buffer_object, line_num ):
+  """Same as GetBufferData but the contents only have the line |line_num|
+  (1-based) of the buffer and the one before it. The previous line is needed
+  by the server to find the identifier finished by <CR>. The other lines are
+  left empty so that line numbers are preserved."""
+  first_line_num = max( line_num - 1, 1 )
+  lines = []
+  for index in range( first_line_num - 1, line_num ):
+    try:
+      lines.append( ToUnicode( buffer_object[ index ] ) )
+    except IndexError:
+      lines.append( '' )
+  return {
+    'contents': '\n' * ( first_line_num - 1 ) + '\n'.join( lines ) + '\n',
+    'filetypes': FiletypesForBuffer( buffer_object )
+  }
+
+
+def GetBufferWindowData( buffer_object, line_num, num_lines ):
+  """Same as GetBufferData but the contents only have the |num_lines| lines of
+  the buffer around the line |line_num| (1-based). The previous lines are left
+  empty so that line numbers are preserved."""
+  first_line = max( line_num - num_lines // 2, 1 )
+  lines = buffer_object[ first_line - 1 : first_line - 1 + num_lines ]
+  return {
+    'contents': ( '\n' * ( first_line - 1 ) +
+                  JoinLinesAsUnicode( lines ) + '\n' ),
+    'filetypes': FiletypesForBuffer( buffer_object )
+  }
+
+
+def GetLargeFileTier( buffer_number ):
+  """Return the large file tier of buffer |buffer_number| (see s:LargeFileTier)
+  or 0 if it was not computed yet."""
+  try:
+    return _LargeFileTierForBuffer( vim.buffers[ buffer_number ] )
+  except KeyError:
+    return 0
+
+
+def _LargeFileTierForBuffer( buffer_object ):
+  try:
+    return int( buffer_object.vars[ 'ycm_large_file_tier' ] )
+  except KeyError:
+    return 0
+
+
+def GetUnsavedAndSpecifiedBufferData( included_buffer,
+                                      included_filepath,
+                                      included_line_num = None ):
   """Build part of the request containing the contents and filetypes of all
   dirty buffers as well as the buffer |included_buffer| with its filepath
-  |included_filepath|."""
-  buffers_data = { included_filepath: GetBufferData( included_buffer ) }
-
-  for buffer_object in vim.buffers:
-    if not BufferModified( buffer_object ):
-      continue
+  |included_filepath|. If |included_line_num| is given, only the lines around
+  it are sent for a large |included_buffer| without a semantic completer. This
+  is only suitable for parse and identifier requests; semantic requests need
+  the whole buffer. Dirty buffers are left out if they are large, too big, or
+  of a filetype unrelated to |included_buffer| (see UnsavedBufferFilter)."""
+  tier = 0
+  if ( included_line_num and
+       NON_SEMANTIC_FILETYPES.issuperset(
+         FiletypesForBuffer( included_buffer ) ) ):
+    tier = _LargeFileTierForBuffer( included_buffer )
+  if tier >= LARGE_FILE_TIER_HUGE:
+    included_data = GetBufferLineData( included_buffer, included_line_num )
+  elif tier == LARGE_FILE_TIER_LARGE:
+    included_data = GetBufferWindowData( included_buffer,
+                                         included_line_num,
+                                         LARGE_FILE_WINDOW_LINES )
+  else:
+    included_data = GetBufferData( included_buffer )
+  buffers_data = { included_filepath: included_data }
 
+  filetypes = _FiletypeFamily( included_data[ 'filetypes' ] )
+  for buffer_object in MODIFIED_BUFFERS.Get():
     filepath = GetBufferFilepath( buffer_object )
-    if filepath in buffers_data:
+    if ( filepath in buffers_data or
+         not UNSAVED_BUFFER_FILTER.Includes( buffer_object, filetypes ) ):
       continue
 
     buffers_data[ filepath ] = GetBufferData( buffer_object )
@@ -164,10 +259,313 @@ def GetUnsavedAndSpecifiedBufferData( included_buffer, included_filepath ):
   return buffers_data
 
 
+def _FiletypeFamily( filetypes ):
+  family = set( filetypes )
+  for filetype in filetypes:
+    family.update( FILETYPE_FAMILY.get( filetype, () ) )
+  return family
+
+
+class UnsavedBufferFilter( object ):
+  """Decide which dirty buffers are sent with a request in addition to the
+  buffer of the request. Buffers with no filetype in |filetypes|, large files,
+  and buffers bigger than the g:ycm_max_unsaved_buffer_size_kb option are left
+  out. The number of buffers left out is counted for :YcmDebugInfo."""
+
+  def __init__( self ):
+    # Maximum size in bytes of the included buffers. No limit if 0.
+    self.max_size = 0
+    self.num_skipped = 0
+
+
+  def Includes( self, buffer_object, filetypes ):
+    # The size is only computed when it decides whether the buffer is included
+    # since it requires going through all the lines of a changed buffer.
+    if ( filetypes.isdisjoint( FiletypesForBuffer( buffer_object ) ) or
+         _LargeFileTierForBuffer( buffer_object ) > 0 or
+         ( self.max_size > 0 and
+           BUFFER_METADATA_CACHE.GetSize( buffer_object ) > self.max_size ) ):
+      self.num_skipped += 1
+      return False
+    return True
+
+
+UNSAVED_BUFFER_FILTER = UnsavedBufferFilter()
+
+
+def SetMaxUnsavedBufferSize( max_size ):
+  UNSAVED_BUFFER_FILTER.max_size = max_size
+
+
+def GetNumSkippedUnsavedBuffers():
+  """Return the number of times a dirty buffer was not sent with a request
+  because of its filetype or size."""
+  return UNSAVED_BUFFER_FILTER.num_skipped
+
+
+class ModifiedBufferSet( object ):
+  """Numbers of the buffers with unsaved changes so that building a request
+  only looks at these buffers instead of checking the 'modified' option of all
+  of them. The set is built from the buffer list on first use and is then kept
+  up to date through the BufModifiedSet and BufLeave autocommands or, if
+  BufModifiedSet is not available, through the TextChanged, TextChangedI,
+  BufLeave, BufWritePost, and BufReadPost autocommands. Buffers are also
+  removed from the set when they are unloaded or wiped out. Since autocommands
+  are not triggered while another autocommand is executed, the 'modified'
+  option of the buffers in the set is still checked."""
+
+  def __init__( self ):
+    self._buffer_numbers = None
+    # Number of times a buffer was saved or had its changes discarded.
+    self._num_cleared = 0
+
+
+  def Get( self ):
+    """Return the buffer objects of the modified buffers."""
+    if self._buffer_numbers is None:
+      self._buffer_numbers = { buffer_object.number
+                               for buffer_object in vim.buffers
+                               if BufferModified( buffer_object ) }
+
+    buffers = []
+    for buffer_number in list( self._buffer_numbers ):
+      try:
+        buffer_object = vim.buffers[ buffer_number ]
+      except KeyError:
+        self._buffer_numbers.discard( buffer_number )
+        continue
+      if not BufferModified( buffer_object ):
+        self._buffer_numbers.discard( buffer_number )
+        continue
+      buffers.append( buffer_object )
+    return buffers
+
+
+  def Set( self, buffer_number, modified ):
+    if self._buffer_numbers is None:
+      # The buffer will be added when building the set if modified. No
+      # generation was computed yet so there is nothing to invalidate.
+      return
+    if modified:
+      self._buffer_numbers.add( buffer_number )
+    elif buffer_number in self._buffer_numbers:
+      self._buffer_numbers.remove( buffer_number )
+      self._num_cleared += 1
+
+
+  def Generation( self, excluded_buffer_number = None ):
+    """Return a value that changes whenever a buffer other than
+    |excluded_buffer_number| is changed, saved, or has its changes
+    discarded."""
+    return ( self._num_cleared,
+             tuple( sorted(
+               ( buffer_object.number,
+                 GetBufferChangedTick( buffer_object.number ) )
+               for buffer_object in self.Get()
+               if buffer_object.number != excluded_buffer_number ) ) )
+
+
+MODIFIED_BUFFERS = ModifiedBufferSet()
+
+
+def SetBufferModified( buffer_number, modified ):
+  MODIFIED_BUFFERS.Set( buffer_number, modified )
+
+
+def GetEditGeneration( excluded_buffer_number = None ):
+  """Return a value that changes whenever the contents of a buffer other than
+  |excluded_buffer_number|, as seen by the server, may have changed. Compared
+  to the value at the time of the last parse of a buffer to know if that parse
+  may be outdated by changes in other buffers."""
+  return MODIFIED_BUFFERS.Generation( excluded_buffer_number )
+
+
+class BufferNumberIndex( object ):
+  """Map the real path of named buffers to their number so that finding the
+  buffer of a file is a dictionary lookup instead of a bufnr() call. The index
+  is built from the buffer list on first use and is then kept up to date
+  through the BufAdd, BufFilePost, and BufWipeout autocommands. Since unlisted
+  buffers don't trigger BufAdd and autocommands are not triggered while another
+  autocommand is executed, the index is also rebuilt when the number of buffers
+  doesn't match."""
+
+  def __init__( self ):
+    self._buffer_number_for_filepath = None
+    self._filepath_for_buffer_number = {}
+
+
+  def Get( self, filepath ):
+    """Return the number of the buffer whose real path is |filepath| or -1 if
+    there is none."""
+    if ( self._buffer_number_for_filepath is None or
+         len( vim.buffers ) != len( self._filepath_for_buffer_number ) ):
+      self._Build()
+    return self._buffer_number_for_filepath.get( _IndexKey( filepath ), -1 )
+
+
+  def Add( self, buffer_number ):
+    """Add buffer |buffer_number| to the index or update its path if it was
+    renamed."""
+    if self._buffer_number_for_filepath is None:
+      # The buffer will be added when building the index.
+      return
+    self.Remove( buffer_number )
+    self._Add( vim.buffers[ buffer_number ] )
+
+
+  def Remove( self, buffer_number ):
+    if self._buffer_number_for_filepath is None:
+      return
+    if buffer_number not in self._filepath_for_buffer_number:
+      return
+    filepath = self._filepath_for_buffer_number.pop( buffer_number )
+    if ( filepath is None or
+         self._buffer_number_for_filepath.get( filepath ) != buffer_number ):
+      return
+    del self._buffer_number_for_filepath[ filepath ]
+    # Another buffer may point to the same file through a symbolic link.
+    for other_number, other_filepath in iteritems(
+        self._filepath_for_buffer_number ):
+      if other_filepath == filepath:
+        self._buffer_number_for_filepath[ filepath ] = other_number
+        break
+
+
+  def _Build( self ):
+    self._buffer_number_for_filepath = {}
+    self._filepath_for_buffer_number = {}
+    for buffer_object in vim.buffers:
+      self._Add( buffer_object )
+
+
+  def _Add( self, buffer_object ):
+    # Unnamed buffers are kept to count the buffers but they can't be found by
+    # path, like with bufnr().
+    if not buffer_object.name:
+      self._filepath_for_buffer_number[ buffer_object.number ] = None
+      return
+    filepath = _IndexKey( ToUnicode( buffer_object.name ) )
+    self._filepath_for_buffer_number[ buffer_object.number ] = filepath
+    self._buffer_number_for_filepath.setdefault( filepath,
+                                                 buffer_object.number )
+
+
+BUFFER_NUMBER_INDEX = BufferNumberIndex()
+
+
+class BufferMetadataCache( object ):
+  """Cache the path and the filetypes of buffers, which are needed several
+  times per keystroke, so that they are not computed each time through
+  path normalization and Vim evaluations. The filetypes of a buffer are
+  invalidated by the FileType autocommand and its path by the BufFilePost
+  autocommand. Paths of unnamed buffers depend on the working directory so the
+  whole cache is invalidated by the DirChanged autocommand. The size of a
+  buffer is cached until its changedtick changes."""
+
+  def __init__( self ):
+    self._filepath_for_buffer_number = {}
+    self._filetypes_for_buffer_number = {}
+    self._size_for_buffer_number = {}
+
+
+  def GetFilepath( self, buffer_object ):
+    # The name is compared in case the buffer was renamed while autocommands
+    # were blocked. Reading it is cheap compared to normalizing it.
+    name = buffer_object.name
+    cached = self._filepath_for_buffer_number.get( buffer_object.number )
+    if cached is not None and cached[ 0 ] == name:
+      return cached[ 1 ]
+    filepath = _ComputeBufferFilepath( buffer_object )
+    self._filepath_for_buffer_number[ buffer_object.number ] = ( name,
+                                                                 filepath )
+    return filepath
+
+
+  def GetFiletypes( self, buffer_number ):
+    try:
+      filetypes = self._filetypes_for_buffer_number[ buffer_number ]
+    except KeyError:
+      filetypes = tuple( _ComputeBufferFiletypes( buffer_number ) )
+      self._filetypes_for_buffer_number[ buffer_number ] = filetypes
+    # Callers may modify the returned list.
+    return list( filetypes )
+
+
+  def GetSize( self, buffer_object ):
+    """Return the size of the contents of |buffer_object| in bytes, counting
+    one byte per character."""
+    changedtick = GetBufferChangedTick( buffer_object.number )
+    cached = self._size_for_buffer_number.get( buffer_object.number )
+    if cached is not None and cached[ 0 ] == changedtick:
+      return cached[ 1 ]
+    size = sum( len( line ) + 1 for line in buffer_object )
+    self._size_for_buffer_number[ buffer_object.number ] = ( changedtick,
+                                                             size )
+    return size
+
+
+  def Invalidate( self, buffer_number = None ):
+    """Invalidate the metadata of buffer |buffer_number| or of all buffers if
+    not given."""
+    if buffer_number is None:
+      self._filepath_for_buffer_number.clear()
+      self._filetypes_for_buffer_number.clear()
+      self._size_for_buffer_number.clear()
+      return
+    self._filepath_for_buffer_number.pop( buffer_number, None )
+    self._filetypes_for_buffer_number.pop( buffer_number, None )
+    self._size_for_buffer_number.pop( buffer_number, None )
+
+
+BUFFER_METADATA_CACHE = BufferMetadataCache()
+
+
+def InvalidateBufferMetadata( buffer_number = None ):
+  BUFFER_METADATA_CACHE.Invalidate( buffer_number )
+
+
+# Memoized results of os.path.realpath, which stats each component of the path.
+REALPATH_CACHE = {}
+
+
+def GetRealPath( filepath ):
+  # The real path of a relative path depends on the working directory.
+  if not os.path.isabs( filepath ):
+    return os.path.realpath( filepath )
+  try:
+    return REALPATH_CACHE[ filepath ]
+  except KeyError:
+    pass
+  if len( REALPATH_CACHE ) >= REALPATH_CACHE_MAX_SIZE:
+    REALPATH_CACHE.clear()
+  realpath = os.path.realpath( filepath )
+  REALPATH_CACHE[ filepath ] = realpath
+  return realpath
+
+
+def _IndexKey( filepath ):
+  # Paths are case-insensitive on Windows.
+  return os.path.normcase( GetRealPath( filepath ) )
+
+
+def AddBufferToIndex( buffer_number ):
+  BUFFER_NUMBER_INDEX.Add( buffer_number )
+
+
+def RemoveBufferFromIndex( buffer_number ):
+  BUFFER_NUMBER_INDEX.Remove( buffer_number )
+
+
 def GetBufferNumberForFilename( filename, create_buffer_if_needed = False ):
-  return GetIntValue( u"bufnr('{0}', {1})".format(
-      EscapeForVim( os.path.realpath( filename ) ),
-      int( create_buffer_if_needed ) ) )
+  buffer_number = BUFFER_NUMBER_INDEX.Get( filename )
+  if buffer_number != -1 or not create_buffer_if_needed:
+    return buffer_number
+  buffer_number = GetIntValue( u"bufnr('{0}', 1)".format(
+      EscapeForVim( GetRealPath( filename ) ) ) )
+  if buffer_number > 0:
+    # Unlisted buffers don't trigger the BufAdd autocommand.
+    AddBufferToIndex( buffer_number )
+  return buffer_number
 
 
 def GetCurrentBufferFilepath():
@@ -182,6 +580,10 @@ def BufferIsVisible( buffer_number ):
 
 
 def GetBufferFilepath( buffer_object ):
+  return BUFFER_METADATA_CACHE.GetFilepath( buffer_object )
+
+
+def _ComputeBufferFilepath( buffer_object ):
   if buffer_object.name:
     return os.path.normpath( ToUnicode( buffer_object.name ) )
   # Buffers that have just been created by a command like :enew don't have any
@@ -189,10 +591,55 @@ def GetBufferFilepath( buffer_object ):
   return os.path.join( GetCurrentDirectory(), str( buffer_object.number ) )
 
 
+def GetBufferFilepathForNumber( buffer_number ):
+  """Return the path of buffer |buffer_number| with symbolic links resolved."""
+  return GetRealPath( GetBufferFilepath( vim.buffers[ buffer_number ] ) )
+
+
+def GetBufferNumLines( buffer_number ):
+  return NumLinesInBuffer( vim.buffers[ buffer_number ] )
+
+
 def GetCurrentBufferNumber():
   return vim.current.buffer.number
 
 
+def GetAlternateBufferNumber():
+  return GetIntValue( "bufnr('#')" )
+
+
+def GetCurrentBufferNumLines():
+  return NumLinesInBuffer( vim.current.buffer )
+
+
+def GetCurrentWindowVariable( name ):
+  """Return the value of the window-local variable |name| (without the w:
+  prefix) as a Unicode string, or None if the variable doesn't exist."""
+  try:
+    return ToUnicode( vim.current.window.vars[ name ] )
+  except KeyError:
+    return None
+
+
+def SetCurrentWindowVariable( name, value ):
+  vim.current.window.vars[ name ] = value
+
+
+def GetBufferVariable( buffer_number, name ):
+  """Return the value of the buffer-local variable |name| (without the b:
+  prefix) of buffer |buffer_number|, or None if the variable doesn't exist."""
+  try:
+    return vim.buffers[ buffer_number ].vars[ name ]
+  except KeyError:
+    return None
+
+
+def SetBufferVariable( buffer_number, name, value ):
+  """Set the buffer-local variable |name| (without the b: prefix) of buffer
+  |buffer_number| to |value|."""
+  vim.buffers[ buffer_number ].vars[ name ] = value
+
+
 def GetBufferChangedTick( bufnr ):
   return GetIntValue( 'getbufvar({0}, "changedtick")'.format( bufnr ) )
 
@@ -208,6 +655,8 @@ def CaptureVimCommand( command ):
 
 class DiagnosticSign( namedtuple( 'DiagnosticSign',
                                   [ 'id', 'line', 'name', 'buffer_number' ] ) ):
+  __slots__ = ()
+
   # We want two signs that have different ids but the same location to compare
   # equal. ID doesn't matter.
   def __eq__( self, other ):
@@ -248,6 +697,8 @@ def PlaceSign( sign ):
 
 class DiagnosticMatch( namedtuple( 'DiagnosticMatch',
                                    [ 'id', 'group', 'pattern' ] ) ):
+  __slots__ = ()
+
   def __eq__( self, other ):
     return ( self.group == other.group and
              self.pattern == other.pattern )
@@ -320,6 +771,21 @@ def GetWindowsForBufferNumber( buffer_number ):
            if window.buffer.number == buffer_number ]
 
 
+def GetVisibleBufferNumbers():
+  """Return the set of buffer numbers displayed in a window of the current tab
+  page. Cheaper than calling BufferIsVisible on many buffers."""
+  return { window.buffer.number for window in vim.windows }
+
+
+def GetVisibleLines():
+  """Return the lines of the current buffer displayed in the current window as
+  Unicode strings."""
+  first_line = GetIntValue( "line('w0')" )
+  last_line = GetIntValue( "line('w$')" )
+  return [ ToUnicode( line )
+           for line in vim.current.buffer[ first_line - 1 : last_line ] ]
+
+
 def SetLocationListsForBuffer( buffer_number, diagnostics ):
   """Populate location lists for all windows containing the buffer with number
   |buffer_number|. See SetLocationListForWindow for format of diagnostics."""
@@ -330,8 +796,7 @@ def SetLocationListsForBuffer( buffer_number, diagnostics ):
 def SetLocationListForWindow( window_number, diagnostics ):
   """Populate the location list with diagnostics. Diagnostics should be in
   qflist format; see ":h setqflist" for details."""
-  vim.eval( 'setloclist( {0}, {1} )'.format( window_number,
-                                             json.dumps( diagnostics ) ) )
+  _SetListByChunks( 'setloclist', [ window_number ], diagnostics )
 
 
 def OpenLocationList( focus = False, autoclose = False ):
@@ -357,8 +822,27 @@ def OpenLocationList( focus = False, autoclose = False ):
 
 def SetQuickFixList( quickfix_list ):
   """Populate the quickfix list and open it. List should be in qflist format:
-  see ":h setqflist" for details."""
-  vim.eval( 'setqflist( {0} )'.format( json.dumps( quickfix_list ) ) )
+  see ":h setqflist" for details. It can be any iterable, in which case its
+  entries are generated as the list is populated."""
+  _SetListByChunks( 'setqflist', [], quickfix_list )
+
+
+def _SetListByChunks( function, arguments, entries ):
+  """Call the Vim |function| (setqflist or setloclist) with |arguments| to
+  replace the list by the first chunk of |entries| then to append the other
+  chunks."""
+  entries = iter( entries )
+  action = []
+  while True:
+    chunk = list( itertools.islice( entries, QUICKFIX_LIST_CHUNK_SIZE ) )
+    # Always set the list once so that it's emptied if there are no entries.
+    if not chunk and action:
+      return
+    vim.eval( '{0}( {1} )'.format(
+      function,
+      ', '.join( [ str( argument ) for argument in arguments ] +
+                 [ json.dumps( chunk ) ] + action ) ) )
+    action = [ "'a'" ]
 
 
 def OpenQuickFixList( focus = False, autoclose = False ):
@@ -385,10 +869,15 @@ def ComputeFittingHeightForCurrentWindow():
   if not current_window.options[ 'wrap' ]:
     return len( vim.current.buffer )
 
+  # The window can't be taller than the screen so there is no need to go
+  # through all the lines of a long list.
+  max_height = GetIntValue( '&lines' )
   window_width = current_window.width
   fitting_height = 0
   for line in vim.current.buffer:
     fitting_height += len( line ) // window_width + 1
+    if fitting_height >= max_height:
+      break
   return fitting_height
 
 
@@ -397,6 +886,8 @@ def SetFittingHeightForCurrentWindow():
 
 
 def ConvertDiagnosticsToQfList( diagnostics ):
+  """Convert the ycm.diagnostic.Diagnostic objects |diagnostics| to quickfix
+  list entries."""
   def ConvertDiagnosticToQfFormat( diagnostic ):
     # See :h getqflist for a description of the dictionary fields.
     # Note that, as usual, Vim is completely inconsistent about whether
@@ -404,28 +895,35 @@ def ConvertDiagnosticsToQfList( diagnostics ):
     # them to be 1-based. The documentation states quite clearly that it
     # expects a byte offset, by which it means "1-based column number" as
     # described in :h getqflist ("the first column is 1").
-    location = diagnostic[ 'location' ]
-    line_num = location[ 'line_num' ]
+    line_num = diagnostic.line_num
 
     # libclang can give us diagnostics that point "outside" the file; Vim borks
     # on these.
     if line_num < 1:
       line_num = 1
 
-    text = diagnostic[ 'text' ]
-    if diagnostic.get( 'fixit_available', False ):
+    text = diagnostic.text
+    if diagnostic.fixit_available:
       text += ' (FixIt available)'
 
-    return {
-      'bufnr' : GetBufferNumberForFilename( location[ 'filepath' ],
-                                            create_buffer_if_needed = True ),
+    qf_item = {
       'lnum'  : line_num,
-      'col'   : location[ 'column_num' ],
+      'col'   : diagnostic.column_num,
       'text'  : text,
-      'type'  : diagnostic[ 'kind' ][ 0 ],
+      'type'  : diagnostic.kind[ 0 ],
       'valid' : 1
     }
 
+    # Let Vim find the file from its name if it's not loaded instead of creating
+    # a buffer for it.
+    filepath = diagnostic.filepath
+    buffer_number = GetBufferNumberForFilename( filepath )
+    if buffer_number != -1:
+      qf_item[ 'bufnr' ] = buffer_number
+    else:
+      qf_item[ 'filename' ] = filepath
+    return qf_item
+
   return [ ConvertDiagnosticToQfFormat( x ) for x in diagnostics ]
 
 
@@ -713,7 +1211,7 @@ def EscapeForVim( text ):
 
 
 def CurrentFiletypes():
-  return ToUnicode( vim.eval( "&filetype" ) ).split( '.' )
+  return GetBufferFiletypes( vim.current.buffer.number )
 
 
 def CurrentFiletypesEnabled( disabled_filetypes ):
@@ -721,11 +1219,22 @@ def CurrentFiletypesEnabled( disabled_filetypes ):
   |disabled_filetypes| must be a dictionary where keys are the disabled
   filetypes and values are unimportant. The special key '*' matches all
   filetypes."""
+  return BufferFiletypesEnabled( vim.current.buffer.number,
+                                 disabled_filetypes )
+
+
+def BufferFiletypesEnabled( bufnr, disabled_filetypes ):
+  """Same as CurrentFiletypesEnabled for the buffer with number |bufnr|."""
   return ( '*' not in disabled_filetypes and
-           not any( x in disabled_filetypes for x in CurrentFiletypes() ) )
+           not any( x in disabled_filetypes
+                    for x in GetBufferFiletypes( bufnr ) ) )
 
 
 def GetBufferFiletypes( bufnr ):
+  return BUFFER_METADATA_CACHE.GetFiletypes( bufnr )
+
+
+def _ComputeBufferFiletypes( bufnr ):
   command = 'getbufvar({0}, "&ft")'.format( bufnr )
   return ToUnicode( vim.eval( command ) ).split( '.' )
 
@@ -22,12 +22,14 @@ from __future__ import absolute_import
 # Not installing aliases from python-future; it's unreliable and slow.
 from builtins import *  # noqa
 
-from future.utils import iteritems
+from collections import OrderedDict
+from future.utils import iteritems, itervalues
 import base64
 import json
 import logging
 import os
 import signal
+import time
 import vim
 from subprocess import PIPE
 from tempfile import NamedTemporaryFile
@@ -35,6 +37,10 @@ from ycm import base, paths, vimsupport
 from ycm.buffer import ( BufferDict,
                          DIAGNOSTIC_UI_FILETYPES,
                          DIAGNOSTIC_UI_ASYNC_FILETYPES )
+from ycm.diagnostic_interface import ( DIAGNOSTIC_COUNTS_KEYS,
+                                       DIAGNOSTIC_COUNTS_VARIABLE,
+                                       DiagnosticUpdateDeadline )
+from ycm.project_diagnostics import ProjectDiagnostics
 from ycmd import utils
 from ycmd.request_wrap import RequestWrap
 from ycm.omni_completer import OmniCompleter
@@ -47,7 +53,10 @@ from ycm.client.completion_request import CompletionRequest
 from ycm.client.debug_info_request import ( SendDebugInfoRequest,
                                             FormatDebugInfoResponse )
 from ycm.client.omni_completion_request import OmniCompletionRequest
-from ycm.client.event_notification import SendEventNotificationAsync
+from ycm.client.identifier_completion_request import (
+    VisibleIdentifierCompletionRequest )
+from ycm.client.event_notification import ( EventNotificationQueue,
+                                            SendEventNotificationAsync )
 from ycm.client.shutdown_request import SendShutdownRequest
 from ycm.client.messages_request import MessagesPoll
 
@@ -104,6 +113,14 @@ SERVER_LOGFILE_FORMAT = 'ycmd_{port}_{std}_'
 # https://msdn.microsoft.com/en-us/library/ms724935.aspx
 HANDLE_FLAG_INHERIT = 0x00000001
 
+# Diagnostic kind for each severity accepted by the :YcmNextDiagnostic and
+# :YcmPrevDiagnostic commands. All diagnostics are considered by default.
+DIAGNOSTIC_SEVERITIES = { '': None, 'error': 'ERROR', 'warning': 'WARNING' }
+
+# Above this number of parse requests in progress, new parse requests are
+# deferred (see YouCompleteMe.ProcessDeferredParseRequests).
+MAX_PARSE_REQUESTS_IN_PROGRESS = 4
+
 
 class YouCompleteMe( object ):
   def __init__( self ):
@@ -128,10 +145,24 @@ class YouCompleteMe( object ):
 
   def _SetUpServer( self ):
     self._available_completers = {}
+    vimsupport.NON_SEMANTIC_FILETYPES.clear()
     self._user_notified_about_crash = False
     self._filetypes_with_keywords_loaded = set()
     self._server_is_ready_with_cache = False
     self._message_poll_request = None
+    self._matches_updates = { 'performed': 0, 'skipped': 0 }
+    self._buffers_with_pending_diagnostic_updates = set()
+    self._project_diagnostics = ProjectDiagnostics()
+    self._event_queue = EventNotificationQueue()
+    # Extra data of the deferred parse requests by buffer number, in the order
+    # they were requested.
+    self._deferred_parses = OrderedDict()
+    # Numbers of the buffers parsed while not being the current buffer whose
+    # response was not handled yet.
+    self._background_parses = set()
+    # Number of buffers that can still be parsed in the background (see
+    # PreParseBuffer).
+    self._pre_parse_budget = 0
 
     self._user_options = base.GetUserOptions()
     self._omnicomp = OmniCompleter( self._user_options )
@@ -154,6 +185,8 @@ class YouCompleteMe( object ):
 
     BaseRequest.server_location = 'http://127.0.0.1:' + str( server_port )
     BaseRequest.hmac_secret = hmac_secret
+    vimsupport.SetMaxUnsavedBufferSize(
+      self._user_options[ 'max_unsaved_buffer_size_kb' ] * 1024 )
 
     try:
       python_interpreter = paths.PathToPythonInterpreter()
@@ -290,8 +323,25 @@ class YouCompleteMe( object ):
 
 
   def SendCompletionRequest( self, force_semantic = False ):
+    if ( vimsupport.GetLargeFileTier( vimsupport.GetCurrentBufferNumber() ) >=
+         vimsupport.LARGE_FILE_TIER_HUGE ):
+      # Completion doesn't involve the server so the contents of the buffers are
+      # not needed.
+      line, column = vimsupport.CurrentLineAndColumn()
+      request_data = {
+        'filepath': vimsupport.GetCurrentBufferFilepath(),
+        'line_num': line + 1,
+        'column_num': column + 1,
+        'force_semantic': force_semantic
+      }
+      self._latest_completion_request = VisibleIdentifierCompletionRequest(
+          request_data, self._user_options )
+      self._latest_completion_request.Start()
+      return
+
     request_data = BuildRequestData()
     request_data[ 'force_semantic' ] = force_semantic
+
     if not self.NativeFiletypeCompletionUsable():
       wrapped_request_data = RequestWrap( request_data )
       if self._omnicomp.ShouldUseNow( wrapped_request_data ):
@@ -373,6 +423,8 @@ class YouCompleteMe( object ):
       return False
 
     self._available_completers[ filetype ] = exists_completer
+    if not exists_completer:
+      vimsupport.NON_SEMANTIC_FILETYPES.add( filetype )
     return exists_completer
 
 
@@ -392,35 +444,43 @@ class YouCompleteMe( object ):
     return self.CurrentBuffer().NeedsReparse()
 
 
+  def NeedsReparseOnVisit( self ):
+    return self.CurrentBuffer().NeedsReparseOnVisit()
+
+
   def UpdateWithNewDiagnosticsForFile( self, filepath, diagnostics ):
-    bufnr = vimsupport.GetBufferNumberForFilename( filepath )
-    if bufnr in self._buffers and vimsupport.BufferIsVisible( bufnr ):
-      # Note: We only update location lists, etc. for visible buffers, because
-      # otherwise we default to using the current location list and the results
-      # are that non-visible buffer errors clobber visible ones.
-      self._buffers[ bufnr ].UpdateWithNewDiagnostics( diagnostics )
-    else:
-      # The project contains errors in file "filepath", but that file is not
-      # open in any buffer. This happens for Language Server Protocol-based
-      # completers, as they return diagnostics for the entire "project"
-      # asynchronously (rather than per-file in the response to the parse
-      # request).
-      #
-      # There are a number of possible approaches for
-      # this, but for now we simply ignore them. Other options include:
-      # - Use the QuickFix list to report project errors?
-      # - Use a special buffer for project errors
-      # - Put them in the location list of whatever the "current" buffer is
-      # - Store them in case the buffer is opened later
-      # - add a :YcmProjectDiags command
-      # - Add them to errror/warning _counts_ but not any actual location list
-      #   or other
-      # - etc.
-      #
-      # However, none of those options are great, and lead to their own
-      # complexities. So for now, we just ignore these diagnostics for files not
-      # open in any buffer.
-      pass
+    self.UpdateWithNewDiagnosticsForFiles( { filepath: diagnostics } )
+
+
+  def UpdateWithNewDiagnosticsForFiles( self, diagnostics_by_file ):
+    """Update the diagnostics of several files at once. |diagnostics_by_file|
+    is a dictionary mapping file paths to their new diagnostics. The files
+    displayed in a window are updated first. Diagnostics are not displayed in
+    large files."""
+    visible_buffers = vimsupport.GetVisibleBufferNumbers()
+    hidden_files = []
+    for filepath, diagnostics in iteritems( diagnostics_by_file ):
+      bufnr = vimsupport.GetBufferNumberForFilename( filepath )
+      if bufnr in visible_buffers and self._IsLargeBuffer( bufnr ):
+        self._project_diagnostics.Discard( filepath )
+      elif bufnr in self._buffers and bufnr in visible_buffers:
+        # Note: We only update location lists, etc. for visible buffers,
+        # because otherwise we default to using the current location list and
+        # the results are that non-visible buffer errors clobber visible ones.
+        self._buffers[ bufnr ].UpdateWithNewDiagnostics( diagnostics )
+        self._OnDiagnosticsUpdated( bufnr )
+        self._project_diagnostics.Discard( filepath )
+      else:
+        hidden_files.append( ( filepath, diagnostics ) )
+
+    # The project contains errors in files that are not displayed in any
+    # window. This happens for Language Server Protocol-based completers, as
+    # they return diagnostics for the entire "project" asynchronously (rather
+    # than per-file in the response to the parse request). We store them so
+    # that they are displayed as soon as the file is opened and can be listed
+    # with the :YcmProjectDiags command.
+    for filepath, diagnostics in hidden_files:
+      self._project_diagnostics.Update( filepath, diagnostics )
 
 
   def OnPeriodicTick( self ):
@@ -458,21 +518,229 @@ class YouCompleteMe( object ):
     self._AddSyntaxDataIfNeeded( extra_data )
     self._AddExtraConfDataIfNeeded( extra_data )
 
-    self.CurrentBuffer().SendParseRequest( extra_data )
+    # Buffers are only pre-parsed while the user is idle.
+    self._pre_parse_budget = 0
+    bufnr = vimsupport.GetCurrentBufferNumber()
+    # The previous request for that buffer is superseded.
+    self._deferred_parses.pop( bufnr, None )
+    if self._NumParseRequestsInProgress() >= MAX_PARSE_REQUESTS_IN_PROGRESS:
+      self._deferred_parses[ bufnr ] = extra_data
+      return
+
+    self._SendParseRequest( bufnr, extra_data )
+
+
+  def _SendParseRequest( self, bufnr, extra_data ):
+    # Queued events of the buffer are sent before the parse request so that the
+    # server receives them in order.
+    self._buffers[ bufnr ].SendParseRequest( extra_data, self._event_queue )
+
+
+  def _NumParseRequestsInProgress( self ):
+    return sum( buffer_object.ParseRequestInProgress()
+                for buffer_object in itervalues( self._buffers ) )
+
+
+  def HasDeferredParseRequests( self ):
+    return bool( self._deferred_parses or self._background_parses )
+
+
+  def ProcessDeferredParseRequests( self ):
+    """Opening many files at once (e.g. with vim -p or when restoring a
+    session) or reloading them after :checktime sends a burst of parse requests
+    that saturates both the client and the server. Only a limited number of
+    parse requests are in progress at the same time; the others are deferred
+    and sent from a timer calling this method, starting with the current buffer
+    followed by the buffers displayed in a window. Hidden buffers are not
+    parsed until they are entered. The responses for buffers other than the
+    current one are also handled here. Returns True if the parse request of the
+    current buffer was sent."""
+    self._HandleBackgroundParseRequests()
+    if not self._deferred_parses:
+      return False
+    if not self.IsServerReady():
+      self._deferred_parses.clear()
+      return False
+
+    current_bufnr = vimsupport.GetCurrentBufferNumber()
+    visible_buffers = vimsupport.GetVisibleBufferNumbers()
+    for bufnr in list( self._deferred_parses ):
+      if bufnr not in visible_buffers:
+        self._DropDeferredParseRequest( bufnr )
+
+    current_buffer_sent = False
+    num_requests = self._NumParseRequestsInProgress()
+    for bufnr in sorted( self._deferred_parses,
+                         key = lambda bufnr: bufnr != current_bufnr ):
+      if num_requests >= MAX_PARSE_REQUESTS_IN_PROGRESS:
+        break
+      self._SendParseRequest( bufnr, self._deferred_parses.pop( bufnr ) )
+      num_requests += 1
+      if bufnr == current_bufnr:
+        current_buffer_sent = True
+      else:
+        self._background_parses.add( bufnr )
+    return current_buffer_sent
+
+
+  def StartPreParse( self ):
+    self._pre_parse_budget = self._user_options[ 'max_pre_parsed_buffers' ]
+
+
+  def GetBuffersToPreParse( self ):
+    """Return the numbers of the buffers likely to be visited next: the
+    alternate buffer, the buffers displayed in other windows, and the buffers
+    recently entered. Buffers whose state was released are excluded."""
+    current_bufnr = vimsupport.GetCurrentBufferNumber()
+    candidates = [ vimsupport.GetAlternateBufferNumber() ]
+    candidates.extend( sorted( vimsupport.GetVisibleBufferNumbers() ) )
+    candidates.extend( self._buffers.RecentlyEnteredBufferNumbers() )
+    buffer_numbers = []
+    for bufnr in candidates:
+      if ( bufnr > 0 and
+           bufnr != current_bufnr and
+           bufnr not in buffer_numbers and
+           ( bufnr not in self._buffers or self._buffers.HasState( bufnr ) ) ):
+        buffer_numbers.append( bufnr )
+    return buffer_numbers
+
+
+  def PreParseBuffer( self, buffer_numbers ):
+    """Parse in the background the first buffer of |buffer_numbers| that
+    needs it so that its diagnostics are ready when the user switches to it.
+    Nothing is sent while other parse requests are in progress. Returns True if
+    this should be called again later. Pre-parsing stops when the budget set by
+    StartPreParse is exhausted or when the current buffer is changed."""
+    if ( self._pre_parse_budget <= 0 or
+         not self.IsServerReady() or
+         self.CurrentBuffer().NeedsReparse() ):
+      self._pre_parse_budget = 0
+      return False
+
+    if self._deferred_parses or self._NumParseRequestsInProgress():
+      return True
+
+    for bufnr in buffer_numbers:
+      if ( bufnr in self._buffers and
+           not self._buffers[ bufnr ].NeedsReparseOnVisit() ):
+        continue
+      # Tag files and syntax keywords are specific to the current buffer.
+      extra_data = {}
+      self._AddExtraConfDataIfNeeded( extra_data )
+      self._SendParseRequest( bufnr, extra_data )
+      self._background_parses.add( bufnr )
+      self._pre_parse_budget -= 1
+      return self._pre_parse_budget > 0
+
+    self._pre_parse_budget = 0
+    return False
+
+
+  def _DropDeferredParseRequest( self, bufnr ):
+    extra_data = self._deferred_parses.pop( bufnr )
+    if bufnr not in self._buffers:
+      return
+    self._buffers[ bufnr ].InvalidateParse()
+    # Syntax keywords are only sent once per filetype.
+    if 'syntax_keywords' in extra_data:
+      self._filetypes_with_keywords_loaded.discard(
+        vimsupport.GetBufferFiletypes( bufnr )[ 0 ] )
+
+
+  def _HandleBackgroundParseRequests( self ):
+    """Same as HandleFileParseRequest for the buffers parsed while not being
+    the current buffer."""
+    for bufnr in list( self._background_parses ):
+      # The buffer may have been forgotten or its state released since the
+      # request was sent, in which case there is nothing left to handle.
+      if ( bufnr not in self._buffers or
+           not self._buffers[ bufnr ].FileParseRequestReady( block = True ) ):
+        self._background_parses.discard( bufnr )
+        continue
+      buffer_object = self._buffers[ bufnr ]
+      if not buffer_object.FileParseRequestReady():
+        continue
+      self._background_parses.discard( bufnr )
+      if buffer_object.IsResponseHandled():
+        continue
+
+      filetypes = vimsupport.GetBufferFiletypes( bufnr )
+      disabled_filetypes = self._user_options[
+        'filetype_specific_completion_to_disable' ]
+      if ( vimsupport.BufferFiletypesEnabled( bufnr, disabled_filetypes ) and
+           any( self.FiletypeCompleterExistsForFiletype( x )
+                for x in filetypes ) ):
+        if ( self._user_options[ 'show_diagnostics_ui' ] and
+             self._DiagnosticUiSupportedForFiletypes( filetypes ) and
+             not self._IsLargeBuffer( bufnr ) ):
+          buffer_object.UpdateDiagnostics()
+          self._OnDiagnosticsUpdated( bufnr )
+        else:
+          buffer_object.GetResponse()
+      buffer_object.MarkResponseHandled()
 
 
   def OnBufferUnload( self, deleted_buffer_number ):
-    SendEventNotificationAsync( 'BufferUnload', deleted_buffer_number )
+    self._buffers_with_pending_diagnostic_updates.discard(
+      deleted_buffer_number )
+    self._deferred_parses.pop( deleted_buffer_number, None )
+    self._buffers.Remove( deleted_buffer_number )
+    self._UpdateTotalDiagnosticCounts()
+    self._event_queue.Add( 'BufferUnload',
+                           deleted_buffer_number,
+                           slim = self._IsSlimEvent( 'BufferUnload' ) )
+
+
+  def OnBufferWipeout( self, buffer_number ):
+    vimsupport.RemoveBufferFromIndex( buffer_number )
+    vimsupport.InvalidateBufferMetadata( buffer_number )
+    self._buffers_with_pending_diagnostic_updates.discard( buffer_number )
+    self._deferred_parses.pop( buffer_number, None )
+    self._buffers.Remove( buffer_number )
+    self._UpdateTotalDiagnosticCounts()
 
 
   def UpdateMatches( self ):
-    self.CurrentBuffer().UpdateMatches()
+    if self.CurrentBuffer().UpdateMatches():
+      self._matches_updates[ 'performed' ] += 1
+    else:
+      self._matches_updates[ 'skipped' ] += 1
+
+
+  def GetMatchesUpdateCounts( self ):
+    """Return the number of diagnostic matches updates performed and skipped
+    on buffer and window switches. Useful for profiling."""
+    return dict( self._matches_updates )
 
 
   def OnBufferVisit( self ):
     extra_data = {}
     self._AddUltiSnipsDataIfNeeded( extra_data )
-    SendEventNotificationAsync( 'BufferVisit', extra_data = extra_data )
+    self._event_queue.Add( 'BufferVisit',
+                           extra_data = extra_data,
+                           slim = self._IsSlimEvent( 'BufferVisit' ) )
+    if self._buffers.OnBufferVisit( vimsupport.GetCurrentBufferNumber() ):
+      self._UpdateTotalDiagnosticCounts()
+    self._DisplayStoredDiagnostics()
+
+
+  def FlushEventQueue( self ):
+    """Send the BufferVisit and BufferUnload events queued since the last
+    flush. Called by a timer after these events. Parse requests are sent after
+    the queued events (see _SendParseRequest)."""
+    self._event_queue.Flush()
+
+
+  def _DisplayStoredDiagnostics( self ):
+    diagnostics = self._project_diagnostics.Pop(
+      vimsupport.GetCurrentBufferFilepath() )
+    if diagnostics is None:
+      return
+    bufnr = vimsupport.GetCurrentBufferNumber()
+    if self._IsLargeBuffer( bufnr ):
+      return
+    self._buffers[ bufnr ].UpdateWithNewDiagnostics( diagnostics )
+    self._OnDiagnosticsUpdated( bufnr )
 
 
   def CurrentBuffer( self ):
@@ -480,11 +748,8 @@ class YouCompleteMe( object ):
 
 
   def OnInsertLeave( self ):
-    SendEventNotificationAsync( 'InsertLeave' )
-
-
-  def OnCursorMoved( self ):
-    self.CurrentBuffer().OnCursorMoved()
+    SendEventNotificationAsync( 'InsertLeave',
+                                slim = self._IsSlimEvent( 'InsertLeave' ) )
 
 
   def _CleanLogfile( self ):
@@ -500,7 +765,17 @@ class YouCompleteMe( object ):
 
 
   def OnCurrentIdentifierFinished( self ):
-    SendEventNotificationAsync( 'CurrentIdentifierFinished' )
+    SendEventNotificationAsync(
+      'CurrentIdentifierFinished',
+      slim = self._IsSlimEvent( 'CurrentIdentifierFinished' ) )
+
+
+  def _IsSlimEvent( self, event_name ):
+    """Events other than FileReadyToParse don't send the contents of the
+    buffers unless listed in the g:ycm_full_event_notifications option, which
+    includes BufferVisit by default since completers may sync the contents on
+    that event. The others only need the current line."""
+    return event_name not in self._user_options[ 'full_event_notifications' ]
 
 
   def OnCompleteDone( self ):
@@ -517,15 +792,65 @@ class YouCompleteMe( object ):
     return self.CurrentBuffer().GetWarningCount()
 
 
+  def _OnDiagnosticsUpdated( self, bufnr ):
+    if self._buffers[ bufnr ].HasPendingDiagnosticUpdates():
+      self._buffers_with_pending_diagnostic_updates.add( bufnr )
+    self._UpdateTotalDiagnosticCounts()
+
+
+  def HasPendingDiagnosticUpdates( self ):
+    return bool( self._buffers_with_pending_diagnostic_updates )
+
+
+  def ApplyPendingDiagnosticUpdates( self ):
+    """Update the signs and matches of the buffers whose diagnostics were only
+    partially applied, starting with the current buffer, until the time budget
+    is exhausted. Returns True if some updates remain."""
+    deadline = DiagnosticUpdateDeadline( self._user_options )
+    current_bufnr = vimsupport.GetCurrentBufferNumber()
+    for bufnr in sorted( self._buffers_with_pending_diagnostic_updates,
+                         key = lambda bufnr: bufnr != current_bufnr ):
+      if not self._buffers[ bufnr ].ApplyPendingDiagnosticUpdates( deadline ):
+        self._buffers_with_pending_diagnostic_updates.discard( bufnr )
+      if deadline is not None and time.time() >= deadline:
+        break
+    return self.HasPendingDiagnosticUpdates()
+
+
+  def _UpdateTotalDiagnosticCounts( self ):
+    """Set the global counterpart of the buffer-local diagnostic counts to the
+    sum of the counts of all buffers."""
+    totals = dict.fromkeys( DIAGNOSTIC_COUNTS_KEYS, 0 )
+    for buffer_object in itervalues( self._buffers ):
+      for key, count in iteritems( buffer_object.GetDiagnosticCounts() ):
+        totals[ key ] += count
+    vimsupport.SetVariableValue( 'g:' + DIAGNOSTIC_COUNTS_VARIABLE, totals )
+
+
   def DiagnosticUiSupportedForCurrentFiletype( self ):
+    return self._DiagnosticUiSupportedForFiletypes(
+      vimsupport.CurrentFiletypes() )
+
+
+  def _DiagnosticUiSupportedForFiletypes( self, filetypes ):
     return any( x in DIAGNOSTIC_UI_FILETYPES or
                 x in DIAGNOSTIC_UI_ASYNC_FILETYPES
-                for x in vimsupport.CurrentFiletypes() )
+                for x in filetypes )
 
 
   def ShouldDisplayDiagnostics( self ):
     return bool( self._user_options[ 'show_diagnostics_ui' ] and
-                 self.DiagnosticUiSupportedForCurrentFiletype() )
+                 self.DiagnosticUiSupportedForCurrentFiletype() and
+                 not self._IsLargeBuffer(
+                   vimsupport.GetCurrentBufferNumber() ) )
+
+
+  def _IsLargeBuffer( self, bufnr ):
+    """Return True if the buffer |bufnr| is in one of the degraded large file
+    modes, where only a window of lines is parsed or no lines at all. The
+    diagnostics UI and syntax keywords seeding are skipped for these buffers."""
+    return ( vimsupport.GetLargeFileTier( bufnr ) >=
+             vimsupport.LARGE_FILE_TIER_LARGE )
 
 
   def _PopulateLocationListWithLatestDiagnostics( self ):
@@ -533,11 +858,18 @@ class YouCompleteMe( object ):
 
 
   def FileParseRequestReady( self ):
-    # Return True if server is not ready yet, to stop repeating check timer.
+    # Return True if server is not ready yet or if the request is deferred, to
+    # stop repeating check timer.
     return ( not self.IsServerReady() or
+             vimsupport.GetCurrentBufferNumber() in self._deferred_parses or
              self.CurrentBuffer().FileParseRequestReady() )
 
 
+  def FileParseRequestInProgress( self ):
+    return ( self.IsServerReady() and
+             self.CurrentBuffer().ParseRequestInProgress() )
+
+
   def HandleFileParseRequest( self, block = False ):
     if not self.IsServerReady():
       return
@@ -554,6 +886,7 @@ class YouCompleteMe( object ):
         # Forcefuly update the location list, etc. from the parse request when
         # doing something like :YcmDiags
         current_buffer.UpdateDiagnostics( block is True )
+        self._OnDiagnosticsUpdated( current_buffer.number )
       else:
         # YCM client has a hard-coded list of filetypes which are known
         # to support diagnostics, self.DiagnosticUiSupportedForCurrentFiletype()
@@ -593,8 +926,30 @@ class YouCompleteMe( object ):
     if self._server_stdout and self._server_stderr:
       debug_info += ( 'Server logfiles:\n'
                       '  {0}\n'
-                      '  {1}'.format( self._server_stdout,
-                                      self._server_stderr ) )
+                      '  {1}\n'.format( self._server_stdout,
+                                        self._server_stderr ) )
+    debug_info += ( 'Diagnostic matches updates: {performed} performed, '
+                    '{skipped} skipped\n'.format( **self._matches_updates ) )
+    num_buffers, num_buffers_with_state, size = self._buffers.GetMemoryUsage()
+    debug_info += ( 'Buffers: {0} tracked, {1} with state using about '
+                    '{2} KiB\n'.format( num_buffers,
+                                        num_buffers_with_state,
+                                        size // 1024 ) )
+    debug_info += ( 'Project diagnostics: {0} stored using about '
+                    '{1} KiB'.format(
+                      len( self._project_diagnostics ),
+                      base.DeepSizeOf( self._project_diagnostics ) // 1024 ) )
+    debug_info += (
+      '\nLarge file thresholds: {large} KiB (large), {huge} KiB (huge), '
+      '{disabled} KiB (disabled)\n'
+      'Current buffer large file tier: {tier}'.format(
+        large = self._user_options[ 'large_file_threshold_kb' ],
+        huge = self._user_options[ 'huge_file_threshold_kb' ],
+        disabled = self._user_options[ 'disable_for_files_larger_than_kb' ],
+        tier = vimsupport.GetLargeFileTier(
+          vimsupport.GetCurrentBufferNumber() ) ) )
+    debug_info += ( '\nUnsaved buffers left out of requests: {0}'.format(
+                    vimsupport.GetNumSkippedUnsavedBuffers() ) )
     return debug_info
 
 
@@ -689,6 +1044,7 @@ class YouCompleteMe( object ):
         warning = False )
     self.OnFileReadyToParse()
     self.HandleFileParseRequest( block = True )
+    self.CurrentBuffer().ApplyPendingDiagnosticUpdates()
     vimsupport.PostVimMessage( 'Diagnostics refreshed', warning = False )
     return True
 
@@ -706,8 +1062,49 @@ class YouCompleteMe( object ):
       vimsupport.OpenLocationList( focus = True )
 
 
+  def JumpToDiagnostic( self, forward = True, severity = '' ):
+    """Move the cursor to the next diagnostic, or to the previous one if
+    |forward| is False, optionally restricted to the 'error' or 'warning'
+    |severity|."""
+    severity = severity.lower()
+    if severity not in DIAGNOSTIC_SEVERITIES:
+      vimsupport.PostVimMessage(
+        'Invalid severity "{0}". Use "error" or "warning".'.format( severity ) )
+      return
+
+    line, column = vimsupport.CurrentLineAndColumn()
+    position = self.CurrentBuffer().GetNextDiagnosticPosition(
+      line + 1, column + 1, forward, DIAGNOSTIC_SEVERITIES[ severity ] )
+    if position is None:
+      vimsupport.PostVimMessage( 'No {0} detected.'.format(
+        severity + 's' if severity else 'warnings or errors' ),
+        warning = False )
+      return
+
+    line, column = position
+    # The buffer may have been shortened since the diagnostics were received.
+    line = min( line, len( vim.current.buffer ) )
+    # Add an entry to the jumplist.
+    vim.command( "normal! m'" )
+    vimsupport.SetCurrentLineAndColumn( line - 1, column - 1 )
+    vim.command( 'normal! zv' )
+
+
+  def ShowProjectDiagnostics( self ):
+    if not len( self._project_diagnostics ):
+      vimsupport.PostVimMessage(
+        'No warnings or errors detected in files not displayed.',
+        warning = False )
+      return
+
+    vimsupport.SetQuickFixList( vimsupport.ConvertDiagnosticsToQfList(
+      self._project_diagnostics.GetAll() ) )
+    vimsupport.OpenQuickFixList( focus = True )
+
+
   def _AddSyntaxDataIfNeeded( self, extra_data ):
-    if not self._user_options[ 'seed_identifiers_with_syntax' ]:
+    if ( not self._user_options[ 'seed_identifiers_with_syntax' ] or
+         self._IsLargeBuffer( vimsupport.GetCurrentBufferNumber() ) ):
       return
     filetype = vimsupport.CurrentFiletypes()[ 0 ]
     if filetype in self._filetypes_with_keywords_loaded: